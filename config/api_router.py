@@ -1,10 +1,14 @@
 from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework.routers import SimpleRouter
 
+from fuel_tracker.calculator import async_views
 from fuel_tracker.calculator.views import AirplaneViewSet
+from fuel_tracker.calculator.views import CacheStatsView
 from fuel_tracker.calculator.views import ConfigurationViewSet
 from fuel_tracker.calculator.views import FuelCalculationRecordViewSet
+from fuel_tracker.calculator.views import ReadinessView
 
 router = DefaultRouter() if settings.DEBUG else SimpleRouter()
 
@@ -13,5 +17,20 @@ router.register("configurations", ConfigurationViewSet)
 router.register("results", FuelCalculationRecordViewSet)
 
 
+# Resolved before the router, replacing AirplaneViewSet.calculate_fuel
+async_urlpatterns = [
+    path(
+        "airplanes/<int:pk>/calculate_fuel/",
+        async_views.calculate_fuel,
+        name="airplane-calculate-fuel",
+    ),
+]
+
+
 app_name = "calculator"
-urlpatterns = router.urls
+urlpatterns = [
+    *(async_urlpatterns if settings.CALCULATOR_ASYNC_VIEWS else []),
+    *router.urls,
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
+    path("ready/", ReadinessView.as_view(), name="ready"),
+]
@@ -0,0 +1,32 @@
+# ruff: noqa
+"""
+ASGI config for Airplane Fuel Tracker REST API with Django project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with gunicorn's uvicorn worker, e.g.
+
+    gunicorn config.asgi --worker-class uvicorn_worker.UvicornWorker
+
+and set CALCULATOR_ASYNC_VIEWS=True to serve calculate_fuel from the native
+async view.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/dev/howto/deployment/asgi/
+
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from django.core.asgi import get_asgi_application
+
+# This allows easy placement of apps within the interior
+# fuel_tracker directory.
+BASE_DIR = Path(__file__).resolve(strict=True).parent.parent
+sys.path.append(str(BASE_DIR / "fuel_tracker"))
+# If DJANGO_SETTINGS_MODULE is unset, default to the production settings
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.production")
+
+# This application object is used by any ASGI server configured to use this file.
+application = get_asgi_application()
@@ -80,6 +80,7 @@ THIRD_PARTY_APPS = [
     "rest_framework",
     "rest_framework.authtoken",
     "corsheaders",
+    "django_filters",
     "drf_spectacular",
     "drf_spectacular_sidecar",
 ]
@@ -87,6 +88,7 @@ THIRD_PARTY_APPS = [
 LOCAL_APPS = [
     "fuel_tracker.users",
     "fuel_tracker.calculator",
+    "fuel_tracker.observability",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -139,6 +141,9 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+    "fuel_tracker.observability.middleware.ServerTimingMiddleware",
+    "fuel_tracker.observability.middleware.MetricsMiddleware",
+    "fuel_tracker.observability.middleware.QueryBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -150,6 +155,8 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "allauth.account.middleware.AccountMiddleware",
+    "fuel_tracker.observability.middleware.MemoryMiddleware",
+    "fuel_tracker.observability.middleware.ProfilingMiddleware",
 ]
 
 # STATIC
@@ -306,6 +313,18 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.TokenAuthentication",
     ),
     # "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # JSON through orjson, and MessagePack for clients that ask for it
+    "DEFAULT_RENDERER_CLASSES": (
+        "fuel_tracker.calculator.renderers.ORJSONRenderer",
+        "fuel_tracker.calculator.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "fuel_tracker.calculator.parsers.ORJSONParser",
+        "fuel_tracker.calculator.parsers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -326,3 +345,169 @@ SPECTACULAR_SETTINGS = {
 }
 # Your stuff...
 # ------------------------------------------------------------------------------
+
+# fuel_tracker.calculator
+# ------------------------------------------------------------------------------
+# Maximum number of items accepted by a single batch fuel calculation request.
+CALCULATOR_BATCH_MAX_ITEMS = env.int("CALCULATOR_BATCH_MAX_ITEMS", default=1000)
+# Seconds a worker reuses the latest Configuration before checking the shared
+# cache for a newer version. Set to 0 to query the database on every request.
+CALCULATOR_CONFIG_CACHE_TTL = env.int("CALCULATOR_CONFIG_CACHE_TTL", default=60)
+# Page size of the cursor-paginated /api/results/ endpoint.
+CALCULATOR_RESULTS_PAGE_SIZE = env.int("CALCULATOR_RESULTS_PAGE_SIZE", default=100)
+CALCULATOR_RESULTS_MAX_PAGE_SIZE = env.int(
+    "CALCULATOR_RESULTS_MAX_PAGE_SIZE",
+    default=1000,
+)
+# Rows fetched per round trip by the streaming /api/results/export/ endpoint.
+CALCULATOR_EXPORT_CHUNK_SIZE = env.int("CALCULATOR_EXPORT_CHUNK_SIZE", default=2000)
+# How FuelCalculationRecord rows are written:
+# - "sync": inserted inside the request transaction (durable on response)
+# - "buffered": queued in process memory and bulk inserted by a background
+#   thread; lost if a worker is killed before it drains its buffer
+# - "redis": pushed to a Redis list and bulk inserted by the
+#   flush_calculation_records command; survives worker restarts
+# Queued records keep the time of their calculation. Those that cannot be
+# inserted, e.g. because their airplane was deleted, are logged and, in
+# "redis" mode, moved to the CALCULATOR_RECORD_QUEUE_KEY + ":dead" list.
+CALCULATOR_RECORD_WRITE_MODE = env("CALCULATOR_RECORD_WRITE_MODE", default="sync")
+# Flush once this many records are queued...
+CALCULATOR_RECORD_FLUSH_SIZE = env.int("CALCULATOR_RECORD_FLUSH_SIZE", default=500)
+# ...or every this many seconds in "buffered" mode.
+CALCULATOR_RECORD_FLUSH_INTERVAL = env.float(
+    "CALCULATOR_RECORD_FLUSH_INTERVAL",
+    default=1.0,
+)
+CALCULATOR_RECORD_QUEUE_KEY = "calculator:record_queue"
+# In-process LRU in front of the shared cache for calculation results.
+# Set the size to 0 to disable it.
+CALCULATOR_L1_CACHE_SIZE = env.int("CALCULATOR_L1_CACHE_SIZE", default=1024)
+CALCULATOR_L1_CACHE_TTL = env.float("CALCULATOR_L1_CACHE_TTL", default=60.0)
+# Lease in seconds of the lock that lets a single worker recompute a missing
+# calculation result while the others wait for it. Set to 0 to disable.
+CALCULATOR_CACHE_LOCK_TIMEOUT = env.float("CALCULATOR_CACHE_LOCK_TIMEOUT", default=2.0)
+# Probabilistic early recomputation (XFetch) of cached results. Higher values
+# refresh earlier; 0 disables it.
+CALCULATOR_CACHE_XFETCH_BETA = env.float("CALCULATOR_CACHE_XFETCH_BETA", default=0.0)
+# File of precomputed results for every airplane and passenger count under
+# the active configuration, memory-mapped by every worker. It is ignored on
+# every host once a Configuration or Airplane changes, until
+# `manage.py build_lookup_table --if-stale --every <seconds>`, started next to
+# gunicorn on each host, rebuilds it. Requests served from it do not store a
+# FuelCalculationRecord. Empty disables it.
+CALCULATOR_LOOKUP_TABLE_PATH = env("CALCULATOR_LOOKUP_TABLE_PATH", default="")
+# Seconds a process trusts its last check of the shared table version. Other
+# processes keep serving a table for up to this long after a change.
+CALCULATOR_LOOKUP_TABLE_VERSION_TTL = env.float(
+    "CALCULATOR_LOOKUP_TABLE_VERSION_TTL",
+    default=5.0,
+)
+CALCULATOR_LOOKUP_TABLE_MAX_ROWS = env.int(
+    "CALCULATOR_LOOKUP_TABLE_MAX_ROWS",
+    default=10_000_000,
+)
+# Serve calculate_fuel from a native async view. Only useful under ASGI
+# (config.asgi), where it does not hold a worker while waiting on I/O.
+CALCULATOR_ASYNC_VIEWS = env.bool("CALCULATOR_ASYNC_VIEWS", default=False)
+# Most frequent calculations of the last hours loaded into the result cache
+# by the warmup command and by every gunicorn worker before it serves
+# requests. Set the count to 0 to only open connections and compile routes.
+CALCULATOR_WARMUP_TOP = env.int("CALCULATOR_WARMUP_TOP", default=500)
+CALCULATOR_WARMUP_WINDOW_HOURS = env.int("CALCULATOR_WARMUP_WINDOW_HOURS", default=24)
+# Seconds the list of most frequent calculations, mined from the records by a
+# single process, is shared with the others through the cache.
+CALCULATOR_WARMUP_LIST_TTL = env.int("CALCULATOR_WARMUP_LIST_TTL", default=3600)
+# Seconds between attempts when a worker's warm-up failed, e.g. because the
+# database or Redis was down. The worker is not ready until one succeeds.
+CALCULATOR_WARMUP_RETRY_SECONDS = env.float(
+    "CALCULATOR_WARMUP_RETRY_SECONDS",
+    default=5.0,
+)
+# Airplanes looked up by calculate_fuel, kept in memory by every process.
+# Each lookup checks a version in the shared cache, so changes made by other
+# processes are seen at once. Set the size to 0 to disable it.
+CALCULATOR_AIRPLANE_CACHE_SIZE = env.int(
+    "CALCULATOR_AIRPLANE_CACHE_SIZE",
+    default=100_000,
+)
+# Seconds clients may reuse a retrieved FuelCalculationRecord without asking
+# again, when ?fields= leaves out the nested airplane, which may change.
+CALCULATOR_RECORD_MAX_AGE = env.int("CALCULATOR_RECORD_MAX_AGE", default=86400)
+
+# fuel_tracker.observability
+# ------------------------------------------------------------------------------
+# Fraction of requests answered with a Server-Timing header breaking their
+# time down by phase and database queries. 0 disables the measurements.
+OBSERVABILITY_SERVER_TIMING_SAMPLE_RATE = env.float(
+    "OBSERVABILITY_SERVER_TIMING_SAMPLE_RATE",
+    default=1.0,
+)
+# Bearer token required by the /metrics endpoint. Without one, it is only
+# served when DEBUG.
+OBSERVABILITY_METRICS_TOKEN = env("OBSERVABILITY_METRICS_TOKEN", default="")
+# Views over their query budget, or running the same query more than the
+# repeat limit (an N+1), raise QueryBudgetExceededError when DEBUG or this is
+# set. Otherwise the given fraction of them is logged with their queries.
+OBSERVABILITY_QUERY_BUDGET_RAISE = env.bool(
+    "OBSERVABILITY_QUERY_BUDGET_RAISE",
+    default=False,
+)
+OBSERVABILITY_QUERY_BUDGET_LOG_SAMPLE_RATE = env.float(
+    "OBSERVABILITY_QUERY_BUDGET_LOG_SAMPLE_RATE",
+    default=0.1,
+)
+OBSERVABILITY_QUERY_REPEAT_LIMIT = env.int(
+    "OBSERVABILITY_QUERY_REPEAT_LIMIT",
+    default=3,
+)
+# Queries slower than this many milliseconds are kept, with the view that ran
+# them, in a buffer of the most recent ones of each process (shown to admins
+# at /api/slow-queries/), and logged if enabled. 0 disables the capture.
+OBSERVABILITY_SLOW_QUERY_THRESHOLD_MS = env.float(
+    "OBSERVABILITY_SLOW_QUERY_THRESHOLD_MS",
+    default=100.0,
+)
+OBSERVABILITY_SLOW_QUERY_BUFFER_SIZE = env.int(
+    "OBSERVABILITY_SLOW_QUERY_BUFFER_SIZE",
+    default=500,
+)
+OBSERVABILITY_SLOW_QUERY_LOG = env.bool("OBSERVABILITY_SLOW_QUERY_LOG", default=False)
+# Fraction of requests whose stacks are sampled every interval and written
+# as collapsed stacks to the profile directory, in addition to requests with
+# a signed X-Profile header (see the profile_token command) valid for the
+# given number of seconds. A worker profiles one request at a time and stops
+# writing profiles once the directory holds the maximum number of files.
+OBSERVABILITY_PROFILE_SAMPLE_RATE = env.float(
+    "OBSERVABILITY_PROFILE_SAMPLE_RATE",
+    default=0.0,
+)
+OBSERVABILITY_PROFILE_INTERVAL_MS = env.float(
+    "OBSERVABILITY_PROFILE_INTERVAL_MS",
+    default=5.0,
+)
+OBSERVABILITY_PROFILE_TOKEN_MAX_AGE = env.int(
+    "OBSERVABILITY_PROFILE_TOKEN_MAX_AGE",
+    default=3600,
+)
+# Empty for a directory in the system temporary directory
+OBSERVABILITY_PROFILE_DIR = env("OBSERVABILITY_PROFILE_DIR", default="")
+OBSERVABILITY_PROFILE_MAX_FILES = env.int(
+    "OBSERVABILITY_PROFILE_MAX_FILES",
+    default=1000,
+)
+# Trace the allocations of the given fraction of requests with tracemalloc,
+# one at a time per worker, to find where memory-heavy views allocate. Slows
+# traced requests down severalfold.
+OBSERVABILITY_MEMORY_TRACKING = env.bool("OBSERVABILITY_MEMORY_TRACKING", default=False)
+OBSERVABILITY_MEMORY_SAMPLE_RATE = env.float(
+    "OBSERVABILITY_MEMORY_SAMPLE_RATE",
+    default=0.1,
+)
+# Allocation sites kept per request and shown per view
+OBSERVABILITY_MEMORY_TOP_SITES = env.int("OBSERVABILITY_MEMORY_TOP_SITES", default=10)
+# Resident memory past which a worker finishes its requests and exits, to
+# be replaced by the gunicorn master. 0 disables it.
+OBSERVABILITY_MEMORY_RSS_LIMIT_MB = env.int(
+    "OBSERVABILITY_MEMORY_RSS_LIMIT_MB",
+    default=0,
+)
@@ -164,3 +164,5 @@ SPECTACULAR_SETTINGS["SERVERS"] = [
 ]
 # Your stuff...
 # ------------------------------------------------------------------------------
+# Required: /metrics is not served without it
+OBSERVABILITY_METRICS_TOKEN = env("OBSERVABILITY_METRICS_TOKEN")
@@ -36,3 +36,4 @@ TEMPLATES[0]["OPTIONS"]["debug"] = True  # type: ignore[index]
 MEDIA_URL = "http://media.testserver/"
 # Your stuff...
 # ------------------------------------------------------------------------------
+OBSERVABILITY_QUERY_BUDGET_RAISE = True
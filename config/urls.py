@@ -6,14 +6,23 @@ from django.urls import include, path
 from django.views import defaults as default_views
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from fuel_tracker.observability.views import (
+    MemoryStatsView,
+    SlowQueriesView,
+    metrics,
+)
+
 urlpatterns = [
     path(settings.ADMIN_URL, admin.site.urls),
     *static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT),
+    path("metrics", metrics, name="metrics"),
 ]
 
 # API URLS
 urlpatterns += [
     path("api/", include("config.api_router")),
+    path("api/slow-queries/", SlowQueriesView.as_view(), name="slow-queries"),
+    path("api/memory/", MemoryStatsView.as_view(), name="memory"),
     path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
     path(
         "api/docs/",
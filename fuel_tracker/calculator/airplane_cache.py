@@ -0,0 +1,74 @@
+import uuid
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from fuel_tracker.calculator.models import Airplane
+
+AIRPLANE_VERSION_CACHE_KEY = "calculator:airplane_version"
+
+
+class CachedAirplane(NamedTuple):
+    airplane_id: int
+    max_passengers: int
+
+
+class AirplaneCache:
+    """Airplane fields used by calculations, shared by the whole process.
+
+    Saving or deleting an airplane publishes a new version in the shared
+    cache once committed. Every lookup reads it, one cache round trip
+    instead of a query, and drops all entries when it changed, so that an
+    airplane deleted by another process is not found anymore. Changes
+    made without signals, such as queryset updates, must call
+    `publish_new_version()`.
+    """
+
+    _airplanes: dict[int, CachedAirplane] = {}
+    _version: str | None = None
+
+    def get(self, pk: int) -> CachedAirplane | None:
+        if not self._enabled():
+            return None
+        self._check_version(cache.get(AIRPLANE_VERSION_CACHE_KEY))
+        return AirplaneCache._airplanes.get(pk)
+
+    async def aget(self, pk: int) -> CachedAirplane | None:
+        if not self._enabled():
+            return None
+        self._check_version(await cache.aget(AIRPLANE_VERSION_CACHE_KEY))
+        return AirplaneCache._airplanes.get(pk)
+
+    def add(self, airplane: Airplane) -> None:
+        airplanes = AirplaneCache._airplanes
+        if self._enabled() and len(airplanes) < settings.CALCULATOR_AIRPLANE_CACHE_SIZE:
+            airplanes[airplane.pk] = CachedAirplane(
+                airplane.airplane_id,
+                airplane.max_passengers,
+            )
+
+    @classmethod
+    def invalidate(cls, pk: int) -> None:
+        cls._airplanes.pop(pk, None)
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        cls._airplanes = {}
+        cls._version = None
+
+    @classmethod
+    def publish_new_version(cls) -> None:
+        # Entries cached by this process while the change was uncommitted
+        # are dropped on the next lookup too. A random token rather than a
+        # counter, which would start over at a value processes hold if the
+        # cache is flushed.
+        cache.set(AIRPLANE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+    def _check_version(self, version: str | None) -> None:
+        if version != AirplaneCache._version:
+            AirplaneCache._airplanes = {}
+            AirplaneCache._version = version
+
+    def _enabled(self) -> bool:
+        return settings.CALCULATOR_AIRPLANE_CACHE_SIZE > 0
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CalculatorConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "fuel_tracker.calculator"
+
+    def ready(self):
+        import fuel_tracker.calculator.signals  # noqa: F401
@@ -0,0 +1,196 @@
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.exceptions import ParseError
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import UnsupportedMediaType
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from fuel_tracker.calculator.airplane_cache import AirplaneCache
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.lookup_table import LookupTable
+from fuel_tracker.calculator.lookup_table import TableAirplane
+from fuel_tracker.calculator.lookup_table import aget_lookup_table
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.record_writer import get_record_writer
+from fuel_tracker.calculator.renderers import MessagePackRenderer
+from fuel_tracker.calculator.renderers import ORJSONRenderer
+from fuel_tracker.calculator.serializers import FuelCalculationSerializer
+from fuel_tracker.calculator.services import FuelCalculationService
+from fuel_tracker.observability import timing
+from fuel_tracker.observability.metrics import CALCULATION_ERRORS
+from fuel_tracker.observability.metrics import LOOKUP_TABLE_HITS
+from fuel_tracker.observability.query_budget import query_budgets
+from fuel_tracker.observability.timing import mark
+from fuel_tracker.observability.timing import phase
+
+# Async counterpart of AirplaneViewSet.calculate_fuel, routed in its place when
+# CALCULATOR_ASYNC_VIEWS is set. DRF views are sync only, so this is a plain
+# Django view returning the same payloads. Like the viewset it allows
+# anonymous access and enforces CSRF for session-authenticated users. Async
+# views cannot run inside ATOMIC_REQUESTS, so every query and the record
+# insert autocommit.
+
+PARSER_CLASSES = api_settings.DEFAULT_PARSER_CLASSES
+# The browsable API needs a DRF view
+RENDERERS = [ORJSONRenderer(), MessagePackRenderer()]
+
+
+# Airplane, latest configuration and record insert, like the viewset
+@query_budgets(post=3)
+@csrf_exempt
+@require_POST
+@transaction.non_atomic_requests
+async def calculate_fuel(request, pk: int):
+    # Parsed and rendered in the formats the viewset accepts
+    drf_request = Request(request, parsers=[parser() for parser in PARSER_CLASSES])
+    try:
+        renderer, _ = DefaultContentNegotiation().select_renderer(
+            drf_request,
+            RENDERERS,
+        )
+    except NotAcceptable as e:
+        return JsonResponse({"detail": e.detail}, status=e.status_code)
+    # csrf_exempt is for clients authenticated by token. Session users are
+    # checked as SessionAuthentication does.
+    if (await request.auser()).is_active:
+        try:
+            SessionAuthentication().enforce_csrf(request)
+        except PermissionDenied as e:
+            return _render(renderer, {"detail": e.detail}, e.status_code)
+    # Not counted in the budget, like in QueryBudgetMixin
+    if (timings := timing.current()) is not None:
+        timings.query_shapes.clear()
+    try:
+        data = drf_request.data
+    except (ParseError, UnsupportedMediaType) as e:
+        return _render(renderer, {"detail": e.detail}, e.status_code)
+
+    table = await aget_lookup_table()
+    table_airplane = table.get_airplane(pk) if table is not None else None
+    try:
+        airplane = await _aget_airplane(pk, table_airplane)
+    except Airplane.DoesNotExist:
+        return _render(
+            renderer,
+            {"detail": "No Airplane matches the given query."},
+            404,
+        )
+    active_config = await sync_to_async(ConfigurationManager().get_active_config)()
+    result, status = await _calculate(
+        data,
+        airplane,
+        active_config,
+        table,
+        table_airplane,
+    )
+    return _render(renderer, result, status)
+
+
+async def _calculate(
+    data: Any,
+    airplane: Airplane,
+    active_config: dict[str, Any],
+    table: LookupTable | None,
+    table_airplane: TableAirplane | None,
+) -> tuple[Any, int]:
+    serializer = FuelCalculationSerializer(data=data)
+    if not serializer.is_valid():
+        return serializer.errors, 400
+    passengers = serializer.validated_data["passengers"]
+    if passengers > airplane.max_passengers:
+        return {"error": f"Exceeds max passengers ({airplane.max_passengers})"}, 400
+
+    config = {**active_config, **serializer.validated_data.get("config_override", {})}
+    try:
+        ConfigurationManager().validate_config(config)
+
+        # Serve precomputed results under the active configuration
+        if (
+            table_airplane is not None
+            and table is not None
+            and config == table.config
+            and (result := table.get(table_airplane, passengers))
+        ):
+            mark("cache", "table")
+            LOOKUP_TABLE_HITS.labels("calculate_fuel").inc()
+            return result, 200
+
+        cache_manager = FuelCalculationCache()
+        result = await cache_manager.aget_or_compute(
+            cache_manager.generate_key(airplane.airplane_id, passengers, config),
+            lambda: _acalculate_and_record(airplane, passengers, config),
+        )
+    except ValueError as e:
+        CALCULATION_ERRORS.labels("calculate_fuel").inc()
+        return {"error": str(e)}, 400
+    return result, 200
+
+
+def _render(renderer: BaseRenderer, data: Any, status: int = 200) -> HttpResponse:
+    return HttpResponse(
+        renderer.render(data),
+        status=status,
+        content_type=renderer.media_type,
+    )
+
+
+async def _aget_airplane(pk: int, table_airplane: TableAirplane | None) -> Airplane:
+    if table_airplane is not None:
+        return Airplane(
+            pk=pk,
+            airplane_id=table_airplane.airplane_id,
+            max_passengers=table_airplane.max_passengers,
+        )
+    with phase("airplane"):
+        airplane_cache = AirplaneCache()
+        cached = await airplane_cache.aget(pk)
+        if cached is not None:
+            return Airplane(
+                pk=pk,
+                airplane_id=cached.airplane_id,
+                max_passengers=cached.max_passengers,
+            )
+        airplane = await Airplane.objects.aget(pk=pk)
+        airplane_cache.add(airplane)
+        return airplane
+
+
+async def _acalculate_and_record(
+    airplane: Airplane,
+    passengers: int,
+    config: dict[str, Any],
+) -> dict[str, Any]:
+    with phase("calc"):
+        result = FuelCalculationService().calculate(
+            airplane.airplane_id,
+            passengers,
+            config,
+        )
+    with phase("record"):
+        await get_record_writer().awrite(
+            [
+                FuelCalculationRecord(
+                    airplane=airplane,
+                    passengers=passengers,
+                    fuel_capacity=result["fuel_capacity"],
+                    fuel_consumption_per_minute=result["fuel_consumption_per_minute"],
+                    flight_duration=result["flight_duration"],
+                    time_unit=config["time_unit"],
+                    configuration_snapshot=config,
+                ),
+            ],
+        )
+    return result
@@ -0,0 +1,274 @@
+import itertools
+import statistics
+import time
+import timeit
+from collections.abc import Callable
+from io import BytesIO
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.test import override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.parsers import MessagePackParser
+from fuel_tracker.calculator.parsers import ORJSONParser
+from fuel_tracker.calculator.renderers import MessagePackRenderer
+from fuel_tracker.calculator.renderers import ORJSONRenderer
+from fuel_tracker.calculator.serializers import FuelCalculationRecordModelSerializer
+from fuel_tracker.calculator.serializers import FuelCalculationSerializer
+from fuel_tracker.calculator.serializers import ResultSerializer
+from fuel_tracker.calculator.services import FuelCalculationService
+
+# Setup functions by case name. A setup function prepares the data and
+# returns the callable that is timed. Both run in a transaction that is
+# rolled back afterwards.
+BENCHMARKS: dict[str, Callable[[], Callable[[], Any]]] = {}
+
+RESULTS_TABLE_SIZES = (1_000, 10_000, 100_000)
+SEED_BATCH_SIZE = 10_000
+# Far from real airplane IDs
+BENCHMARK_AIRPLANE_ID = 900_000
+# Formats of the REST API, DRF's JSON first as the reference
+RENDERERS = {
+    "json": JSONRenderer,
+    "orjson": ORJSONRenderer,
+    "msgpack": MessagePackRenderer,
+}
+PARSERS = {
+    "json": JSONParser,
+    "orjson": ORJSONParser,
+    "msgpack": MessagePackParser,
+}
+BATCH_ITEMS = 100
+
+
+def benchmark(name: str):
+    def register(setup: Callable[[], Callable[[], Any]]):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def run_benchmark(name: str, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """Times a registered case and returns microseconds per call.
+
+    Calls are batched so that every timing lasts at least `min_time`
+    seconds; the median and the minimum of `repeat` timings are reported.
+    """
+    # The test client's host, SSL redirects would answer every request
+    with (
+        override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            SECURE_SSL_REDIRECT=False,
+        ),
+        transaction.atomic(),
+    ):
+        timer = timeit.Timer(BENCHMARKS[name]())
+        number = 1
+        while (elapsed := timer.timeit(number)) < min_time:
+            number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+        timings = [
+            elapsed / number * 1e6
+            for elapsed in timer.repeat(repeat=repeat, number=number)
+        ]
+        transaction.set_rollback(True)
+    return {
+        "median_us": statistics.median(timings),
+        "min_us": min(timings),
+        "number": number,
+    }
+
+
+def compare(
+    results: dict[str, dict],
+    baseline: dict[str, dict],
+    threshold: float,
+) -> list[tuple[str, float, float, bool]]:
+    """Returns (case, baseline, current, regressed) for the common cases.
+
+    A case regressed when its median grew by more than `threshold`, a
+    fraction of the baseline median.
+    """
+    return [
+        (
+            name,
+            baseline[name]["median_us"],
+            result["median_us"],
+            result["median_us"] > baseline[name]["median_us"] * (1 + threshold),
+        )
+        for name, result in results.items()
+        if name in baseline
+    ]
+
+
+def _config() -> dict[str, Any]:
+    return ConfigurationManager().get_active_config()
+
+
+def _airplane() -> Airplane:
+    return Airplane.objects.create(
+        airplane_id=BENCHMARK_AIRPLANE_ID,
+        name="Benchmark",
+        max_passengers=300,
+    )
+
+
+@benchmark("service_calculate")
+def _service_calculate():
+    service = FuelCalculationService()
+    config = _config()
+    return lambda: service.calculate(BENCHMARK_AIRPLANE_ID, 150, config)
+
+
+@benchmark("cache_generate_key")
+def _cache_generate_key():
+    cache_manager = FuelCalculationCache()
+    config = _config()
+    return lambda: cache_manager.generate_key(BENCHMARK_AIRPLANE_ID, 150, config)
+
+
+@benchmark("config_get_merged_config")
+def _config_get_merged_config():
+    config_manager = ConfigurationManager()
+    config_manager.get_active_config()
+    return lambda: config_manager.get_merged_config({"log_base": "e"})
+
+
+@benchmark("serializer_validate")
+def _serializer_validate():
+    data = {"passengers": 150, "config_override": {"log_base": "e"}}
+    return lambda: FuelCalculationSerializer(data=data).is_valid(raise_exception=True)
+
+
+@benchmark("serializer_render_result")
+def _serializer_render_result():
+    result = FuelCalculationService().calculate(BENCHMARK_AIRPLANE_ID, 150, _config())
+    renderer = JSONRenderer()
+    return lambda: renderer.render(ResultSerializer(result).data)
+
+
+@benchmark("serializer_render_records")
+def _serializer_render_records():
+    airplane = _airplane()
+    records = _seed_records(airplane, settings.CALCULATOR_RESULTS_PAGE_SIZE)
+    renderer = JSONRenderer()
+    return lambda: renderer.render(
+        FuelCalculationRecordModelSerializer(records, many=True).data,
+    )
+
+
+@benchmark("calculate_fuel_cache_hit")
+def _calculate_fuel_cache_hit():
+    client = APIClient()
+    url = f"/api/airplanes/{_airplane().pk}/calculate_fuel/"
+    data = {"passengers": 150}
+    client.post(url, data, format="json")
+    return lambda: client.post(url, data, format="json")
+
+
+@benchmark("calculate_fuel_cache_miss")
+def _calculate_fuel_cache_miss():
+    client = APIClient()
+    url = f"/api/airplanes/{_airplane().pk}/calculate_fuel/"
+    # A multiplier not used before, so every request misses the cache
+    multipliers = itertools.count(1000.0 + time.time() % 1)
+    return lambda: client.post(
+        url,
+        {
+            "passengers": 150,
+            "config_override": {"fuel_capacity_multiplier": next(multipliers)},
+        },
+        format="json",
+    )
+
+
+def _results_list(rows: int):
+    def setup():
+        _seed_records(_airplane(), rows)
+        client = APIClient()
+        return lambda: client.get("/api/results/")
+
+    return setup
+
+
+for _rows in RESULTS_TABLE_SIZES:
+    benchmark(f"results_list[{_rows}]")(_results_list(_rows))
+
+
+def _render_result(renderer_class):
+    def setup():
+        result = FuelCalculationService().calculate(
+            BENCHMARK_AIRPLANE_ID,
+            150,
+            _config(),
+        )
+        data = ResultSerializer(result).data
+        renderer = renderer_class()
+        return lambda: renderer.render(data)
+
+    return setup
+
+
+def _render_records(renderer_class):
+    def setup():
+        records = _seed_records(_airplane(), settings.CALCULATOR_RESULTS_PAGE_SIZE)
+        data = FuelCalculationRecordModelSerializer(records, many=True).data
+        renderer = renderer_class()
+        return lambda: renderer.render(data)
+
+    return setup
+
+
+def _parse_batch(parser_class):
+    def setup():
+        parser = parser_class()
+        body = parser.renderer_class().render(
+            {
+                "items": [
+                    {
+                        "airplane_id": i,
+                        "passengers": 150,
+                        "config_override": {"log_base": "e"},
+                    }
+                    for i in range(1, BATCH_ITEMS + 1)
+                ],
+            },
+        )
+        return lambda: parser.parse(BytesIO(body), parser_context={})
+
+    return setup
+
+
+for _name, _renderer_class in RENDERERS.items():
+    benchmark(f"render_result[{_name}]")(_render_result(_renderer_class))
+    benchmark(f"render_records[{_name}]")(_render_records(_renderer_class))
+for _name, _parser_class in PARSERS.items():
+    benchmark(f"parse_batch[{_name}]")(_parse_batch(_parser_class))
+
+
+def _seed_records(airplane: Airplane, rows: int) -> list[FuelCalculationRecord]:
+    config = _config()
+    result = FuelCalculationService().calculate(airplane.airplane_id, 150, config)
+    records = []
+    for start in range(0, rows, SEED_BATCH_SIZE):
+        records += FuelCalculationRecord.objects.bulk_create(
+            FuelCalculationRecord(
+                airplane=airplane,
+                passengers=i % (airplane.max_passengers + 1),
+                fuel_capacity=result["fuel_capacity"],
+                fuel_consumption_per_minute=result["fuel_consumption_per_minute"],
+                flight_duration=result["flight_duration"],
+                time_unit=config["time_unit"],
+                configuration_snapshot=config,
+            )
+            for i in range(start, min(start + SEED_BATCH_SIZE, rows))
+        )
+    return records
@@ -1,21 +1,209 @@
-import hashlib
-import json
+import asyncio
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from collections import OrderedDict
+from collections.abc import Awaitable
+from collections.abc import Callable
 from typing import Any
+from typing import NamedTuple
 
+from django.conf import settings
 from django.core.cache import cache
 
+from fuel_tracker.observability.metrics import CACHE_EVENTS
+from fuel_tracker.observability.timing import mark
+from fuel_tracker.observability.timing import phase
+
+# Bump the version whenever the key or entry layout changes so old entries are
+# simply left to expire.
+CACHE_KEY_PREFIX = "fuel:v3"
+LOCK_POLL_INTERVAL = 0.01
+
+
+class CachedResult(NamedTuple):
+    value: dict[str, Any]
+    # Seconds the computation took and wall clock time the entry expires,
+    # used for probabilistic early recomputation.
+    delta: float
+    expires_at: float
+
+
+class LocalLRUCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
 
 class FuelCalculationCache:
+    # Tier 1 is a bounded in-process LRU shared by every instance in this
+    # process, tier 2 is the Django default cache (Redis in production).
+    _local: LocalLRUCache | None = None
+    _stats: Counter[str] = Counter()
+
     def get(self, key: str) -> dict[str, Any] | None:
-        return cache.get(key)
+        entry = self._get_entry(key)
+        return entry.value if entry is not None else None
 
     def set(
         self,
         key: str,
         value: dict[str, Any],
         timeout: int = 3600,
+        delta: float = 0.0,
+    ) -> None:
+        entry = CachedResult(value, delta, time.time() + timeout)
+        with phase("cache"):
+            cache.set(key, entry, timeout=timeout)
+        if (local := self._local_cache()) is not None:
+            local.set(key, entry)
+
+    def get_many(self, keys: list[str]) -> dict[str, dict[str, Any]]:
+        found = {}
+        missing = keys
+        local = self._local_cache()
+        if local is not None:
+            missing = []
+            for key in keys:
+                if (entry := local.get(key)) is not None:
+                    found[key] = entry.value
+                else:
+                    missing.append(key)
+            self._count("l1_hits", len(found))
+            self._count("l1_misses", len(missing))
+
+        if missing:
+            with phase("cache"):
+                remote = cache.get_many(missing)
+            self._count("l2_hits", len(remote))
+            self._count("l2_misses", len(set(missing) - set(remote)))
+            for key, entry in remote.items():
+                if local is not None:
+                    local.set(key, entry)
+                found[key] = entry.value
+        return found
+
+    def set_many(
+        self,
+        values: dict[str, dict[str, Any]],
+        timeout: int = 3600,
     ) -> None:
-        cache.set(key, value, timeout=timeout)
+        expires_at = time.time() + timeout
+        entries = {
+            key: CachedResult(value, 0.0, expires_at) for key, value in values.items()
+        }
+        with phase("cache"):
+            cache.set_many(entries, timeout=timeout)
+        if (local := self._local_cache()) is not None:
+            for key, entry in entries.items():
+                local.set(key, entry)
+
+    def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], dict[str, Any]],
+        timeout: int = 3600,
+    ) -> dict[str, Any]:
+        """Returns the cached value, computing it at most once across workers.
+
+        On a miss only the worker holding the recompute lock calls `compute`,
+        the others wait for its result. With `CALCULATOR_CACHE_XFETCH_BETA`
+        set, one worker may also refresh an entry shortly before it expires
+        while the rest keep serving the current value.
+        """
+        entry = self._get_entry(key)
+        if entry is not None and not self._expires_early(entry):
+            return entry.value
+
+        lease = settings.CALCULATOR_CACHE_LOCK_TIMEOUT
+        deadline = time.monotonic() + lease
+        while lease > 0:
+            token = uuid.uuid4().hex
+            if cache.add(f"{key}:lock", token, timeout=lease):
+                return self._compute_locked(key, token, entry, compute, timeout)
+            if entry is not None:
+                # Someone else is already refreshing it
+                return entry.value
+            if time.monotonic() >= deadline:
+                self._count("lock_timeouts")
+                break
+
+            self._count("lock_waits")
+            time.sleep(LOCK_POLL_INTERVAL)
+            with phase("cache"):
+                entry = cache.get(key)
+            if entry is not None:
+                mark("cache", "l2")
+                if (local := self._local_cache()) is not None:
+                    local.set(key, entry)
+                return entry.value
+        return self._compute(key, compute, timeout)
+
+    async def aget_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[dict[str, Any]]],
+        timeout: int = 3600,  # noqa: ASYNC109
+    ) -> dict[str, Any]:
+        """Async counterpart of `get_or_compute`, sharing its lock."""
+        entry = await self._aget_entry(key)
+        if entry is not None and not self._expires_early(entry):
+            return entry.value
+
+        lease = settings.CALCULATOR_CACHE_LOCK_TIMEOUT
+        deadline = time.monotonic() + lease
+        while lease > 0:
+            token = uuid.uuid4().hex
+            if await cache.aadd(f"{key}:lock", token, timeout=lease):
+                return await self._acompute_locked(key, token, entry, compute, timeout)
+            if entry is not None:
+                return entry.value
+            if time.monotonic() >= deadline:
+                self._count("lock_timeouts")
+                break
+
+            self._count("lock_waits")
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            with phase("cache"):
+                entry = await cache.aget(key)
+            if entry is not None:
+                mark("cache", "l2")
+                if (local := self._local_cache()) is not None:
+                    local.set(key, entry)
+                return entry.value
+        return await self._acompute(key, compute, timeout)
 
     def generate_key(
         self,
@@ -23,11 +211,171 @@ class FuelCalculationCache:
         passengers: int,
         config: dict[str, Any],
     ) -> str:
-        params = {
-            "airplane_id": airplane_id,
-            "passengers": passengers,
-            "time_unit": config["time_unit"],
-            **{k: v for k, v in config.items() if k != "time_unit"},
+        # Fixed field order instead of a hash: float reprs round-trip and
+        # never contain ":", and log_base/time_unit are fixed choices, so
+        # distinct inputs always map to distinct keys.
+        return (
+            f"{CACHE_KEY_PREFIX}:{airplane_id:d}:{passengers:d}"
+            f":{float(config['fuel_capacity_multiplier'])!r}"
+            f":{config['log_base']}"
+            f":{float(config['passenger_fuel_impact'])!r}"
+            f":{float(config['fuel_consumption_coefficient'])!r}"
+            f":{config['time_unit']}"
+        )
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        local = cls._local_cache()
+        return {
+            "l1_hits": cls._stats["l1_hits"],
+            "l1_misses": cls._stats["l1_misses"],
+            "l1_size": len(local) if local is not None else 0,
+            "l1_maxsize": local.maxsize if local is not None else 0,
+            "l2_hits": cls._stats["l2_hits"],
+            "l2_misses": cls._stats["l2_misses"],
+            "lock_waits": cls._stats["lock_waits"],
+            "lock_timeouts": cls._stats["lock_timeouts"],
+            "early_recomputes": cls._stats["early_recomputes"],
         }
-        encoded_params = json.dumps(params, sort_keys=True).encode()
-        return f"fuel:{hashlib.md5(encoded_params).hexdigest()}"  # noqa: S324
+
+    @classmethod
+    def clear_local(cls) -> None:
+        if cls._local is not None:
+            cls._local.clear()
+
+    @classmethod
+    def reset_local(cls) -> None:
+        cls._local = None
+        cls._stats.clear()
+
+    @classmethod
+    def _count(cls, event: str, amount: int = 1) -> None:
+        if amount:
+            cls._stats[event] += amount
+            CACHE_EVENTS.labels(event).inc(amount)
+
+    def _get_entry(self, key: str) -> CachedResult | None:
+        local = self._local_cache()
+        if local is not None:
+            if (entry := local.get(key)) is not None:
+                self._count("l1_hits")
+                mark("cache", "l1")
+                return entry
+            self._count("l1_misses")
+
+        with phase("cache"):
+            entry = cache.get(key)
+        if entry is None:
+            self._count("l2_misses")
+            mark("cache", "miss")
+            return None
+        self._count("l2_hits")
+        mark("cache", "l2")
+        if local is not None:
+            local.set(key, entry)
+        return entry
+
+    def _compute_locked(
+        self,
+        key: str,
+        token: str,
+        entry: CachedResult | None,
+        compute: Callable[[], dict[str, Any]],
+        timeout: int,
+    ) -> dict[str, Any]:
+        try:
+            # The previous lock holder may have stored it while we waited
+            if entry is None and (entry := cache.get(key)) is not None:
+                return entry.value
+            if entry is not None:
+                self._count("early_recomputes")
+            return self._compute(key, compute, timeout)
+        finally:
+            # Not atomic, but an expired lease only costs one extra computation
+            if cache.get(f"{key}:lock") == token:
+                cache.delete(f"{key}:lock")
+
+    async def _aget_entry(self, key: str) -> CachedResult | None:
+        local = self._local_cache()
+        if local is not None:
+            if (entry := local.get(key)) is not None:
+                self._count("l1_hits")
+                mark("cache", "l1")
+                return entry
+            self._count("l1_misses")
+
+        with phase("cache"):
+            entry = await cache.aget(key)
+        if entry is None:
+            self._count("l2_misses")
+            mark("cache", "miss")
+            return None
+        self._count("l2_hits")
+        mark("cache", "l2")
+        if local is not None:
+            local.set(key, entry)
+        return entry
+
+    async def _acompute_locked(
+        self,
+        key: str,
+        token: str,
+        entry: CachedResult | None,
+        compute: Callable[[], Awaitable[dict[str, Any]]],
+        timeout: int,  # noqa: ASYNC109
+    ) -> dict[str, Any]:
+        try:
+            if entry is None and (entry := await cache.aget(key)) is not None:
+                return entry.value
+            if entry is not None:
+                self._count("early_recomputes")
+            return await self._acompute(key, compute, timeout)
+        finally:
+            if await cache.aget(f"{key}:lock") == token:
+                await cache.adelete(f"{key}:lock")
+
+    async def _acompute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[dict[str, Any]]],
+        timeout: int,  # noqa: ASYNC109
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        value = await compute()
+        entry = CachedResult(value, time.perf_counter() - start, time.time() + timeout)
+        with phase("cache"):
+            await cache.aset(key, entry, timeout=timeout)
+        if (local := self._local_cache()) is not None:
+            local.set(key, entry)
+        return value
+
+    def _compute(
+        self,
+        key: str,
+        compute: Callable[[], dict[str, Any]],
+        timeout: int,
+    ) -> dict[str, Any]:
+        start = time.perf_counter()
+        value = compute()
+        self.set(key, value, timeout=timeout, delta=time.perf_counter() - start)
+        return value
+
+    def _expires_early(self, entry: CachedResult) -> bool:
+        # XFetch: the closer to expiry and the slower the computation, the
+        # likelier a read triggers a refresh.
+        beta = settings.CALCULATOR_CACHE_XFETCH_BETA
+        if beta <= 0:
+            return False
+        jitter = -math.log(1.0 - random.random())  # noqa: S311
+        return time.time() + entry.delta * beta * jitter >= entry.expires_at
+
+    @classmethod
+    def _local_cache(cls) -> LocalLRUCache | None:
+        if settings.CALCULATOR_L1_CACHE_SIZE <= 0:
+            return None
+        if cls._local is None:
+            cls._local = LocalLRUCache(
+                maxsize=settings.CALCULATOR_L1_CACHE_SIZE,
+                ttl=settings.CALCULATOR_L1_CACHE_TTL,
+            )
+        return cls._local
@@ -0,0 +1,90 @@
+import hashlib
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db.models import Model
+from django.utils.cache import get_conditional_response
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.utils.http import quote_etag
+
+TABLE_VERSION_CACHE_KEY = "calculator:table_version:{}"
+
+
+def get_table_version(model: type[Model]) -> tuple[str, float]:
+    """Token changed by every write to the table, and the time of that write."""
+    key = TABLE_VERSION_CACHE_KEY.format(model._meta.label_lower)  # noqa: SLF001
+    version = cache.get(key)
+    if version is None:
+        # Lost with the cache: validators handed out before no longer match
+        version = (uuid.uuid4().hex, time.time())
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_table_version(model: type[Model]) -> None:
+    # A random token rather than a counter, which could go back to a value
+    # clients hold if the cache is flushed.
+    cache.set(
+        TABLE_VERSION_CACHE_KEY.format(model._meta.label_lower),  # noqa: SLF001
+        (uuid.uuid4().hex, time.time()),
+        timeout=None,
+    )
+
+
+class ConditionalGetMixin:
+    """ETag and Last-Modified validators for list and retrieve.
+
+    They are derived from the versions of `conditional_tables`, bumped by the
+    signals once writes commit, so that 304 Not Modified is answered without
+    querying them. Writes without signals, such as bulk_create() or queryset
+    updates, must call `bump_table_version()`.
+    """
+
+    conditional_tables: tuple[type[Model], ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(super().list, request, *args, **kwargs)  # pyright: ignore [reportAttributeAccessIssue]
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditional(super().retrieve, request, *args, **kwargs)  # pyright: ignore [reportAttributeAccessIssue]
+
+    def _conditional(self, handler, request, *args, **kwargs):
+        # Read before the tables, so that a concurrent write can only make
+        # the validators older than the response, never newer.
+        versions = [get_table_version(model) for model in self.conditional_tables]
+        etag = quote_etag(
+            hashlib.md5(
+                "\n".join(
+                    [
+                        request.get_full_path(),
+                        request.accepted_media_type,
+                        str(request.user.pk),
+                        *(token for token, _ in versions),
+                    ],
+                ).encode(),
+                usedforsecurity=False,
+            ).hexdigest(),
+        )
+        last_modified = int(max(modified for _, modified in versions))
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            # Clients revalidate instead of guessing how long it stays fresh
+            patch_cache_control(response, no_cache=True)
+            # Like the ETag, the response depends on the format and the user
+            patch_vary_headers(response, ["Accept", "Cookie", "Authorization"])
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True)
+        return response
@@ -1,27 +1,52 @@
+import time
+import uuid
 from typing import Any
+from typing import NamedTuple
 
+from django.conf import settings
+from django.core.cache import cache
+
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
 from fuel_tracker.calculator.models import Configuration
+from fuel_tracker.observability.timing import phase
+
+CONFIG_VERSION_CACHE_KEY = "calculator:config_version"
+
+
+class _CachedConfiguration(NamedTuple):
+    config: Configuration
+    version: str | None
+    expires_at: float
 
 
 class ConfigurationManager:
     VALID_LOG_BASES = ["10", "e"]
     VALID_TIME_UNITS = ["minute", "hour", "day"]
 
+    # Latest configuration shared by every manager in this process
+    _cached_config: _CachedConfiguration | None = None
+
     def get_merged_config(
         self,
         override: dict[str, Any] | None = None,
     ) -> dict[str, Any]:
-        config = self._get_latest_config()
-        merged = {
+        merged = self.get_active_config()
+        if override:
+            merged.update(override)
+        return merged
+
+    def get_active_config(self, *, use_cache: bool = True) -> dict[str, Any]:
+        with phase("config"):
+            config = (
+                self._get_latest_config() if use_cache else self._fetch_latest_config()
+            )
+        return {
             "fuel_capacity_multiplier": config.fuel_capacity_multiplier,
             "log_base": config.log_base,
             "passenger_fuel_impact": config.passenger_fuel_impact,
             "fuel_consumption_coefficient": config.fuel_consumption_coefficient,
             "time_unit": config.time_unit,
         }
-        if override:
-            merged.update(override)
-        return merged
 
     def validate_config(self, config: dict[str, Any]) -> None:
         if config["log_base"] not in self.VALID_LOG_BASES:
@@ -31,7 +56,44 @@ class ConfigurationManager:
             msg = "Invalid time unit"
             raise ValueError(msg)
 
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        cls._cached_config = None
+        # Results under the previous configuration are no longer reachable
+        FuelCalculationCache.clear_local()
+
+    @classmethod
+    def publish_new_version(cls) -> None:
+        # Other processes compare this version once their cached entry
+        # expires and reload the configuration if it changed.
+        cache.set(CONFIG_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        cls.invalidate_cache()
+
     def _get_latest_config(self) -> Configuration:
+        ttl = settings.CALCULATOR_CONFIG_CACHE_TTL
+        if ttl <= 0:
+            return self._fetch_latest_config()
+
+        now = time.monotonic()
+        cached = ConfigurationManager._cached_config
+        if cached is not None and now < cached.expires_at:
+            return cached.config
+
+        version = cache.get(CONFIG_VERSION_CACHE_KEY)
+        if cached is not None and cached.version == version:
+            config = cached.config
+        else:
+            if cached is not None:
+                FuelCalculationCache.clear_local()
+            config = self._fetch_latest_config()
+        ConfigurationManager._cached_config = _CachedConfiguration(
+            config,
+            version,
+            now + ttl,
+        )
+        return config
+
+    def _fetch_latest_config(self) -> Configuration:
         try:
             return Configuration.objects.latest()
         except Configuration.DoesNotExist:
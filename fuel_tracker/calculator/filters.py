@@ -0,0 +1,15 @@
+import django_filters
+
+from fuel_tracker.calculator.models import FuelCalculationRecord
+
+
+class FuelCalculationRecordFilter(django_filters.FilterSet):
+    airplane_id = django_filters.NumberFilter(field_name="airplane__airplane_id")
+    # timestamp_after / timestamp_before
+    timestamp = django_filters.IsoDateTimeFromToRangeFilter()
+    # passengers_min / passengers_max
+    passengers = django_filters.RangeFilter()
+
+    class Meta:
+        model = FuelCalculationRecord
+        fields = ["airplane", "airplane_id", "time_unit", "timestamp", "passengers"]
@@ -0,0 +1,263 @@
+import http.client
+import itertools
+import json
+import math
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from dataclasses import field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+import yaml
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+@dataclass
+class RequestSpec:
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    body: Any = None
+
+
+@dataclass
+class Scenario:
+    """Traffic to send, read from a JSON or YAML file.
+
+    Paths and bodies may reference `variables`: "{name}" takes a random
+    element of a list or a random integer of a `{min, max}` range, and
+    "{seq}" the request's number. A string made of a single
+    reference keeps the value's type.
+
+    Without a `rate`, `concurrency` clients send their next request as soon
+    as the previous one completes (closed loop). With one, requests arrive
+    at `rate` per second whatever the latency (open loop), and latency is
+    measured from the arrival.
+    """
+
+    requests: list[RequestSpec]
+    concurrency: int = 8
+    rate: float | None = None
+    # Poisson or evenly spaced arrivals in open loop
+    arrivals: str = "poisson"
+    duration: float | None = 30.0
+    total_requests: int | None = None
+    variables: dict[str, Any] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "Scenario":
+        text = path.read_text()
+        data = (
+            yaml.safe_load(text)
+            if path.suffix in {".yaml", ".yml"}
+            else json.loads(text)
+        )
+        requests = [RequestSpec(**spec) for spec in data.pop("requests")]
+        scenario = cls(requests=requests, **data)
+        if not scenario.requests or any(spec.weight <= 0 for spec in scenario.requests):
+            msg = "A scenario needs requests, all with a positive weight"
+            raise ValueError(msg)
+        if scenario.arrivals not in {"poisson", "uniform"}:
+            msg = 'arrivals must be "poisson" or "uniform"'
+            raise ValueError(msg)
+        return scenario
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        return {
+            "requests": len(latencies) + self.errors,
+            "errors": self.errors,
+            "throughput": len(latencies) / elapsed if elapsed else 0.0,
+            **{
+                f"p{percentile:g}_ms": _percentile(latencies, percentile) * 1000
+                for percentile in PERCENTILES
+            },
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+class LoadTest:
+    def __init__(self, scenario: Scenario, url: str, seed: int | None = None):
+        self.scenario = scenario
+        target = urlsplit(url)
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if target.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.host = target.hostname or "127.0.0.1"
+        self.port = target.port
+        self.prefix = target.path.rstrip("/")
+        self.random = random.Random(seed)  # noqa: S311
+        self.sequence = itertools.count()
+        self.stats = {spec.name: EndpointStats() for spec in scenario.requests}
+        self.lock = threading.Lock()
+
+    def run(self) -> dict[str, Any]:
+        """Sends the scenario and returns throughput and latencies by request."""
+        scenario = self.scenario
+        deadline = (
+            time.perf_counter() + scenario.duration if scenario.duration else math.inf
+        )
+        budget = (
+            itertools.repeat(None, scenario.total_requests)
+            if scenario.total_requests is not None
+            else itertools.repeat(None)
+        )
+        start = time.perf_counter()
+        if scenario.rate:
+            self._run_open_loop(budget, deadline)
+        else:
+            self._run_closed_loop(budget, deadline)
+        elapsed = time.perf_counter() - start
+
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies += stats.latencies
+            total.errors += stats.errors
+            for status, count in stats.statuses.items():
+                total.statuses[status] = total.statuses.get(status, 0) + count
+        return {
+            "elapsed": elapsed,
+            "endpoints": {
+                name: stats.summary(elapsed) for name, stats in self.stats.items()
+            },
+            "total": total.summary(elapsed),
+        }
+
+    def _run_closed_loop(self, budget, deadline):
+        budget_lock = threading.Lock()
+
+        def client():
+            connection = self._connect()
+            while time.perf_counter() < deadline:
+                with budget_lock:
+                    if next(budget, False) is False:
+                        break
+                    request = self._next_request()
+                connection = self._send(connection, request, time.perf_counter())
+            connection.close()
+
+        self._run_clients(client)
+
+    def _run_open_loop(self, budget, deadline):
+        arrivals: queue.Queue = queue.Queue()
+
+        def client():
+            connection = self._connect()
+            while (item := arrivals.get()) is not None:
+                request, arrival = item
+                connection = self._send(connection, request, arrival)
+            connection.close()
+
+        clients = self._start_clients(client)
+        interval = 1 / self.scenario.rate
+        arrival = time.perf_counter()
+        while arrival < deadline and next(budget, False) is not False:
+            arrivals.put((self._next_request(), arrival))
+            arrival += (
+                self.random.expovariate(self.scenario.rate)
+                if self.scenario.arrivals == "poisson"
+                else interval
+            )
+            if (delay := arrival - time.perf_counter()) > 0:
+                time.sleep(delay)
+        for _ in clients:
+            arrivals.put(None)
+        for thread in clients:
+            thread.join()
+
+    def _run_clients(self, target):
+        for thread in self._start_clients(target):
+            thread.join()
+
+    def _start_clients(self, target) -> list[threading.Thread]:
+        threads = [
+            threading.Thread(target=target, daemon=True)
+            for _ in range(self.scenario.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _next_request(self) -> tuple[RequestSpec, str, bytes | None]:
+        spec = self.random.choices(
+            self.scenario.requests,
+            weights=[spec.weight for spec in self.scenario.requests],
+        )[0]
+        values = {"seq": next(self.sequence)}
+        for name, choices in self.scenario.variables.items():
+            if isinstance(choices, dict):
+                values[name] = self.random.randint(choices["min"], choices["max"])
+            else:
+                values[name] = self.random.choice(choices)
+        body = (
+            json.dumps(_render(spec.body, values)).encode()
+            if spec.body is not None
+            else None
+        )
+        return spec, self.prefix + spec.path.format(**values), body
+
+    def _connect(self) -> http.client.HTTPConnection:
+        return self.connection_class(self.host, self.port, timeout=60)
+
+    def _send(self, connection, request, arrival):
+        spec, path, body = request
+        headers = {**self.scenario.headers}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        stats = self.stats[spec.name]
+        try:
+            connection.request(spec.method, path, body, headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            with self.lock:
+                stats.errors += 1
+            connection.close()
+            return self._connect()
+
+        latency = time.perf_counter() - arrival
+        with self.lock:
+            stats.statuses[response.status] = stats.statuses.get(response.status, 0) + 1
+            if response.status >= http.client.BAD_REQUEST:
+                stats.errors += 1
+            else:
+                stats.latencies.append(latency)
+        if response.will_close:
+            connection.close()
+            return self._connect()
+        return connection
+
+
+def _render(value: Any, values: dict[str, Any]) -> Any:
+    if isinstance(value, dict):
+        return {key: _render(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_render(item, values) for item in value]
+    if isinstance(value, str):
+        if value.startswith("{") and value.endswith("}") and value[1:-1] in values:
+            return values[value[1:-1]]
+        return value.format(**values)
+    return value
+
+
+def _percentile(values: list[float], percentile: float) -> float:
+    # Nearest rank, so p99.9 of a short run is its slowest request
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(len(values) * percentile / 100) - 1)]
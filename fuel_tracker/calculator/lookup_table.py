@@ -0,0 +1,283 @@
+import fcntl
+import json
+import logging
+import math
+import os
+import struct
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.services import FuelCalculationService
+
+logger = logging.getLogger(__name__)
+
+# File layout: magic, header length, JSON header, padding to 8 bytes and a
+# float64 array of (fuel_capacity, fuel_consumption_per_minute,
+# flight_duration) rows.
+MAGIC = b"FUELTBL1"
+PREFIX = struct.Struct("<8sQ")
+COLUMNS = 3
+# Replaced when a Configuration or Airplane change commits. A table built
+# under another version is stale and ignored by every host.
+LOOKUP_TABLE_VERSION_CACHE_KEY = "calculator:lookup_table_version"
+
+
+class TableAirplane(NamedTuple):
+    airplane_id: int
+    max_passengers: int
+    # Row of the airplane's zero passenger result
+    offset: int
+
+
+class LookupTable:
+    """Read-only view of a table written by `build_lookup_table`.
+
+    Holds every result for passenger counts from 0 to `max_passengers` of
+    every airplane under `config`, memory-mapped so the pages are shared
+    by all processes reading the same file.
+    """
+
+    def __init__(self, path: Path):
+        with path.open("rb") as f:
+            magic, header_size = PREFIX.unpack(f.read(PREFIX.size))
+            if magic != MAGIC:
+                msg = f"{path} is not a calculation lookup table"
+                raise ValueError(msg)
+            header = json.loads(f.read(header_size))
+
+        self.config: dict[str, Any] = header["config"]
+        # Missing from tables written before versions existed
+        self.version: str | None = header.get("version")
+        self.airplanes = {
+            pk: TableAirplane(airplane_id, max_passengers, offset)
+            for pk, airplane_id, max_passengers, offset in header["airplanes"]
+        }
+        rows = header["rows"]
+        data_offset = _align(PREFIX.size + header_size)
+        # Plain ndarray view, indexing a np.memmap is several times slower
+        self.values = (
+            np.memmap(
+                path,
+                dtype="<f8",
+                mode="r",
+                offset=data_offset,
+                shape=(rows, COLUMNS),
+            ).view(np.ndarray)
+            if rows
+            else np.empty((0, COLUMNS))
+        )
+
+    def get_airplane(self, pk: int) -> TableAirplane | None:
+        return self.airplanes.get(pk)
+
+    def get(self, airplane: TableAirplane, passengers: int) -> dict[str, Any] | None:
+        if not 0 <= passengers <= airplane.max_passengers:
+            return None
+        fuel_capacity, consumption, duration = self.values[
+            airplane.offset + passengers
+        ].tolist()
+        if math.isnan(duration):
+            # Failed calculations are left to the regular path and its errors
+            return None
+        return {
+            "fuel_capacity": fuel_capacity,
+            "fuel_consumption_per_minute": consumption,
+            "flight_duration": duration,
+            "time_unit": self.config["time_unit"],
+        }
+
+
+class _CheckedVersion(NamedTuple):
+    version: str | None
+    expires_at: float
+
+
+_table: LookupTable | None = None
+_table_stat: tuple[int, int] | None = None
+_checked_version: _CheckedVersion | None = None
+
+
+def get_lookup_table() -> LookupTable | None:
+    """Returns the current table, unless it is stale or missing.
+
+    The shared version is read at most every
+    CALCULATOR_LOOKUP_TABLE_VERSION_TTL seconds, so that most requests
+    make no cache round trip.
+    """
+    if not settings.CALCULATOR_LOOKUP_TABLE_PATH:
+        return None
+    checked = _fresh_checked_version()
+    if checked is None:
+        checked = _check_version(cache.get(LOOKUP_TABLE_VERSION_CACHE_KEY))
+    return _current_table(checked.version)
+
+
+async def aget_lookup_table() -> LookupTable | None:
+    if not settings.CALCULATOR_LOOKUP_TABLE_PATH:
+        return None
+    checked = _fresh_checked_version()
+    if checked is None:
+        checked = _check_version(await cache.aget(LOOKUP_TABLE_VERSION_CACHE_KEY))
+    return _current_table(checked.version)
+
+
+def mark_lookup_table_stale() -> None:
+    global _checked_version  # noqa: PLW0603
+    cache.set(LOOKUP_TABLE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    _checked_version = None
+
+
+def lookup_table_is_stale() -> bool:
+    table = _open_table()
+    return table is None or table.version != cache.get(
+        LOOKUP_TABLE_VERSION_CACHE_KEY,
+    )
+
+
+def _fresh_checked_version() -> _CheckedVersion | None:
+    checked = _checked_version
+    if checked is not None and time.monotonic() < checked.expires_at:
+        return checked
+    return None
+
+
+def _check_version(version: str | None) -> _CheckedVersion:
+    global _checked_version  # noqa: PLW0603
+    _checked_version = _CheckedVersion(
+        version,
+        time.monotonic() + settings.CALCULATOR_LOOKUP_TABLE_VERSION_TTL,
+    )
+    return _checked_version
+
+
+def _current_table(version: str | None) -> LookupTable | None:
+    table = _open_table()
+    if table is None or version is None or table.version != version:
+        return None
+    return table
+
+
+def _open_table() -> LookupTable | None:
+    """Opens the table file, again once it has been replaced."""
+    global _table, _table_stat  # noqa: PLW0603
+    path = settings.CALCULATOR_LOOKUP_TABLE_PATH
+    try:
+        stat = os.stat(path)  # noqa: PTH116
+    except FileNotFoundError:
+        _table = _table_stat = None
+        return None
+
+    # os.replace gives the new table a new inode, while the previous
+    # mapping stays valid for as long as it is referenced.
+    if (stat.st_ino, stat.st_mtime_ns) != _table_stat:
+        try:
+            _table = LookupTable(Path(path))
+        except (OSError, ValueError):
+            logger.exception("Failed to open lookup table %s", path)
+            _table = None
+        _table_stat = (stat.st_ino, stat.st_mtime_ns)
+    return _table
+
+
+def reset_lookup_table() -> None:
+    global _table, _table_stat, _checked_version  # noqa: PLW0603
+    _table = _table_stat = _checked_version = None
+
+
+def build_lookup_table(path: Path | None = None) -> int:
+    """Writes the table for the active configuration and swaps it in.
+
+    Returns the number of rows written. Airplanes past
+    `CALCULATOR_LOOKUP_TABLE_MAX_ROWS` are left out and calculated as usual.
+    Run by the `build_lookup_table` command, not by requests.
+    """
+    path = Path(path or settings.CALCULATOR_LOOKUP_TABLE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Serializes builders on this host, so the last one to finish read the
+    # latest committed state.
+    with path.with_suffix(".lock").open("w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        # Read before the data: a change committed meanwhile replaces it,
+        # leaving this table stale rather than wrongly current.
+        cache.add(LOOKUP_TABLE_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(LOOKUP_TABLE_VERSION_CACHE_KEY)
+        config = ConfigurationManager().get_active_config(use_cache=False)
+        airplanes = []
+        rows = 0
+        for pk, airplane_id, max_passengers in Airplane.objects.order_by(
+            "pk",
+        ).values_list("pk", "airplane_id", "max_passengers"):
+            if rows + max_passengers + 1 > settings.CALCULATOR_LOOKUP_TABLE_MAX_ROWS:
+                logger.warning("Lookup table full, airplane %s left out", pk)
+                continue
+            airplanes.append((pk, airplane_id, max_passengers, rows))
+            rows += max_passengers + 1
+
+        values = _calculate_rows(airplanes, config, rows)
+        header = json.dumps(
+            {
+                "config": config,
+                "version": version,
+                "airplanes": airplanes,
+                "rows": rows,
+            },
+        ).encode()
+        padding = _align(PREFIX.size + len(header)) - PREFIX.size - len(header)
+
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent,
+            prefix=f".{path.name}.",
+            delete=False,
+        ) as f:
+            try:
+                f.write(PREFIX.pack(MAGIC, len(header)))
+                f.write(header)
+                f.write(b"\0" * padding)
+                f.write(values.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                Path(f.name).unlink()
+                raise
+        Path(f.name).chmod(0o644)
+        Path(f.name).replace(path)
+    return rows
+
+
+def _calculate_rows(
+    airplanes: list[tuple[int, int, int, int]],
+    config: dict[str, Any],
+    rows: int,
+) -> np.ndarray:
+    airplane_ids = np.empty(rows, dtype=np.int64)
+    passengers = np.empty(rows, dtype=np.int64)
+    for _, airplane_id, max_passengers, offset in airplanes:
+        airplane_ids[offset : offset + max_passengers + 1] = airplane_id
+        passengers[offset : offset + max_passengers + 1] = np.arange(
+            max_passengers + 1,
+        )
+
+    arrays = FuelCalculationService().calculate_many(airplane_ids, passengers, config)
+    return np.column_stack(
+        [
+            arrays.fuel_capacity,
+            arrays.fuel_consumption_per_minute,
+            arrays.flight_duration,
+        ],
+    ).astype("<f8")
+
+
+def _align(size: int) -> int:
+    return (size + 7) // 8 * 8
@@ -0,0 +1,130 @@
+import json
+import platform
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+
+from fuel_tracker.calculator.benchmarks import BENCHMARKS
+from fuel_tracker.calculator.benchmarks import compare
+from fuel_tracker.calculator.benchmarks import run_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the calculator hot paths, optionally saving the results as a "
+        "baseline or failing when they are slower than a saved baseline. "
+        "Data is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-k",
+            "--case",
+            action="append",
+            help="Only run cases whose name contains this, repeatable.",
+        )
+        parser.add_argument("--list", action="store_true", help="List the cases.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--min-time",
+            type=float,
+            default=0.2,
+            help="Seconds each of the repeated timings lasts at least.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the results to this JSON baseline file.",
+        )
+        parser.add_argument(
+            "--compare",
+            type=Path,
+            help="Baseline file to compare the results with.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.1,
+            help="Slowdown of the median, as a fraction of the baseline, "
+            "reported as a regression.",
+        )
+
+    def handle(self, *args, **options):
+        names = [
+            name
+            for name in BENCHMARKS
+            if not options["case"] or any(case in name for case in options["case"])
+        ]
+        if options["list"]:
+            self.stdout.write("\n".join(names))
+            return
+        if not names:
+            msg = "No benchmark matches the given cases"
+            raise CommandError(msg)
+        baseline = (
+            json.loads(options["compare"].read_text()) if options["compare"] else None
+        )
+        if settings.DEBUG:
+            self.stderr.write(
+                "DEBUG is on, recording queries and running debug middleware "
+                "make the timings unrepresentative.",
+            )
+
+        results = {}
+        self.stdout.write(f"{'case':<32}{'median (us)':>14}{'min (us)':>12}")
+        for name in names:
+            results[name] = run_benchmark(name, options["repeat"], options["min_time"])
+            self.stdout.write(
+                f"{name:<32}{results[name]['median_us']:>14.2f}"
+                f"{results[name]['min_us']:>12.2f}",
+            )
+
+        environment = {
+            "python": platform.python_version(),
+            "vendor": connection.vendor,
+            "cache": settings.CACHES["default"]["BACKEND"],
+            "debug": settings.DEBUG,
+        }
+        if options["output"]:
+            options["output"].write_text(
+                json.dumps(
+                    {"environment": environment, "results": results},
+                    indent=2,
+                ),
+            )
+        if baseline is not None:
+            self._compare(results, baseline, environment, options["threshold"])
+
+    def _compare(self, results, baseline, environment, threshold):
+        if baseline["environment"] != environment:
+            self.stderr.write(
+                f"Baseline environment {baseline['environment']} differs from "
+                f"{environment}",
+            )
+        self.stdout.write(
+            f"\n{'case':<32}{'baseline (us)':>14}{'current (us)':>14}{'change':>9}",
+        )
+        regressions = []
+        for name, before, after, regressed in compare(
+            results,
+            baseline["results"],
+            threshold,
+        ):
+            line = (
+                f"{name:<32}{before:>14.2f}{after:>14.2f}"
+                f"{(after / before - 1) * 100:>+8.1f}%"
+            )
+            if regressed:
+                regressions.append(name)
+                line = self.style.ERROR(f"{line}  regression")
+            self.stdout.write(line)
+
+        if regressions:
+            msg = (
+                f"{len(regressions)} cases slower than the baseline by more than "
+                f"{threshold:.0%}: {', '.join(regressions)}"
+            )
+            raise CommandError(msg)
@@ -0,0 +1,257 @@
+import http.client
+import itertools
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db.models import Max
+
+from fuel_tracker.calculator.models import Airplane
+
+# Environment of each deployment, started with gunicorn.conf.py
+DEPLOYMENTS = {
+    "wsgi-sync": {"GUNICORN_WORKER_CLASS": "sync", "CALCULATOR_ASYNC_VIEWS": "False"},
+    "wsgi-gthread": {
+        "GUNICORN_WORKER_CLASS": "gthread",
+        "CALCULATOR_ASYNC_VIEWS": "False",
+    },
+    "asgi-uvicorn": {
+        "GUNICORN_WORKER_CLASS": "uvicorn",
+        "CALCULATOR_ASYNC_VIEWS": "True",
+    },
+}
+STARTUP_TIMEOUT = 30
+
+
+class Command(BaseCommand):
+    help = (
+        "Starts calculate_fuel under each gunicorn worker model with the same "
+        "worker count and compares throughput, latency percentiles and memory. "
+        "Servers use gunicorn.conf.py and this process' settings and database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--distinct-keys",
+            type=int,
+            default=200,
+            help="Passenger counts cycled through, so the first requests for "
+            "each count miss the result cache.",
+        )
+        parser.add_argument("--port", type=int, default=8765)
+        parser.add_argument(
+            "--deployment",
+            action="append",
+            choices=list(DEPLOYMENTS),
+            help="Deployment to run, repeatable. Defaults to all of them.",
+        )
+        parser.add_argument(
+            "--no-preload",
+            action="store_true",
+            help="Load the application in every worker instead of the master.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the results to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        next_id = (
+            Airplane.objects.aggregate(Max("airplane_id"))["airplane_id__max"] or 0
+        ) + 1
+        airplane = Airplane.objects.create(
+            airplane_id=next_id,
+            name="Benchmark",
+            max_passengers=options["distinct_keys"],
+        )
+        try:
+            results = {}
+            for name in options["deployment"] or DEPLOYMENTS:
+                with self._serve(DEPLOYMENTS[name], options) as process:
+                    results[name] = self._load(options["port"], airplane.pk, options)
+                    results[name].update(self._memory(process.pid))
+        finally:
+            # Also removes the records written by the benchmark
+            airplane.delete()
+
+        self.stdout.write(
+            f"{options['requests']} requests, concurrency "
+            f"{options['concurrency']}, {options['workers']} workers, "
+            f"preload {'off' if options['no_preload'] else 'on'}, "
+            f"{os.cpu_count()} CPUs (load generator included)",
+        )
+        self.stdout.write(
+            f"{'deployment':<16}{'req/s':>10}{'p50 (ms)':>12}"
+            f"{'p99 (ms)':>12}{'errors':>8}{'RSS (MB)':>10}{'PSS (MB)':>10}",
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<16}{result['throughput']:>10.1f}"
+                f"{result['p50_ms']:>12.2f}{result['p99_ms']:>12.2f}"
+                f"{result['errors']:>8}{result['rss_mb']:>10.1f}"
+                f"{result['pss_mb']:>10.1f}",
+            )
+
+        if options["output"]:
+            options["output"].write_text(
+                json.dumps(
+                    {
+                        "options": {
+                            key: options[key]
+                            for key in (
+                                "workers",
+                                "concurrency",
+                                "requests",
+                                "distinct_keys",
+                                "no_preload",
+                            )
+                        },
+                        "cpus": os.cpu_count(),
+                        "results": results,
+                    },
+                    indent=2,
+                ),
+            )
+
+    @contextmanager
+    def _serve(self, env, options):
+        port = options["port"]
+        # A file rather than a pipe, which would block the server once full
+        with tempfile.TemporaryFile() as log:
+            process = subprocess.Popen(  # noqa: S603
+                [
+                    sys.executable,
+                    "-m",
+                    "gunicorn",
+                    "--config",
+                    "gunicorn.conf.py",
+                    "--backlog",
+                    str(max(options["concurrency"] * 2, 64)),
+                ],
+                cwd=settings.BASE_DIR,
+                env={
+                    **os.environ,
+                    "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+                    "GUNICORN_BIND": f"127.0.0.1:{port}",
+                    "GUNICORN_PRELOAD": str(not options["no_preload"]),
+                    "WEB_CONCURRENCY": str(options["workers"]),
+                    **env,
+                },
+                stdout=subprocess.DEVNULL,
+                stderr=log,
+            )
+            try:
+                self._wait_until_ready(process, port, log)
+                yield process
+            finally:
+                process.terminate()
+                process.wait(timeout=STARTUP_TIMEOUT)
+
+    def _wait_until_ready(self, process, port, log):
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                log.seek(0)
+                msg = f"Server exited: {log.read().decode()}"
+                raise CommandError(msg)
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            except OSError:
+                time.sleep(0.1)
+            else:
+                return
+        msg = f"Server did not listen on port {port}"
+        raise CommandError(msg)
+
+    def _memory(self, pid):
+        # Summed over the master and its workers. PSS splits pages shared
+        # between processes among them, so it shows what preloading saves.
+        pids = [pid]
+        for stat in Path("/proc").glob("[0-9]*/stat"):
+            try:
+                fields = stat.read_text().rsplit(")", 1)[1].split()
+            except OSError:
+                continue
+            if int(fields[1]) == pid:
+                pids.append(int(stat.parent.name))
+
+        totals = {"rss_mb": 0.0, "pss_mb": 0.0}
+        for child in pids:
+            try:
+                rollup = Path(f"/proc/{child}/smaps_rollup").read_text()
+            except OSError:
+                return {"rss_mb": float("nan"), "pss_mb": float("nan")}
+            for line in rollup.splitlines():
+                name, _, value = line.partition(":")
+                if name in {"Rss", "Pss"}:
+                    totals[f"{name.lower()}_mb"] += int(value.split()[0]) / 1024
+        return totals
+
+    def _load(self, port, pk, options):
+        path = f"/api/airplanes/{pk}/calculate_fuel/"
+        # A fresh multiplier per run, so every deployment starts cold
+        multiplier = 200.0 + time.time() % 1
+        counter = itertools.count()
+        latencies = []
+        errors = []
+
+        def run():
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            while (index := next(counter)) < options["requests"]:
+                body = json.dumps(
+                    {
+                        "passengers": index % options["distinct_keys"] + 1,
+                        "config_override": {"fuel_capacity_multiplier": multiplier},
+                    },
+                )
+                start = time.perf_counter()
+                try:
+                    connection.request(
+                        "POST",
+                        path,
+                        body,
+                        {"Content-Type": "application/json"},
+                    )
+                    response = connection.getresponse()
+                    response.read()
+                except (OSError, http.client.HTTPException):
+                    errors.append(index)
+                    connection.close()
+                    continue
+                latencies.append(time.perf_counter() - start)
+                if response.status != http.client.OK:
+                    errors.append(index)
+            connection.close()
+
+        threads = [threading.Thread(target=run) for _ in range(options["concurrency"])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        percentiles = (
+            statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0.0] * 99
+        )
+        return {
+            "throughput": len(latencies) / elapsed,
+            "p50_ms": percentiles[49] * 1000,
+            "p99_ms": percentiles[98] * 1000,
+            "errors": len(errors),
+        }
@@ -0,0 +1,53 @@
+import hashlib
+import json
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+
+CONFIG = {
+    "fuel_capacity_multiplier": 200.0,
+    "log_base": "10",
+    "passenger_fuel_impact": 0.002,
+    "fuel_consumption_coefficient": 0.80,
+    "time_unit": "minute",
+}
+
+
+def legacy_generate_key(airplane_id, passengers, config):
+    # Previous implementation: sorted JSON of the parameters hashed with MD5
+    params = {
+        "airplane_id": airplane_id,
+        "passengers": passengers,
+        "time_unit": config["time_unit"],
+        **{k: v for k, v in config.items() if k != "time_unit"},
+    }
+    encoded_params = json.dumps(params, sort_keys=True).encode()
+    return f"fuel:{hashlib.md5(encoded_params).hexdigest()}"  # noqa: S324
+
+
+class Command(BaseCommand):
+    help = "Compares FuelCalculationCache.generate_key with the legacy MD5 keys."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        implementations = {
+            "legacy (json + md5)": legacy_generate_key,
+            "current": FuelCalculationCache().generate_key,
+        }
+        results = {}
+        for name, generate_key in implementations.items():
+            timings = timeit.repeat(
+                lambda generate_key=generate_key: generate_key(7, 150, CONFIG),
+                number=options["number"],
+                repeat=options["repeat"],
+            )
+            results[name] = min(timings) / options["number"] * 1e9
+            self.stdout.write(f"{name:<24}{results[name]:>10.0f} ns/key")
+
+        legacy, current = results.values()
+        self.stdout.write(f"speedup: {legacy / current:.1f}x")
@@ -0,0 +1,268 @@
+import json
+import statistics
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import models
+from django.db import transaction
+from django.utils import timezone
+
+from fuel_tracker.calculator.filters import FuelCalculationRecordFilter
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+
+SEED_WINDOW = timedelta(days=30)
+SEED_BATCH_SIZE = 10_000
+MAX_PASSENGERS = 300
+TIME_UNITS = ["minute", "hour", "day"]
+
+# Records are seeded into a copy of the FuelCalculationRecord table, so the
+# indexes of the table the API serves are never dropped or locked.
+SCRATCH_TABLE = "calculator_fuelcalculationrecord_benchmark"
+SCRATCH_INDEX_PREFIX = "calc_bench"
+
+# The foreign key index of 0001_initial, which 0002 replaces with the
+# composite indexes. "Before" is measured against it.
+BASELINE_INDEXES = [models.Index(fields=["airplane"], name="calc_bench_airplane_idx")]
+
+# /api/results/ filter parameters, formatted with the seeded data
+QUERIES = {
+    "airplane_last_hour": {
+        "airplane": "{airplane}",
+        "timestamp_after": "{last_hour}",
+    },
+    "time_range": {
+        "timestamp_after": "{last_day}",
+        "timestamp_before": "{last_hour}",
+    },
+    "time_unit_last_day": {
+        "time_unit": "hour",
+        "timestamp_after": "{last_day}",
+    },
+    "airplane_passengers": {
+        "airplane": "{airplane}",
+        "passengers_min": "100",
+        "passengers_max": "120",
+    },
+}
+
+
+_scratch_model = None
+
+
+def get_scratch_model():
+    """Returns a model of the scratch copy of the FuelCalculationRecord table.
+
+    The model is unmanaged and defined once per process; the command creates
+    and drops its table.
+    """
+    global _scratch_model  # noqa: PLW0603
+    if _scratch_model is None:
+        options = FuelCalculationRecord._meta  # noqa: SLF001
+        attrs = {"__module__": __name__}
+        for field in options.local_fields:
+            name, path, args, kwargs = field.deconstruct()
+            if field.is_relation:
+                # Inserts do not lock the airplane table
+                kwargs.update(related_name="+", db_constraint=False)
+            attrs[name] = type(field)(*args, **kwargs)
+        attrs["Meta"] = type(
+            "Meta",
+            (),
+            {
+                "app_label": options.app_label,
+                "db_table": SCRATCH_TABLE,
+                "managed": False,
+                "indexes": [
+                    models.Index(
+                        fields=index.fields,
+                        name=index.name.replace("calc_record", SCRATCH_INDEX_PREFIX),
+                    )
+                    for index in options.indexes
+                ],
+            },
+        )
+        _scratch_model = type("FuelCalculationRecordBenchmark", (models.Model,), attrs)
+    return _scratch_model
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds records into a scratch copy of the FuelCalculationRecord table "
+        "and compares query plans and latencies of the /api/results/ filters "
+        "on the initial schema, with the foreign key index only, and with the "
+        "composite indexes. The scratch table is dropped afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000)
+        parser.add_argument("--airplanes", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=100)
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write plans and latencies to this JSON file.",
+        )
+        parser.add_argument(
+            "--i-know",
+            action="store_true",
+            help=(
+                "Run with DEBUG off. The rows are written to a scratch table, "
+                "but seeding them loads the database server."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options["i_know"]:
+            msg = (
+                f"This seeds {options['rows']} rows into the "
+                f"{connection.settings_dict['NAME']} database and DEBUG is off. "
+                "Pass --i-know to run it anyway."
+            )
+            raise CommandError(msg)
+
+        model = get_scratch_model()
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        try:
+            before, after = self._benchmark(model, options)
+        finally:
+            with connection.schema_editor() as editor:
+                editor.delete_model(model)
+
+        self.stdout.write(f"{options['rows']} rows on {connection.vendor}")
+        self.stdout.write(
+            f"{'query':<24}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}",
+        )
+        for name in QUERIES:
+            before_ms = before[name]["median_ms"]
+            after_ms = after[name]["median_ms"]
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            self.stdout.write(
+                f"{name:<24}{before_ms:>14.3f}{after_ms:>14.3f}{speedup:>9.1f}x",
+            )
+
+        if options["output"]:
+            report = {
+                "vendor": connection.vendor,
+                "rows": options["rows"],
+                "queries": QUERIES,
+                "before": before,
+                "after": after,
+            }
+            options["output"].write_text(json.dumps(report, indent=2))
+
+    def _benchmark(self, model, options):
+        # Rolls back the seeded airplanes
+        with transaction.atomic():
+            now = timezone.now()
+            airplane = self._seed(model, now, options["rows"], options["airplanes"])
+            params = {
+                "airplane": airplane.pk,
+                "last_hour": (now - timedelta(hours=1)).isoformat(),
+                "last_day": (now - timedelta(days=1)).isoformat(),
+            }
+            querysets = {
+                name: self._build_queryset(
+                    model,
+                    {key: value.format(**params) for key, value in query.items()},
+                    options["page_size"],
+                )
+                for name, query in QUERIES.items()
+            }
+
+            # The schema editor creates the table of an unmanaged model
+            # without its indexes.
+            indexes = model._meta.indexes  # noqa: SLF001
+            self._execute(
+                model,
+                self._index_statements(model, BASELINE_INDEXES, "create"),
+            )
+            before = self._measure(querysets, options["repeat"])
+            self._execute(
+                model,
+                self._index_statements(model, BASELINE_INDEXES, "remove")
+                + self._index_statements(model, indexes, "create"),
+            )
+            after = self._measure(querysets, options["repeat"])
+
+            transaction.set_rollback(True)
+        return before, after
+
+    def _seed(self, model, now, rows, airplanes_count):
+        airplanes = Airplane.objects.bulk_create(
+            Airplane(
+                airplane_id=900_000 + i,
+                name=f"Benchmark {i}",
+                max_passengers=MAX_PASSENGERS,
+            )
+            for i in range(airplanes_count)
+        )
+        step = SEED_WINDOW / max(rows, 1)
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            model.objects.bulk_create(
+                model(
+                    airplane=airplanes[i % airplanes_count],
+                    timestamp=now - step * i,
+                    passengers=(i * 7919) % (MAX_PASSENGERS + 1),
+                    fuel_capacity=200.0,
+                    fuel_consumption_per_minute=1.0,
+                    flight_duration=200.0,
+                    time_unit=TIME_UNITS[i % len(TIME_UNITS)],
+                    configuration_snapshot={},
+                )
+                for i in range(start, min(start + SEED_BATCH_SIZE, rows))
+            )
+        return airplanes[0]
+
+    def _build_queryset(self, model, query, page_size):
+        filterset = FuelCalculationRecordFilter(
+            query,
+            queryset=model.objects.select_related("airplane"),
+        )
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors)
+        return filterset.qs.order_by("timestamp", "id")[:page_size]
+
+    def _index_statements(self, model, indexes, action):
+        # Statements are generated without entering the schema editor, which
+        # SQLite does not allow inside a transaction.
+        editor = connection.schema_editor()
+        return [
+            str(getattr(index, f"{action}_sql")(model, editor)) for index in indexes
+        ]
+
+    def _execute(self, model, statements):
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+            if connection.vendor == "postgresql":
+                cursor.execute(
+                    f"ANALYZE {model._meta.db_table}",  # noqa: SLF001
+                )
+
+    def _measure(self, querysets, repeat):
+        results = {}
+        for name, queryset in querysets.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            plan = (
+                queryset.explain(analyze=True)
+                if connection.vendor == "postgresql"
+                else queryset.explain()
+            )
+            results[name] = {
+                "median_ms": statistics.median(timings),
+                "min_ms": min(timings),
+                "plan": plan,
+            }
+        return results
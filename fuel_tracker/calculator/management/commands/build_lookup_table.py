@@ -0,0 +1,59 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import close_old_connections
+
+from fuel_tracker.calculator.lookup_table import build_lookup_table
+from fuel_tracker.calculator.lookup_table import lookup_table_is_stale
+
+
+class Command(BaseCommand):
+    help = (
+        "Precomputes the calculation lookup table for the active configuration "
+        "and atomically replaces CALCULATOR_LOOKUP_TABLE_PATH."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--if-stale",
+            action="store_true",
+            help="Only build when a change was committed since the last build, "
+            "e.g. when run every minute on each host.",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            metavar="SECONDS",
+            help="Keep running and check again every SECONDS.",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.CALCULATOR_LOOKUP_TABLE_PATH:
+            msg = "CALCULATOR_LOOKUP_TABLE_PATH is not set"
+            raise CommandError(msg)
+        if not options["every"]:
+            self._build(if_stale=options["if_stale"], quiet=False)
+            return
+        while True:
+            try:
+                self._build(
+                    if_stale=options["if_stale"],
+                    quiet=options["verbosity"] < 2,  # noqa: PLR2004
+                )
+            except Exception as e:  # noqa: BLE001
+                # The next round retries, e.g. once the database is back
+                self.stderr.write(f"Failed to build the lookup table: {e}")
+            close_old_connections()
+            time.sleep(options["every"])
+
+    def _build(self, *, if_stale, quiet):
+        if if_stale and not lookup_table_is_stale():
+            if not quiet:
+                self.stdout.write("Lookup table is up to date")
+            return
+        rows = build_lookup_table()
+        self.stdout.write(
+            f"Wrote {rows} rows to {settings.CALCULATOR_LOOKUP_TABLE_PATH}",
+        )
@@ -0,0 +1,56 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from fuel_tracker.calculator.record_writer import RedisRecordWriter
+from fuel_tracker.calculator.record_writer import get_record_writer
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk inserts FuelCalculationRecord rows queued in Redis when "
+        "CALCULATOR_RECORD_WRITE_MODE is 'redis'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep flushing until SIGTERM/SIGINT, then drain the queue.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.CALCULATOR_RECORD_FLUSH_INTERVAL,
+            help="Seconds to wait when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        writer = get_record_writer()
+        if not isinstance(writer, RedisRecordWriter):
+            msg = "Records are only queued when CALCULATOR_RECORD_WRITE_MODE=redis"
+            raise CommandError(msg)
+
+        self._running = options["loop"]
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        total = self._drain(writer)
+        while self._running:
+            time.sleep(options["interval"])
+            total += self._drain(writer)
+        total += self._drain(writer)
+
+        self.stdout.write(f"Flushed {total} records")
+
+    def _drain(self, writer: RedisRecordWriter) -> int:
+        total = 0
+        while flushed := writer.flush():
+            total += flushed
+        return total
+
+    def _stop(self, signum, frame):
+        self._running = False
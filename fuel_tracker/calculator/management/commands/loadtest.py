@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from fuel_tracker.calculator.loadtest import PERCENTILES
+from fuel_tracker.calculator.loadtest import LoadTest
+from fuel_tracker.calculator.loadtest import Scenario
+
+
+class Command(BaseCommand):
+    help = (
+        "Sends the request mix of a JSON or YAML scenario to a running server "
+        "and reports throughput, latency percentiles and errors per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("scenario", type=Path)
+        parser.add_argument("--url", default="http://127.0.0.1:8000")
+        parser.add_argument("--concurrency", type=int)
+        parser.add_argument(
+            "--rate",
+            type=float,
+            help="Requests per second in open loop, 0 for a closed loop.",
+        )
+        parser.add_argument("--duration", type=float, help="Seconds to run.")
+        parser.add_argument(
+            "--requests",
+            type=int,
+            help="Stop after this many requests.",
+        )
+        parser.add_argument("--seed", type=int, help="Seed of the request mix.")
+        parser.add_argument(
+            "--output",
+            type=Path,
+            help="Write the results to this JSON file.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            scenario = Scenario.load(options["scenario"])
+        except (OSError, TypeError, ValueError, KeyError) as e:
+            msg = f"Invalid scenario {options['scenario']}: {e}"
+            raise CommandError(msg) from e
+        for option, attribute in (
+            ("concurrency", "concurrency"),
+            ("rate", "rate"),
+            ("duration", "duration"),
+            ("requests", "total_requests"),
+        ):
+            if options[option] is not None:
+                setattr(scenario, attribute, options[option])
+        if scenario.duration is None and scenario.total_requests is None:
+            msg = "Set a duration or a number of requests"
+            raise CommandError(msg)
+
+        results = LoadTest(scenario, options["url"], seed=options["seed"]).run()
+
+        self.stdout.write(
+            f"{options['url']}, {scenario.concurrency} clients, "
+            + (
+                f"{scenario.rate:g} req/s {scenario.arrivals} arrivals"
+                if scenario.rate
+                else "closed loop"
+            )
+            + f", {results['elapsed']:.1f}s",
+        )
+        self.stdout.write(
+            f"{'request':<28}{'count':>8}{'errors':>8}{'req/s':>10}"
+            + "".join(f"{f'p{p:g} (ms)':>12}" for p in PERCENTILES),
+        )
+        for name, summary in [
+            *results["endpoints"].items(),
+            ("total", results["total"]),
+        ]:
+            self.stdout.write(
+                f"{name:<28}{summary['requests']:>8}{summary['errors']:>8}"
+                f"{summary['throughput']:>10.1f}"
+                + "".join(f"{summary[f'p{p:g}_ms']:>12.2f}" for p in PERCENTILES),
+            )
+
+        if options["output"]:
+            options["output"].write_text(json.dumps(results, indent=2))
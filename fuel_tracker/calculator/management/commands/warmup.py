@@ -0,0 +1,42 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from fuel_tracker.calculator.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Loads the most frequent recent calculations into the shared result "
+        "cache, e.g. after a deploy or a cache flush, and refreshes the list "
+        "of them gunicorn workers load on start."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--top",
+            type=int,
+            help="Calculations to load. Defaults to CALCULATOR_WARMUP_TOP.",
+        )
+        parser.add_argument(
+            "--window-hours",
+            type=int,
+            help="Hours of records to mine. Defaults to "
+            "CALCULATOR_WARMUP_WINDOW_HOURS.",
+        )
+
+    def handle(self, *args, **options):
+        report = warm_up(
+            top=options["top"],
+            window=(
+                timedelta(hours=options["window_hours"])
+                if options["window_hours"]
+                else None
+            ),
+            refresh=True,
+        )
+        self.stdout.write(
+            f"Resolved {report.routes} routes, built {report.serializers} "
+            f"serializers, {report.cached} results already cached, "
+            f"{report.computed} calculated in {report.seconds:.2f}s",
+        )
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.12 on 2026-10-18 07:36
+
+import django.db.models.deletion
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently so the table stays writable.
+    atomic = False
+
+    dependencies = [
+        ("calculator", "0001_initial"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="fuelcalculationrecord",
+            index=models.Index(
+                fields=["airplane", "timestamp"],
+                name="calc_record_airplane_ts_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="fuelcalculationrecord",
+            index=models.Index(
+                fields=["airplane", "passengers"],
+                name="calc_record_airplane_pax_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="fuelcalculationrecord",
+            index=models.Index(
+                fields=["time_unit", "timestamp"],
+                name="calc_record_unit_ts_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="fuelcalculationrecord",
+            index=models.Index(
+                fields=["timestamp", "id"],
+                name="calc_record_ts_id_idx",
+            ),
+        ),
+        # The foreign key index is a prefix of the composite indexes above
+        migrations.AlterField(
+            model_name="fuelcalculationrecord",
+            name="airplane",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="calculator.airplane",
+            ),
+        ),
+    ]
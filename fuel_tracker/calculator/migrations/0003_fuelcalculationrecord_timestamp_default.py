@@ -0,0 +1,23 @@
+# Generated by Django 5.0.12 on 2026-10-18 08:46
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("calculator", "0002_fuelcalculationrecord_indexes"),
+    ]
+
+    operations = [
+        # Set when the record is created rather than inserted, so records
+        # queued by the record writers keep the time of their calculation.
+        migrations.AlterField(
+            model_name="fuelcalculationrecord",
+            name="timestamp",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now,
+                editable=False,
+            ),
+        ),
+    ]
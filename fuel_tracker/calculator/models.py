@@ -1,5 +1,6 @@
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.utils import timezone
 
 
 class Configuration(models.Model):
@@ -57,8 +58,14 @@ class Airplane(models.Model):
 
 
 class FuelCalculationRecord(models.Model):
-    airplane = models.ForeignKey(Airplane, on_delete=models.CASCADE)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Covered by the (airplane, timestamp) and (airplane, passengers) indexes
+    airplane = models.ForeignKey(
+        Airplane,
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    # Time of the calculation, which queued records are inserted after
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     passengers = models.PositiveIntegerField()
     fuel_capacity = models.FloatField()
     fuel_consumption_per_minute = models.FloatField()
@@ -66,6 +73,26 @@ class FuelCalculationRecord(models.Model):
     time_unit = models.CharField(max_length=10)
     configuration_snapshot = models.JSONField()
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["airplane", "timestamp"],
+                name="calc_record_airplane_ts_idx",
+            ),
+            models.Index(
+                fields=["airplane", "passengers"],
+                name="calc_record_airplane_pax_idx",
+            ),
+            models.Index(
+                fields=["time_unit", "timestamp"],
+                name="calc_record_unit_ts_idx",
+            ),
+            models.Index(
+                fields=["timestamp", "id"],
+                name="calc_record_ts_id_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         return (
             "FuelCalculationRecord: "
@@ -0,0 +1,10 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class FuelCalculationRecordCursorPagination(CursorPagination):
+    # Keyset pagination: every page is an indexed range scan, however deep.
+    ordering = ("timestamp", "id")
+    page_size = settings.CALCULATOR_RESULTS_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.CALCULATOR_RESULTS_MAX_PAGE_SIZE
@@ -0,0 +1,39 @@
+import msgpack
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.parsers import JSONParser
+
+from fuel_tracker.calculator.renderers import MessagePackRenderer
+from fuel_tracker.calculator.renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser backed by orjson, which only reads UTF-8."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if not self.strict or encoding.lower().replace("_", "-") != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+        try:
+            # Rejects NaN and Infinity like the strict JSONParser
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            msg = f"JSON parse error - {exc}"
+            raise ParseError(msg) from exc
+
+
+class MessagePackParser(BaseParser):
+    media_type = "application/msgpack"
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read())
+        except (ValueError, msgpack.UnpackException) as exc:
+            msg = f"MessagePack parse error - {exc}"
+            raise ParseError(msg) from exc
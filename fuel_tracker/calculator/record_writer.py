@@ -0,0 +1,278 @@
+import atexit
+import json
+import logging
+import os
+import threading
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ValidationError
+from django.db import DataError
+from django.db import IntegrityError
+from django.db import connection
+from django.db import transaction
+from django_redis import get_redis_connection
+
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.observability.metrics import RECORD_INSERT_DURATION
+from fuel_tracker.observability.metrics import RECORDS_DEAD_LETTERED
+from fuel_tracker.observability.metrics import RECORDS_WRITTEN
+
+logger = logging.getLogger(__name__)
+
+# Model fields stored for a queued record. The timestamp is the time of the
+# calculation, set when the record is created.
+QUEUED_FIELDS = (
+    "timestamp",
+    "airplane_id",
+    "passengers",
+    "fuel_capacity",
+    "fuel_consumption_per_minute",
+    "flight_duration",
+    "time_unit",
+    "configuration_snapshot",
+)
+# Errors caused by the record itself, such as the airplane being deleted
+# before the flush. Any other error, e.g. the database being unreachable,
+# leaves the whole batch queued.
+RECORD_ERRORS = (IntegrityError, DataError, ValidationError, ValueError, TypeError)
+DEAD_LETTERS = 1000
+
+
+def insert_records(
+    records: list[FuelCalculationRecord],
+) -> tuple[int, list[tuple[FuelCalculationRecord, Exception]]]:
+    """Bulk inserts records, one at a time if the batch fails.
+
+    Returns the number of records inserted and the records rejected with
+    their error. Each insert is its own transaction, so that foreign keys
+    checked at commit fail on their record.
+    """
+    try:
+        with transaction.atomic():
+            FuelCalculationRecord.objects.bulk_create(records)
+    except RECORD_ERRORS:
+        pass
+    else:
+        return len(records), []
+
+    inserted = 0
+    rejected = []
+    for record in records:
+        try:
+            with transaction.atomic():
+                record.save(force_insert=True)
+        except RECORD_ERRORS as e:
+            rejected.append((record, e))
+        else:
+            inserted += 1
+    return inserted, rejected
+
+
+def serialize_record(record: FuelCalculationRecord) -> str:
+    values = {field: getattr(record, field) for field in QUEUED_FIELDS}
+    if isinstance(values["timestamp"], datetime):
+        # With microseconds, which DjangoJSONEncoder drops
+        values["timestamp"] = values["timestamp"].isoformat()
+    return json.dumps(values)
+
+
+class SyncRecordWriter:
+    """Inserts records immediately, inside the request transaction."""
+
+    def write(self, records: Iterable[FuelCalculationRecord]) -> None:
+        with RECORD_INSERT_DURATION.labels("sync").time():
+            created = FuelCalculationRecord.objects.bulk_create(records)
+        RECORDS_WRITTEN.labels("sync").inc(len(created))
+
+    async def awrite(self, records: Iterable[FuelCalculationRecord]) -> None:
+        with RECORD_INSERT_DURATION.labels("sync").time():
+            created = await FuelCalculationRecord.objects.abulk_create(records)
+        RECORDS_WRITTEN.labels("sync").inc(len(created))
+
+    def flush(self) -> int:
+        return 0
+
+
+class BufferedRecordWriter:
+    """Buffers records in process memory and inserts them in bulk.
+
+    The buffer is flushed by a background thread every `flush_interval`
+    seconds, or as soon as it holds `flush_size` records. Buffered records
+    are lost if the process is killed without running `flush()`. Records
+    that cannot be inserted are logged and kept in `dead_letters`.
+    """
+
+    def __init__(self, flush_size: int, flush_interval: float):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer: list[FuelCalculationRecord] = []
+        self.dead_letters: deque[str] = deque(maxlen=DEAD_LETTERS)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def write(self, records: Iterable[FuelCalculationRecord]) -> None:
+        records = list(records)
+        # Records of a rolled back request are never queued.
+        transaction.on_commit(lambda: self._enqueue(records))
+
+    async def awrite(self, records: Iterable[FuelCalculationRecord]) -> None:
+        await sync_to_async(self.write)(records)
+
+    def flush(self) -> int:
+        with self._flush_lock:
+            with self._lock:
+                records, self._buffer = self._buffer, []
+            if not records:
+                return 0
+            try:
+                with RECORD_INSERT_DURATION.labels("buffered").time():
+                    inserted, rejected = insert_records(records)
+            except Exception:
+                logger.exception("Failed to flush %d records", len(records))
+                with self._lock:
+                    self._buffer[:0] = records
+                return 0
+            RECORDS_WRITTEN.labels("buffered").inc(inserted)
+            for record, error in rejected:
+                payload = serialize_record(record)
+                logger.error("Dropped calculation record %s: %s", payload, error)
+                self.dead_letters.append(payload)
+            RECORDS_DEAD_LETTERED.labels("buffered").inc(len(rejected))
+            return inserted
+
+    def _enqueue(self, records: list[FuelCalculationRecord]) -> None:
+        with self._lock:
+            self._buffer.extend(records)
+            size = len(self._buffer)
+        if self.flush_interval <= 0:
+            if size >= self.flush_size:
+                self.flush()
+            return
+        self._ensure_thread()
+        if size >= self.flush_size:
+            self._wakeup.set()
+
+    def _ensure_thread(self) -> None:
+        # Threads do not survive fork(), so every worker starts its own.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="calculation-record-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+            connection.close()
+
+
+class RedisRecordWriter:
+    """Pushes records to a Redis list drained by `flush_calculation_records`.
+
+    Queued records survive worker restarts as long as Redis persists them.
+    The queue must have a single consumer. Records that cannot be inserted
+    are moved to the `<queue_key>:dead` list.
+    """
+
+    def __init__(self, queue_key: str, flush_size: int):
+        self.queue_key = queue_key
+        self.dead_letter_key = f"{queue_key}:dead"
+        self.flush_size = flush_size
+
+    def write(self, records: Iterable[FuelCalculationRecord]) -> None:
+        payloads = [serialize_record(record) for record in records]
+        if payloads:
+            transaction.on_commit(
+                lambda: self._redis().rpush(self.queue_key, *payloads),
+            )
+
+    async def awrite(self, records: Iterable[FuelCalculationRecord]) -> None:
+        await sync_to_async(self.write)(records)
+
+    def flush(self) -> int:
+        """Inserts a batch, returning how many records left the queue."""
+        redis = self._redis()
+        payloads = redis.lrange(self.queue_key, 0, self.flush_size - 1)
+        if not payloads:
+            return 0
+        records = []
+        dead = []
+        for payload in payloads:
+            try:
+                records.append(FuelCalculationRecord(**json.loads(payload)))
+            except (ValueError, TypeError) as e:
+                dead.append((payload, e))
+        with RECORD_INSERT_DURATION.labels("redis").time():
+            inserted, rejected = insert_records(records)
+        RECORDS_WRITTEN.labels("redis").inc(inserted)
+        dead += [(serialize_record(record), error) for record, error in rejected]
+        if dead:
+            for payload, error in dead:
+                logger.error("Dead-lettered calculation record %s: %s", payload, error)
+            redis.rpush(self.dead_letter_key, *(payload for payload, _ in dead))
+            RECORDS_DEAD_LETTERED.labels("redis").inc(len(dead))
+        # Only trimmed once handled, so a crash re-delivers instead of losing
+        redis.ltrim(self.queue_key, len(payloads), -1)
+        return len(payloads)
+
+    def _redis(self):
+        return get_redis_connection("default")
+
+
+RecordWriter = SyncRecordWriter | BufferedRecordWriter | RedisRecordWriter
+
+_writer: RecordWriter | None = None
+
+
+def get_record_writer() -> RecordWriter:
+    global _writer  # noqa: PLW0603
+    if _writer is None:
+        _writer = _build_record_writer()
+    return _writer
+
+
+def drain_record_writer() -> int:
+    """Flushes every record buffered in this process, e.g. on shutdown."""
+    if _writer is None or isinstance(_writer, RedisRecordWriter):
+        return 0
+    return _writer.flush()
+
+
+def reset_record_writer() -> None:
+    global _writer  # noqa: PLW0603
+    drain_record_writer()
+    _writer = None
+
+
+def _build_record_writer() -> RecordWriter:
+    mode = settings.CALCULATOR_RECORD_WRITE_MODE
+    if mode == "sync":
+        return SyncRecordWriter()
+    if mode == "buffered":
+        writer = BufferedRecordWriter(
+            flush_size=settings.CALCULATOR_RECORD_FLUSH_SIZE,
+            flush_interval=settings.CALCULATOR_RECORD_FLUSH_INTERVAL,
+        )
+        atexit.register(writer.flush)
+        return writer
+    if mode == "redis":
+        return RedisRecordWriter(
+            queue_key=settings.CALCULATOR_RECORD_QUEUE_KEY,
+            flush_size=settings.CALCULATOR_RECORD_FLUSH_SIZE,
+        )
+    msg = f"Unknown CALCULATOR_RECORD_WRITE_MODE: {mode!r}"
+    raise ImproperlyConfigured(msg)
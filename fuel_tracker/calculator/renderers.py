@@ -0,0 +1,59 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Types left to DRF's encoder, so that they render as with JSONRenderer
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer producing the same documents several times faster.
+
+    Floats may be written differently, e.g. `1e16` instead of `1e+16`, for
+    the same value. NaN and infinities, which JSONRenderer refuses, are
+    written as null: looking for them would cost more than the rendering
+    saves on a results page. Indented output, non-default JSON settings and
+    data orjson rejects, such as integers over 64 bits or non-string keys,
+    are rendered by JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_encoder.default, option=_ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, keeping the output a JavaScript subset
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9",
+            b"\\u2029",
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders MessagePack, for clients sending `Accept: application/msgpack`.
+
+    Types MessagePack has no representation for, such as datetimes and
+    decimals, are converted as in JSON.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_encoder.default)
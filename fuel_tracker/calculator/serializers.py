@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from fuel_tracker.calculator.models import Airplane
@@ -34,6 +35,28 @@ class FuelCalculationSerializer(serializers.Serializer):
     config_override = ConfigOverrideSerializer(required=False)
 
 
+class FuelCalculationBatchItemSerializer(FuelCalculationSerializer):
+    airplane_id = serializers.IntegerField(min_value=0)
+
+
+class FuelCalculationBatchSerializer(serializers.Serializer):
+    # Items are validated one by one in the view so that a malformed item
+    # is reported in the response instead of rejecting the whole batch.
+    items = serializers.ListField(
+        child=serializers.DictField(),
+        allow_empty=False,
+    )
+
+    def validate_items(self, value):
+        if len(value) > settings.CALCULATOR_BATCH_MAX_ITEMS:
+            msg = (
+                "Ensure this field has no more than "
+                f"{settings.CALCULATOR_BATCH_MAX_ITEMS} elements."
+            )
+            raise serializers.ValidationError(msg)
+        return value
+
+
 class ResultSerializer(serializers.Serializer):
     fuel_capacity = serializers.FloatField()
     fuel_consumption_per_minute = serializers.FloatField()
@@ -41,7 +64,28 @@ class ResultSerializer(serializers.Serializer):
     time_unit = serializers.CharField()
 
 
+class BatchResultItemSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    airplane_id = serializers.IntegerField(required=False)
+    passengers = serializers.IntegerField(required=False)
+    result = ResultSerializer(required=False)
+    error = serializers.CharField(required=False)
+    errors = serializers.DictField(required=False)
+
+
+class BatchResultSerializer(serializers.Serializer):
+    results = BatchResultItemSerializer(many=True)
+
+
 class FuelCalculationRecordModelSerializer(serializers.ModelSerializer):
+    def __init__(self, *args, **kwargs):
+        # Optional subset of fields to render, e.g. to skip the snapshot
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
     class Meta:  # pyright: ignore [reportIncompatibleVariableOverride]
         model = FuelCalculationRecord
         fields = "__all__"
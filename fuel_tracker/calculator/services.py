@@ -1,7 +1,30 @@
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
+
+# Distance from np.log to math.log allowed for, see calculate_many()
+LOG_ULPS = 4
+
+UNIT_CONVERSION = {
+    "minute": 1,
+    "hour": 1 / 60,
+    "day": 1 / 1440,
+}
+
+
+@dataclass
+class FuelCalculationArrays:
+    fuel_capacity: np.ndarray
+    fuel_consumption_per_minute: np.ndarray
+    flight_duration: np.ndarray
+    time_unit: str
+    # Maps the index of every failed element to its error message.
+    # Failed elements hold NaN in the result arrays.
+    errors: dict[int, str]
+
 
 @dataclass
 class FuelCalculationService:
@@ -30,6 +53,131 @@ class FuelCalculationService:
             "time_unit": config["time_unit"],
         }
 
+    def calculate_many(
+        self,
+        airplane_ids: Sequence[int] | np.ndarray,
+        passengers: Sequence[int] | np.ndarray,
+        config: dict[str, Any],
+    ) -> FuelCalculationArrays:
+        """Vectorized counterpart of `calculate` for many inputs at once.
+
+        Produces exactly the same values as calling `calculate` for every
+        `(airplane_ids[i], passengers[i])` pair. Elements that `calculate`
+        would reject are reported in `errors` by index instead of raising.
+        """
+        airplane_ids = np.asarray(airplane_ids, dtype=np.int64)
+        passengers = np.asarray(passengers, dtype=np.int64)
+        if airplane_ids.shape != passengers.shape:
+            msg = "airplane_ids and passengers must have the same shape"
+            raise ValueError(msg)
+
+        errors: dict[int, str] = {}
+        fuel_capacity = config["fuel_capacity_multiplier"] * airplane_ids
+
+        # The logarithm only depends on the airplane, so it is taken once per
+        # distinct airplane.
+        unique_ids, inverse = np.unique(airplane_ids, return_inverse=True)
+        inverse = inverse.reshape(airplane_ids.shape)
+        for airplane_id in unique_ids[unique_ids <= 0].tolist():
+            try:
+                self._log(airplane_id, config)
+            except ValueError as e:
+                for index in np.flatnonzero(airplane_ids == airplane_id).tolist():
+                    errors[index] = str(e)
+
+        # np.log may be an ulp away from math.log, used by `calculate`. Every
+        # step is monotonic in the logarithm, so where logarithms a few ulps
+        # below and above give the same results, math.log gives them too.
+        # The other elements are calculated one by one.
+        low, high = self._log_bounds(unique_ids, config)
+        results = self._calculate_arrays(
+            fuel_capacity,
+            low[inverse],
+            passengers,
+            config,
+        )
+        unsure = np.zeros(airplane_ids.shape, dtype=bool)
+        for array, other in zip(
+            results,
+            self._calculate_arrays(fuel_capacity, high[inverse], passengers, config),
+            strict=True,
+        ):
+            unsure |= (array != other) & ~(np.isnan(array) & np.isnan(other))
+        for index in np.flatnonzero(unsure).tolist():
+            try:
+                result = self.calculate(
+                    int(airplane_ids.flat[index]),
+                    int(passengers.flat[index]),
+                    config,
+                )
+                values = (
+                    result["fuel_capacity"],
+                    result["fuel_consumption_per_minute"],
+                    result["flight_duration"],
+                )
+            except ValueError as e:
+                errors[index] = str(e)
+                values = (np.nan, np.nan, np.nan)
+            for array, value in zip(results, values, strict=True):
+                array.flat[index] = value
+
+        fuel_capacity, consumption, duration = results
+        for index in np.flatnonzero(np.isnan(consumption)).tolist():
+            errors.setdefault(index, "Fuel consumption must be positive")
+
+        return FuelCalculationArrays(
+            fuel_capacity=fuel_capacity,
+            fuel_consumption_per_minute=consumption,
+            flight_duration=duration,
+            time_unit=config["time_unit"],
+            errors=dict(sorted(errors.items())),
+        )
+
+    def _calculate_arrays(
+        self,
+        fuel_capacity: np.ndarray,
+        log_values: np.ndarray,
+        passengers: np.ndarray,
+        config: dict[str, Any],
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        consumption = (
+            log_values * config["fuel_consumption_coefficient"]
+            + passengers * config["passenger_fuel_impact"]
+        )
+        invalid = ~(consumption > 0)
+        consumption[invalid] = np.nan
+
+        # Durations over the float range are infinite, as in `calculate`
+        with np.errstate(over="ignore", divide="ignore"):
+            duration = (
+                fuel_capacity
+                / consumption
+                * UNIT_CONVERSION.get(config["time_unit"], 1)
+            )
+        fuel_capacity = fuel_capacity.astype(np.float64)
+        fuel_capacity[invalid] = np.nan
+
+        return (
+            self._round(fuel_capacity, 2),
+            self._round(consumption, 4),
+            self._round(duration, 2),
+        )
+
+    def _log_bounds(
+        self,
+        airplane_ids: np.ndarray,
+        config: dict[str, Any],
+    ) -> tuple[np.ndarray, np.ndarray]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            logs = np.log(airplane_ids.astype(np.float64))
+        logs[airplane_ids <= 0] = np.nan
+        margin = LOG_ULPS * np.spacing(np.abs(logs))
+        low, high = logs - margin, logs + margin
+        if config["log_base"] != "e":
+            # As math.log(x, 10) does
+            return low / math.log(10), high / math.log(10)
+        return low, high
+
     def _calculate_fuel_capacity(
         self,
         airplane_id: int,
@@ -43,11 +191,7 @@ class FuelCalculationService:
         passengers: int,
         config: dict[str, Any],
     ) -> float:
-        log_value = (
-            math.log(airplane_id)
-            if config["log_base"] == "e"
-            else math.log(airplane_id, 10)
-        )
+        log_value = self._log(airplane_id, config)
         consumption = (
             log_value * config["fuel_consumption_coefficient"]
             + passengers * config["passenger_fuel_impact"]
@@ -64,10 +208,28 @@ class FuelCalculationService:
         consumption: float,
         time_unit: str,
     ) -> float:
-        unit_conversion = {
-            "minute": 1,
-            "hour": 1 / 60,
-            "day": 1 / 1440,
-        }
         max_minutes = capacity / consumption
-        return max_minutes * unit_conversion.get(time_unit, 1)
+        return max_minutes * UNIT_CONVERSION.get(time_unit, 1)
+
+    def _log(self, airplane_id: int, config: dict[str, Any]) -> float:
+        return (
+            math.log(airplane_id)
+            if config["log_base"] == "e"
+            else math.log(airplane_id, 10)
+        )
+
+    def _round(self, values: np.ndarray, ndigits: int) -> np.ndarray:
+        # np.rint of the value scaled by 10**ndigits rounds like the correctly
+        # rounded built-in round(), unless the scaling moved it across a half
+        # or overflowed. Those values are rounded with round().
+        scale = 10.0**ndigits
+        with np.errstate(invalid="ignore", over="ignore"):
+            scaled = values * scale
+            rounded = np.rint(scaled) / scale
+            unsure = np.abs(scaled - np.floor(scaled) - 0.5) <= np.spacing(
+                np.abs(scaled),
+            )
+        unsure |= np.isinf(scaled) & np.isfinite(values)
+        for index in np.flatnonzero(unsure).tolist():
+            rounded.flat[index] = round(float(values.flat[index]), ndigits)
+        return rounded
@@ -0,0 +1,49 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from fuel_tracker.calculator.airplane_cache import AirplaneCache
+from fuel_tracker.calculator.conditional import bump_table_version
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.lookup_table import mark_lookup_table_stale
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import Configuration
+
+
+@receiver(post_save, sender=Configuration)
+@receiver(post_delete, sender=Configuration)
+def configuration_changed(sender, **kwargs):
+    # The writing process sees the change at once, other processes after
+    # the transaction commits and their cached entry expires.
+    ConfigurationManager.invalidate_cache()
+    transaction.on_commit(ConfigurationManager.publish_new_version)
+
+
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+def airplane_changed(sender, instance, **kwargs):
+    AirplaneCache.invalidate(instance.pk)
+    transaction.on_commit(AirplaneCache.publish_new_version)
+
+
+@receiver(post_save, sender=Configuration)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+def lookup_table_changed(sender, **kwargs):
+    if settings.CALCULATOR_LOOKUP_TABLE_PATH:
+        # Every host stops using its table until `build_lookup_table` has
+        # rebuilt it, which would take too long in a request.
+        transaction.on_commit(mark_lookup_table_stale)
+
+
+@receiver(post_save, sender=Configuration)
+@receiver(post_delete, sender=Configuration)
+@receiver(post_save, sender=Airplane)
+@receiver(post_delete, sender=Airplane)
+def table_changed(sender, **kwargs):
+    # Validators handed out before the commit stop matching after it
+    transaction.on_commit(partial(bump_table_version, sender))
@@ -0,0 +1,151 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.airplane_cache import AirplaneCache
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.views import AirplaneViewSet
+from fuel_tracker.observability.query_budget import SAVEPOINT_PREFIXES
+
+pytestmark = pytest.mark.django_db
+
+
+def calculate(airplane_pk, passengers=50):
+    return APIClient().post(
+        f"/api/airplanes/{airplane_pk}/calculate_fuel/",
+        {"passengers": passengers},
+        format="json",
+    )
+
+
+def queries(context):
+    # Savepoints of ATOMIC_REQUESTS are a BEGIN and COMMIT outside tests
+    return [
+        query["sql"]
+        for query in context.captured_queries
+        if not query["sql"].startswith(SAVEPOINT_PREFIXES)
+    ]
+
+
+def test_result_cache_hit_skips_the_database(airplane):
+    first = calculate(airplane.pk)
+
+    with CaptureQueriesContext(connection) as context:
+        second = calculate(airplane.pk)
+
+    assert queries(context) == []
+    assert second.status_code == HTTPStatus.OK
+    assert second.data == first.data
+
+
+def test_cached_airplane_still_validates_passengers(airplane):
+    calculate(airplane.pk)
+
+    response = calculate(airplane.pk, passengers=101)
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.data == {"error": "Exceeds max passengers (100)"}
+
+
+@pytest.mark.parametrize("pk", ["999", "abc"])
+def test_unknown_airplane(pk):
+    assert calculate(pk).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_object_permissions_checked_on_cached_airplane(airplane, monkeypatch):
+    class DenyObjects(BasePermission):
+        def has_object_permission(self, request, view, obj):
+            return obj.max_passengers > 100  # noqa: PLR2004
+
+    calculate(airplane.pk)
+    monkeypatch.setattr(AirplaneViewSet, "permission_classes", [DenyObjects])
+
+    assert calculate(airplane.pk).status_code == HTTPStatus.FORBIDDEN
+
+
+def test_saved_airplane_is_reloaded(airplane, django_capture_on_commit_callbacks):
+    calculate(airplane.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        airplane.max_passengers = 40
+        airplane.save()
+
+    assert calculate(airplane.pk).data == {"error": "Exceeds max passengers (40)"}
+
+
+def test_deleted_airplane_is_not_found(airplane, django_capture_on_commit_callbacks):
+    calculate(airplane.pk)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        airplane.delete()
+
+    assert calculate(airplane.pk).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_change_in_another_process(airplane):
+    calculate(airplane.pk)
+    # Simulates another process updating the airplane
+    Airplane.objects.filter(pk=airplane.pk).update(max_passengers=40)
+    AirplaneCache.publish_new_version()
+
+    response = calculate(airplane.pk, passengers=60)
+
+    assert response.data == {"error": "Exceeds max passengers (40)"}
+
+
+def test_change_after_cache_flush(airplane):
+    AirplaneCache.publish_new_version()
+    calculate(airplane.pk)
+    cache.clear()
+    Airplane.objects.filter(pk=airplane.pk).update(max_passengers=40)
+    AirplaneCache.publish_new_version()
+
+    response = calculate(airplane.pk, passengers=60)
+
+    assert response.data == {"error": "Exceeds max passengers (40)"}
+
+
+def test_deleted_in_another_process(airplane):
+    calculate(airplane.pk)
+    # Simulates another process deleting the airplane, whose signals do not
+    # reach this one
+    FuelCalculationRecord.objects.filter(airplane=airplane)._raw_delete("default")  # noqa: SLF001
+    Airplane.objects.filter(pk=airplane.pk)._raw_delete("default")  # noqa: SLF001
+    AirplaneCache.publish_new_version()
+
+    # Both with the result cached and without
+    assert calculate(airplane.pk).status_code == HTTPStatus.NOT_FOUND
+    assert calculate(airplane.pk, passengers=60).status_code == HTTPStatus.NOT_FOUND
+
+
+def test_cache_disabled(airplane, settings):
+    settings.CALCULATOR_AIRPLANE_CACHE_SIZE = 0
+    calculate(airplane.pk)
+
+    with CaptureQueriesContext(connection) as context:
+        calculate(airplane.pk)
+
+    assert len(queries(context)) == 1
+
+
+def test_cache_size_is_bounded(settings):
+    settings.CALCULATOR_AIRPLANE_CACHE_SIZE = 1
+    first, second = Airplane.objects.bulk_create(
+        [
+            Airplane(airplane_id=1, max_passengers=10),
+            Airplane(airplane_id=2, max_passengers=20),
+        ],
+    )
+    manager = AirplaneCache()
+
+    manager.add(first)
+    manager.add(second)
+
+    assert manager.get(first.pk) == (1, 10)
+    assert manager.get(second.pk) is None
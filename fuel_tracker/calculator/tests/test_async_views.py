@@ -0,0 +1,192 @@
+from http import HTTPStatus
+
+import msgpack
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import cache
+from django.middleware.csrf import _get_new_csrf_string
+from django.test import AsyncClient
+from django.urls import include
+from django.urls import path
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from config.api_router import async_urlpatterns
+from config.api_router import router
+from fuel_tracker.calculator.lookup_table import build_lookup_table
+from fuel_tracker.calculator.models import FuelCalculationRecord
+
+# The async view is only routed when CALCULATOR_ASYNC_VIEWS is set
+urlpatterns = [
+    path("api/", include((async_urlpatterns, "calculator"))),
+    path("sync/", include((router.urls, "sync"))),
+]
+
+pytestmark = [pytest.mark.django_db, pytest.mark.urls(__name__)]
+
+
+def post(url, data, **kwargs):
+    return async_to_sync(AsyncClient().post)(
+        url,
+        data,
+        content_type="application/json",
+        **kwargs,
+    )
+
+
+def test_async_calculate_fuel_matches_sync_view(airplane):
+    data = {"passengers": 50, "config_override": {"log_base": "e"}}
+
+    response = post(f"/api/airplanes/{airplane.pk}/calculate_fuel/", data)
+    cached = post(f"/api/airplanes/{airplane.pk}/calculate_fuel/", data)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == cached.json()
+    assert FuelCalculationRecord.objects.get().configuration_snapshot["log_base"] == "e"
+
+    cache.clear()
+    sync_response = APIClient().post(
+        f"/sync/airplanes/{airplane.pk}/calculate_fuel/",
+        data,
+        format="json",
+    )
+    assert sync_response.json() == response.json()
+
+
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [
+        ({"passengers": 150}, {"error": "Exceeds max passengers (100)"}),
+        (
+            {"passengers": -1},
+            {"passengers": ["Ensure this value is greater than or equal to 0."]},
+        ),
+        (
+            {"passengers": 1, "config_override": {"time_unit": "week"}},
+            {"config_override": {"time_unit": ['"week" is not a valid choice.']}},
+        ),
+        (
+            {"passengers": 1, "config_override": {"passenger_fuel_impact": -1}},
+            {"error": "Fuel consumption must be positive"},
+        ),
+    ],
+)
+def test_async_calculate_fuel_errors_match_sync_view(airplane, data, expected):
+    response = post(f"/api/airplanes/{airplane.pk}/calculate_fuel/", data)
+    sync_response = APIClient().post(
+        f"/sync/airplanes/{airplane.pk}/calculate_fuel/",
+        data,
+        format="json",
+    )
+
+    assert response.status_code == sync_response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json() == sync_response.json() == expected
+    assert not FuelCalculationRecord.objects.exists()
+
+
+def test_async_calculate_fuel_unknown_airplane():
+    response = post("/api/airplanes/999/calculate_fuel/", {"passengers": 1})
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_async_calculate_fuel_invalid_json(airplane):
+    response = post(f"/api/airplanes/{airplane.pk}/calculate_fuel/", "{")
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["detail"].startswith("JSON parse error")
+
+
+def test_async_calculate_fuel_msgpack(airplane):
+    response = async_to_sync(AsyncClient().post)(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        msgpack.packb({"passengers": 50}),
+        content_type="application/msgpack",
+        headers={"Accept": "application/msgpack"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/msgpack"
+    sync_response = APIClient().post(
+        f"/sync/airplanes/{airplane.pk}/calculate_fuel/",
+        {"passengers": 50},
+        format="json",
+    )
+    assert msgpack.unpackb(response.content) == sync_response.json()
+
+
+def test_async_calculate_fuel_unsupported_media_type(airplane):
+    response = async_to_sync(AsyncClient().post)(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        "passengers=50",
+        content_type="text/plain",
+    )
+
+    assert response.status_code == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+def test_async_calculate_fuel_not_acceptable(airplane):
+    response = post(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        {"passengers": 50},
+        headers={"Accept": "text/csv"},
+    )
+
+    assert response.status_code == HTTPStatus.NOT_ACCEPTABLE
+
+
+def test_async_calculate_fuel_requires_post(airplane):
+    response = async_to_sync(AsyncClient().get)(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+    )
+
+    assert response.status_code == HTTPStatus.METHOD_NOT_ALLOWED
+
+
+def test_async_calculate_fuel_served_from_lookup_table(airplane, settings, tmp_path):
+    settings.CALCULATOR_LOOKUP_TABLE_PATH = str(tmp_path / "results.table")
+    build_lookup_table()
+
+    response = post(f"/api/airplanes/{airplane.pk}/calculate_fuel/", {"passengers": 5})
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()["time_unit"] == "minute"
+    assert not FuelCalculationRecord.objects.exists()
+
+
+def test_async_calculate_fuel_enforces_csrf_for_sessions(airplane, user):
+    client = AsyncClient(enforce_csrf_checks=True)
+    client.force_login(user)
+    url = f"/api/airplanes/{airplane.pk}/calculate_fuel/"
+
+    response = async_to_sync(client.post)(
+        url,
+        {"passengers": 50},
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert response.json()["detail"].startswith("CSRF Failed")
+    token = _get_new_csrf_string()
+    client.cookies[settings.CSRF_COOKIE_NAME] = token
+    response = async_to_sync(client.post)(
+        url,
+        {"passengers": 50},
+        content_type="application/json",
+        headers={"X-CSRFToken": token},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_async_calculate_fuel_token_without_csrf(airplane, user):
+    token = Token.objects.create(user=user)
+
+    response = async_to_sync(AsyncClient(enforce_csrf_checks=True).post)(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        {"passengers": 50},
+        content_type="application/json",
+        headers={"Authorization": f"Token {token.key}"},
+    )
+
+    assert response.status_code == HTTPStatus.OK
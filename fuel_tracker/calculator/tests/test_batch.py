@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.services import FuelCalculationService
+
+pytestmark = pytest.mark.django_db
+
+BATCH_URL = "/api/airplanes/calculate_fuel_batch/"
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def airplanes():
+    return [
+        Airplane.objects.create(airplane_id=1, name="First", max_passengers=100),
+        Airplane.objects.create(airplane_id=2, name="Second", max_passengers=200),
+    ]
+
+
+def test_calculate_fuel_batch(api_client, airplanes):
+    items = [
+        {"airplane_id": 1, "passengers": 50},
+        {"airplane_id": 2, "passengers": 150, "config_override": {"log_base": "e"}},
+    ]
+
+    response = api_client.post(BATCH_URL, {"items": items}, format="json")
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.data["results"]
+    assert [result["index"] for result in results] == [0, 1]
+
+    config = {
+        "fuel_capacity_multiplier": 200.0,
+        "log_base": "10",
+        "passenger_fuel_impact": 0.002,
+        "fuel_consumption_coefficient": 0.80,
+        "time_unit": "minute",
+    }
+    service = FuelCalculationService()
+    assert results[0]["result"] == service.calculate(1, 50, config)
+    assert results[1]["result"] == service.calculate(
+        2,
+        150,
+        {**config, "log_base": "e"},
+    )
+    assert FuelCalculationRecord.objects.count() == len(items)
+
+
+def test_calculate_fuel_batch_reports_item_errors(api_client, airplanes):
+    items = [
+        {"airplane_id": 1, "passengers": 500},
+        {"airplane_id": 99, "passengers": 10},
+        {"airplane_id": 1, "config_override": {"log_base": "bananas"}},
+        {
+            "airplane_id": 2,
+            "passengers": 0,
+            "config_override": {
+                "fuel_consumption_coefficient": -100,
+                "passenger_fuel_impact": 0,
+            },
+        },
+        {"airplane_id": 2, "passengers": 10},
+    ]
+
+    response = api_client.post(BATCH_URL, {"items": items}, format="json")
+
+    assert response.status_code == HTTPStatus.OK
+    results = response.data["results"]
+    assert results[0]["error"] == "Exceeds max passengers (100)"
+    assert results[1]["error"] == "Airplane not found"
+    assert "passengers" in results[2]["errors"]
+    assert "log_base" in results[2]["errors"]["config_override"]
+    assert results[3]["error"] == "Fuel consumption must be positive"
+    assert "result" in results[4]
+    assert FuelCalculationRecord.objects.count() == 1
+
+
+def test_calculate_fuel_batch_query_count(
+    api_client,
+    airplanes,
+    django_assert_num_queries,
+):
+    items = [
+        {"airplane_id": airplane.airplane_id, "passengers": passengers}
+        for airplane in airplanes
+        for passengers in range(1, 11)
+    ]
+
+    # Savepoint, airplanes, latest configuration, bulk insert and release
+    with django_assert_num_queries(5):
+        response = api_client.post(BATCH_URL, {"items": items}, format="json")
+
+    assert response.status_code == HTTPStatus.OK
+    assert FuelCalculationRecord.objects.count() == len(items)
+
+
+def test_calculate_fuel_batch_deduplicates_and_uses_cache(api_client, airplanes):
+    items = [{"airplane_id": 1, "passengers": 50}] * 3
+
+    first = api_client.post(BATCH_URL, {"items": items}, format="json")
+    second = api_client.post(BATCH_URL, {"items": items}, format="json")
+
+    assert first.status_code == HTTPStatus.OK
+    assert second.status_code == HTTPStatus.OK
+    assert first.data == second.data
+    assert FuelCalculationRecord.objects.count() == 1
+
+
+def test_calculate_fuel_batch_too_many_items(api_client, airplanes, settings):
+    settings.CALCULATOR_BATCH_MAX_ITEMS = 2
+    items = [{"airplane_id": 1, "passengers": 1}] * 3
+
+    response = api_client.post(BATCH_URL, {"items": items}, format="json")
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert "items" in response.data
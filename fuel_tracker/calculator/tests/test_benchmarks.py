@@ -0,0 +1,59 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from fuel_tracker.calculator.benchmarks import BENCHMARKS
+from fuel_tracker.calculator.benchmarks import compare
+from fuel_tracker.calculator.benchmarks import run_benchmark
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+
+pytestmark = pytest.mark.django_db
+
+# Seeding the larger tables would make the suite slow
+LARGE_CASES = {"results_list[10000]", "results_list[100000]"}
+
+
+@pytest.mark.parametrize(
+    "name",
+    [name for name in BENCHMARKS if name not in LARGE_CASES],
+)
+def test_benchmark_case_runs(name):
+    result = run_benchmark(name, repeat=1, min_time=0)
+
+    assert result["number"] == 1
+    assert result["median_us"] > 0
+    # Everything created by the case is rolled back
+    assert not Airplane.objects.exists()
+    assert not FuelCalculationRecord.objects.exists()
+
+
+def test_compare_flags_regressions():
+    baseline = {"a": {"median_us": 10.0}, "b": {"median_us": 10.0}}
+    results = {
+        "a": {"median_us": 10.9},
+        "b": {"median_us": 11.1},
+        "c": {"median_us": 1.0},
+    }
+
+    assert compare(results, baseline, 0.1) == [
+        ("a", 10.0, 10.9, False),
+        ("b", 10.0, 11.1, True),
+    ]
+
+
+def test_benchmark_command_baseline_and_compare(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    options = {"case": ["cache_generate_key"], "repeat": 1, "min_time": 0.001}
+
+    call_command("benchmark", output=baseline, stdout=StringIO(), **options)
+    report = json.loads(baseline.read_text())
+    assert list(report["results"]) == ["cache_generate_key"]
+
+    report["results"]["cache_generate_key"]["median_us"] = 1e-6
+    baseline.write_text(json.dumps(report))
+    with pytest.raises(CommandError, match="cache_generate_key"):
+        call_command("benchmark", compare=baseline, stdout=StringIO(), **options)
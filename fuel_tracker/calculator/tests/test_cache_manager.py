@@ -0,0 +1,274 @@
+import asyncio
+import itertools
+import threading
+import time
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator import cache_manager
+from fuel_tracker.calculator.cache_manager import CachedResult
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.cache_manager import LocalLRUCache
+from fuel_tracker.calculator.models import Configuration
+
+RESULT = {"fuel_capacity": 200.0}
+ENTRY = CachedResult(RESULT, 0.0, float("inf"))
+CONFIG = {
+    "fuel_capacity_multiplier": 200.0,
+    "log_base": "10",
+    "passenger_fuel_impact": 0.002,
+    "fuel_consumption_coefficient": 0.80,
+    "time_unit": "minute",
+}
+
+
+@pytest.fixture
+def fuel_cache(settings):
+    settings.CALCULATOR_L1_CACHE_SIZE = 2
+    settings.CALCULATOR_L1_CACHE_TTL = 60
+    return FuelCalculationCache()
+
+
+def test_local_lru_evicts_least_recently_used():
+    local = LocalLRUCache(maxsize=2, ttl=60)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("a") == 1
+    assert local.get("b") is None
+    assert local.get("c") == 3  # noqa: PLR2004
+
+
+def test_local_lru_expires_entries(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr(cache_manager.time, "monotonic", lambda: now)
+    local = LocalLRUCache(maxsize=2, ttl=10)
+    local.set("a", 1)
+
+    now = 111.0
+
+    assert local.get("a") is None
+    assert len(local) == 0
+
+
+def test_get_reads_through_tiers(fuel_cache):
+    cache.set("fuel:key", ENTRY)
+
+    assert fuel_cache.get("fuel:key") == RESULT
+    cache.delete("fuel:key")
+    assert fuel_cache.get("fuel:key") == RESULT
+    assert fuel_cache.get("fuel:other") is None
+
+    assert FuelCalculationCache.stats() == {
+        "l1_hits": 1,
+        "l1_misses": 2,
+        "l1_size": 1,
+        "l1_maxsize": 2,
+        "l2_hits": 1,
+        "l2_misses": 1,
+        "lock_waits": 0,
+        "lock_timeouts": 0,
+        "early_recomputes": 0,
+    }
+
+
+def test_get_many_reads_through_tiers(fuel_cache):
+    fuel_cache.set("fuel:a", RESULT)
+    cache.set("fuel:b", ENTRY)
+
+    assert fuel_cache.get_many(["fuel:a", "fuel:b", "fuel:c"]) == {
+        "fuel:a": RESULT,
+        "fuel:b": RESULT,
+    }
+    stats = FuelCalculationCache.stats()
+    assert (stats["l1_hits"], stats["l1_misses"]) == (1, 2)
+    assert (stats["l2_hits"], stats["l2_misses"]) == (1, 1)
+
+
+def test_local_tier_disabled(fuel_cache, settings):
+    settings.CALCULATOR_L1_CACHE_SIZE = 0
+    fuel_cache.set("fuel:key", ENTRY)
+    cache.delete("fuel:key")
+
+    assert fuel_cache.get("fuel:key") is None
+    assert FuelCalculationCache.stats()["l1_misses"] == 0
+
+
+@pytest.mark.django_db
+def test_local_tier_cleared_on_configuration_change(fuel_cache):
+    fuel_cache.set("fuel:key", ENTRY)
+
+    Configuration.objects.create()
+
+    assert FuelCalculationCache.stats()["l1_size"] == 0
+
+
+@pytest.mark.django_db
+def test_cache_stats_requires_admin(admin_client):
+    assert APIClient().get("/api/cache-stats/").status_code == HTTPStatus.FORBIDDEN
+    response = admin_client.get("/api/cache-stats/")
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.json()) >= {"l1_hits", "l2_misses"}
+
+
+def test_generate_key_is_canonical():
+    key = FuelCalculationCache().generate_key(7, 150, CONFIG)
+
+    assert key == "fuel:v3:7:150:200.0:10:0.002:0.8:minute"
+    assert key == FuelCalculationCache().generate_key(
+        7,
+        150,
+        {**CONFIG, "fuel_capacity_multiplier": 200},
+    )
+    assert key == FuelCalculationCache().generate_key(
+        7,
+        150,
+        dict(reversed(CONFIG.items())),
+    )
+
+
+def test_generate_key_is_collision_free_over_config_space():
+    fuel_cache = FuelCalculationCache()
+    inputs = list(
+        itertools.product(
+            [1, 11, 111],
+            [0, 1, 11],
+            [0.0, 1.1, 11.0, 111.0, 200.0, 1e-05, 1e16],
+            ["10", "e"],
+            [0.002, 0.0021, 0.02, 0.2, -0.002],
+            [0.8, 0.08, 8.0, -0.8],
+            ["minute", "hour", "day"],
+        ),
+    )
+
+    keys = {
+        fuel_cache.generate_key(
+            airplane_id,
+            passengers,
+            {
+                "fuel_capacity_multiplier": multiplier,
+                "log_base": log_base,
+                "passenger_fuel_impact": impact,
+                "fuel_consumption_coefficient": coefficient,
+                "time_unit": time_unit,
+            },
+        )
+        for (
+            airplane_id,
+            passengers,
+            multiplier,
+            log_base,
+            impact,
+            coefficient,
+            time_unit,
+        ) in inputs
+    }
+
+    # Same cardinality as the legacy JSON + MD5 scheme over the same inputs
+    assert len(keys) == len(inputs)
+
+
+def test_benchmark_cache_keys_command():
+    stdout = StringIO()
+
+    call_command("benchmark_cache_keys", number=100, repeat=1, stdout=stdout)
+
+    assert "speedup" in stdout.getvalue()
+
+
+def test_get_or_compute_computes_concurrent_misses_once(fuel_cache):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return RESULT
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                FuelCalculationCache().get_or_compute("fuel:key", compute),
+            ),
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [RESULT] * 8
+    assert FuelCalculationCache.stats()["lock_waits"] > 0
+    assert cache.get("fuel:key:lock") is None
+
+
+def test_get_or_compute_releases_lock_on_error(fuel_cache):
+    def fail():
+        msg = "Fuel consumption must be positive"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="positive"):
+        fuel_cache.get_or_compute("fuel:key", fail)
+
+    assert cache.get("fuel:key:lock") is None
+    assert fuel_cache.get_or_compute("fuel:key", lambda: RESULT) == RESULT
+
+
+def test_get_or_compute_computes_after_lock_timeout(fuel_cache, settings):
+    settings.CALCULATOR_CACHE_LOCK_TIMEOUT = 0.05
+    cache.set("fuel:key:lock", "other-worker")
+
+    assert fuel_cache.get_or_compute("fuel:key", lambda: RESULT) == RESULT
+    assert FuelCalculationCache.stats()["lock_timeouts"] == 1
+
+
+def test_get_or_compute_early_recomputation(fuel_cache, settings):
+    settings.CALCULATOR_CACHE_XFETCH_BETA = 1.0
+    refreshed = {"fuel_capacity": 300.0}
+    # Within one computation time of expiry, so a refresh is near certain
+    cache.set("fuel:key", CachedResult(RESULT, 3600.0, time.time() + 1))
+
+    # Another worker holds the lock: keep serving the current value
+    cache.set("fuel:key:lock", "other-worker")
+    assert fuel_cache.get_or_compute("fuel:key", lambda: refreshed) == RESULT
+
+    cache.delete("fuel:key:lock")
+    FuelCalculationCache.clear_local()
+    assert fuel_cache.get_or_compute("fuel:key", lambda: refreshed) == refreshed
+    assert FuelCalculationCache.stats()["early_recomputes"] == 1
+
+
+def test_get_or_compute_without_early_recomputation(fuel_cache):
+    cache.set("fuel:key", CachedResult(RESULT, 3600.0, time.time() + 1))
+
+    assert fuel_cache.get_or_compute("fuel:key", dict) == RESULT
+
+
+def test_aget_or_compute_computes_concurrent_misses_once(fuel_cache):
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return RESULT
+
+    async def run():
+        return await asyncio.gather(
+            *(fuel_cache.aget_or_compute("fuel:key", compute) for _ in range(8)),
+        )
+
+    assert async_to_sync(run)() == [RESULT] * 8
+    assert len(calls) == 1
+    assert fuel_cache.get("fuel:key") == RESULT
+    assert cache.get("fuel:key:lock") is None
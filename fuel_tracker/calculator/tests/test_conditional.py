@@ -0,0 +1,137 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.models import Configuration
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.observability.query_budget import SAVEPOINT_PREFIXES
+
+pytestmark = pytest.mark.django_db
+
+
+def test_not_modified_without_queries(airplane):
+    client = APIClient()
+    first = client.get("/api/airplanes/")
+
+    with CaptureQueriesContext(connection) as context:
+        second = client.get("/api/airplanes/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
+    assert second["ETag"] == first["ETag"]
+    assert "no-cache" in second["Cache-Control"]
+    assert [
+        query
+        for query in context.captured_queries
+        if not query["sql"].startswith(SAVEPOINT_PREFIXES)
+    ] == []
+
+
+def test_if_modified_since(airplane):
+    client = APIClient()
+    first = client.get(f"/api/airplanes/{airplane.pk}/")
+
+    second = client.get(
+        f"/api/airplanes/{airplane.pk}/",
+        HTTP_IF_MODIFIED_SINCE=first["Last-Modified"],
+    )
+
+    assert second.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_write_changes_the_etag(airplane, django_capture_on_commit_callbacks):
+    client = APIClient()
+    first = client.get("/api/airplanes/")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        airplane.max_passengers = 40
+        airplane.save()
+    second = client.get("/api/airplanes/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+    assert second.status_code == HTTPStatus.OK
+    assert second.data[0]["max_passengers"] == 40  # noqa: PLR2004
+    assert second["ETag"] != first["ETag"]
+
+
+def test_etag_depends_on_the_representation(airplane):
+    client = APIClient()
+
+    assert (
+        client.get("/api/airplanes/")["ETag"]
+        != client.get(f"/api/airplanes/{airplane.pk}/")["ETag"]
+    )
+
+
+def test_configurations(django_capture_on_commit_callbacks):
+    client = APIClient()
+    first = client.get("/api/configurations/")
+    assert (
+        client.get("/api/configurations/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code
+        == HTTPStatus.NOT_MODIFIED
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Configuration.objects.create(time_unit="hour")
+
+    second = client.get("/api/configurations/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert second.status_code == HTTPStatus.OK
+    assert second.data[0]["time_unit"] == "hour"
+
+
+def test_validators_reset_with_the_cache(airplane):
+    client = APIClient()
+    first = client.get("/api/airplanes/")
+
+    cache.clear()
+
+    assert (
+        client.get("/api/airplanes/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code
+        == HTTPStatus.OK
+    )
+
+
+@pytest.fixture
+def record(airplane):
+    return FuelCalculationRecord.objects.create(
+        airplane=airplane,
+        passengers=50,
+        fuel_capacity=1.0,
+        fuel_consumption_per_minute=1.0,
+        flight_duration=1.0,
+        time_unit="minute",
+        configuration_snapshot={},
+    )
+
+
+def test_record_retrieve_without_airplane_is_immutable(record, settings):
+    settings.CALCULATOR_RECORD_MAX_AGE = 600
+
+    response = APIClient().get(f"/api/results/{record.pk}/?fields=id,passengers")
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response["Cache-Control"].split(", ")) == {"max-age=600", "immutable"}
+    assert "Accept" in response["Vary"].split(", ")
+
+
+def test_record_retrieve_with_airplane_is_not_cached(record):
+    response = APIClient().get(f"/api/results/{record.pk}/")
+
+    assert response.status_code == HTTPStatus.OK
+    assert "Cache-Control" not in response
+    assert "Accept" in response["Vary"].split(", ")
+
+
+def test_vary_on_format_and_user(airplane, user):
+    client = APIClient()
+    anonymous = client.get("/api/airplanes/")
+    client.force_authenticate(user)
+
+    authenticated = client.get("/api/airplanes/", HTTP_IF_NONE_MATCH=anonymous["ETag"])
+
+    assert {"Accept", "Cookie", "Authorization"} <= set(anonymous["Vary"].split(", "))
+    assert "private" not in anonymous["Cache-Control"]
+    assert authenticated.status_code == HTTPStatus.OK
+    assert set(authenticated["Cache-Control"].split(", ")) == {"no-cache", "private"}
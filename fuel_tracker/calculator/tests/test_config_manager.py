@@ -0,0 +1,81 @@
+import pytest
+from django.core.cache import cache
+
+from fuel_tracker.calculator import config_manager
+from fuel_tracker.calculator.config_manager import CONFIG_VERSION_CACHE_KEY
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.models import Configuration
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+        def monotonic(self):
+            return self.now
+
+    clock = Clock()
+    monkeypatch.setattr(config_manager.time, "monotonic", clock.monotonic)
+    return clock
+
+
+@pytest.fixture
+def manager(settings):
+    settings.CALCULATOR_CONFIG_CACHE_TTL = 60
+    return ConfigurationManager()
+
+
+def test_latest_config_is_cached(manager, django_assert_num_queries):
+    Configuration.objects.create(fuel_capacity_multiplier=300.0)
+
+    with django_assert_num_queries(1):
+        first = manager.get_active_config()
+    with django_assert_num_queries(0):
+        second = ConfigurationManager().get_active_config()
+
+    assert first == second
+    assert first["fuel_capacity_multiplier"] == 300.0  # noqa: PLR2004
+
+
+def test_cache_invalidated_on_configuration_save(manager):
+    manager.get_active_config()
+
+    Configuration.objects.create(time_unit="hour")
+
+    assert manager.get_active_config()["time_unit"] == "hour"
+
+
+def test_expired_entry_reused_when_version_unchanged(
+    manager,
+    clock,
+    django_assert_num_queries,
+):
+    ConfigurationManager.publish_new_version()
+    manager.get_active_config()
+
+    clock.now += 61
+    with django_assert_num_queries(0):
+        manager.get_active_config()
+
+
+def test_expired_entry_reloaded_when_version_changed(manager, clock):
+    manager.get_active_config()
+    # Simulates another process publishing a configuration
+    Configuration.objects.bulk_create([Configuration(time_unit="day")])
+    cache.set(CONFIG_VERSION_CACHE_KEY, "other-process")
+
+    assert manager.get_active_config()["time_unit"] == "minute"
+
+    clock.now += 61
+    assert manager.get_active_config()["time_unit"] == "day"
+
+
+def test_zero_ttl_disables_cache(manager, settings, django_assert_num_queries):
+    settings.CALCULATOR_CONFIG_CACHE_TTL = 0
+
+    with django_assert_num_queries(2):
+        manager.get_active_config()
+        manager.get_active_config()
@@ -0,0 +1,68 @@
+import gc
+import runpy
+
+import pytest
+from django.conf import settings
+
+CONFIG = str(settings.BASE_DIR / "gunicorn.conf.py")
+
+
+@pytest.fixture
+def load_config(monkeypatch, tmp_path):
+    def load(**env):
+        # Set by the configuration for the rest of the process otherwise
+        monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+        for name in (
+            "GUNICORN_WORKER_CLASS",
+            "GUNICORN_PRELOAD",
+            "GUNICORN_THREADS",
+            "WEB_CONCURRENCY",
+        ):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        try:
+            return runpy.run_path(CONFIG)
+        finally:
+            gc.enable()
+
+    return load
+
+
+@pytest.mark.parametrize(
+    ("worker_model", "expected"),
+    [
+        ("sync", ("sync", "config.wsgi:application", 5, 1)),
+        ("gthread", ("gthread", "config.wsgi:application", 3, 4)),
+        (
+            "uvicorn",
+            ("uvicorn_worker.UvicornWorker", "config.asgi:application", 2, 1),
+        ),
+    ],
+)
+def test_worker_model(load_config, monkeypatch, worker_model, expected):
+    monkeypatch.setattr("os.sched_getaffinity", lambda pid: {0, 1})
+    monkeypatch.setattr("pathlib.Path.read_text", lambda self: "max 100000")
+
+    config = load_config(GUNICORN_WORKER_CLASS=worker_model)
+
+    assert (
+        config["worker_class"],
+        config["wsgi_app"],
+        config["workers"],
+        config["threads"],
+    ) == expected
+
+
+def test_cpu_quota_and_overrides(load_config, monkeypatch):
+    monkeypatch.setattr("pathlib.Path.read_text", lambda self: "150000 100000")
+
+    assert load_config()["workers"] == 3  # noqa: PLR2004
+    config = load_config(WEB_CONCURRENCY="7", GUNICORN_PRELOAD="false")
+    assert config["workers"] == 7  # noqa: PLR2004
+    assert not config["preload_app"]
+
+
+def test_unknown_worker_model(load_config):
+    with pytest.raises(ValueError, match="GUNICORN_WORKER_CLASS"):
+        load_config(GUNICORN_WORKER_CLASS="eventlet")
@@ -0,0 +1,131 @@
+import json
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from fuel_tracker.calculator.loadtest import LoadTest
+from fuel_tracker.calculator.loadtest import RequestSpec
+from fuel_tracker.calculator.loadtest import Scenario
+
+SCENARIO = """
+concurrency: 4
+variables:
+  airplane: [7]
+  passengers: {min: 1, max: 3}
+requests:
+  - name: calculate_fuel
+    weight: 3
+    method: POST
+    path: /api/airplanes/{airplane}/calculate_fuel/
+    body: {passengers: "{passengers}", label: "run {seq}"}
+  - name: missing
+    method: GET
+    path: /missing/
+"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    received: list = []
+
+    def do_GET(self):  # noqa: N802
+        self._respond(HTTPStatus.NOT_FOUND)
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.received.append((self.path, body))
+        self._respond(HTTPStatus.OK)
+
+    def _respond(self, status):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.received = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def scenario_path(tmp_path):
+    path = tmp_path / "scenario.yaml"
+    path.write_text(SCENARIO)
+    return path
+
+
+def test_closed_loop(server, scenario_path):
+    scenario = Scenario.load(scenario_path)
+    scenario.total_requests = 200
+
+    results = LoadTest(scenario, server, seed=1).run()
+
+    calculate = results["endpoints"]["calculate_fuel"]
+    missing = results["endpoints"]["missing"]
+    assert calculate["requests"] + missing["requests"] == 200  # noqa: PLR2004
+    assert calculate["requests"] > missing["requests"] > 0
+    assert calculate["errors"] == 0
+    assert calculate["p50_ms"] <= calculate["p99_ms"] <= calculate["p99.9_ms"]
+    assert missing["errors"] == missing["statuses"][HTTPStatus.NOT_FOUND]
+    assert results["total"]["errors"] == missing["errors"]
+    path, body = Handler.received[0]
+    assert path == "/api/airplanes/7/calculate_fuel/"
+    assert body["passengers"] in {1, 2, 3}
+    assert body["label"].startswith("run ")
+
+
+def test_open_loop(server):
+    scenario = Scenario(
+        requests=[RequestSpec("calculate_fuel", "POST", "/", body={})],
+        concurrency=2,
+        rate=500,
+        arrivals="uniform",
+        duration=None,
+        total_requests=50,
+    )
+
+    results = LoadTest(scenario, server).run()
+
+    assert results["total"]["requests"] == 50  # noqa: PLR2004
+    # 50 arrivals at 500 per second
+    assert results["elapsed"] >= 0.098  # noqa: PLR2004
+
+
+def test_loadtest_command(server, scenario_path, tmp_path):
+    stdout = StringIO()
+
+    call_command(
+        "loadtest",
+        scenario_path,
+        url=server,
+        requests=20,
+        output=tmp_path / "results.json",
+        stdout=stdout,
+    )
+
+    assert "closed loop" in stdout.getvalue()
+    results = json.loads((tmp_path / "results.json").read_text())
+    assert results["total"]["requests"] == 20  # noqa: PLR2004
+
+
+def test_loadtest_command_invalid_scenario(tmp_path):
+    path = tmp_path / "scenario.json"
+    path.write_text(json.dumps({"requests": [{"name": "a"}]}))
+
+    with pytest.raises(CommandError, match="Invalid scenario"):
+        call_command("loadtest", path, stdout=StringIO())
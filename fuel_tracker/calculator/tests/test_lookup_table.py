@@ -0,0 +1,255 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator import lookup_table
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.lookup_table import LOOKUP_TABLE_VERSION_CACHE_KEY
+from fuel_tracker.calculator.lookup_table import build_lookup_table
+from fuel_tracker.calculator.lookup_table import get_lookup_table
+from fuel_tracker.calculator.lookup_table import mark_lookup_table_stale
+from fuel_tracker.calculator.management.commands import (
+    build_lookup_table as build_lookup_table_command,
+)
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import Configuration
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.services import FuelCalculationService
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def table_path(settings, tmp_path):
+    settings.CALCULATOR_LOOKUP_TABLE_PATH = str(tmp_path / "results.table")
+    return tmp_path / "results.table"
+
+
+@pytest.fixture
+def airplanes():
+    return [
+        Airplane.objects.create(airplane_id=1, max_passengers=30),
+        Airplane.objects.create(airplane_id=17, max_passengers=250),
+    ]
+
+
+def test_lookup_table_matches_calculate(table_path, airplanes):
+    rows = build_lookup_table()
+
+    table = get_lookup_table()
+    config = ConfigurationManager().get_active_config()
+    service = FuelCalculationService()
+    assert rows == 31 + 251
+    assert table.config == config
+    for airplane in airplanes:
+        table_airplane = table.get_airplane(airplane.pk)
+        for passengers in range(airplane.max_passengers + 1):
+            try:
+                expected = service.calculate(airplane.airplane_id, passengers, config)
+            except ValueError:
+                expected = None
+            assert table.get(table_airplane, passengers) == expected
+        assert table.get(table_airplane, airplane.max_passengers + 1) is None
+
+
+def test_lookup_table_disabled(settings, airplanes):
+    settings.CALCULATOR_LOOKUP_TABLE_PATH = ""
+
+    assert get_lookup_table() is None
+
+
+def test_lookup_table_missing_file(table_path):
+    assert get_lookup_table() is None
+
+
+def test_lookup_table_leaves_out_airplanes_past_max_rows(
+    table_path,
+    airplanes,
+    settings,
+):
+    settings.CALCULATOR_LOOKUP_TABLE_MAX_ROWS = 100
+
+    assert build_lookup_table() == 31  # noqa: PLR2004
+    assert get_lookup_table().get_airplane(airplanes[1].pk) is None
+
+
+def test_lookup_table_stale_after_change(
+    table_path,
+    airplanes,
+    django_capture_on_commit_callbacks,
+):
+    build_lookup_table()
+    previous = get_lookup_table()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        airplane = Airplane.objects.create(airplane_id=5, max_passengers=10)
+    # Ignored until rebuilt, on every host sharing the cache
+    assert get_lookup_table() is None
+    assert previous.get(previous.get_airplane(airplanes[1].pk), 10) is not None
+
+    build_lookup_table()
+    assert get_lookup_table().get_airplane(airplane.pk) is not None
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Configuration.objects.create(time_unit="hour")
+    assert get_lookup_table() is None
+    build_lookup_table()
+    assert get_lookup_table().config["time_unit"] == "hour"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        airplane.delete()
+    assert get_lookup_table() is None
+    build_lookup_table()
+    assert get_lookup_table().get_airplane(airplane.pk) is None
+
+
+def test_lookup_table_version_checked_every_ttl(table_path, airplanes, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(lookup_table.time, "monotonic", lambda: now[0])
+    build_lookup_table()
+    assert get_lookup_table() is not None
+
+    # Another process marks it stale
+    cache.set(LOOKUP_TABLE_VERSION_CACHE_KEY, "changed")
+
+    assert get_lookup_table() is not None
+    now[0] += 5
+    assert get_lookup_table() is None
+
+
+def test_lookup_table_stale_without_version(table_path, airplanes, settings):
+    settings.CALCULATOR_LOOKUP_TABLE_VERSION_TTL = 0
+    build_lookup_table()
+
+    # Flushed cache
+    cache.clear()
+
+    assert get_lookup_table() is None
+
+
+def test_calculate_fuel_ignores_stale_lookup_table(
+    table_path,
+    airplanes,
+    django_capture_on_commit_callbacks,
+):
+    build_lookup_table()
+    url = f"/api/airplanes/{airplanes[1].pk}/calculate_fuel/"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Airplane.objects.filter(pk=airplanes[1].pk).update(max_passengers=50)
+        mark_lookup_table_stale()
+    response = APIClient().post(url, {"passengers": 100}, format="json")
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.data == {"error": "Exceeds max passengers (50)"}
+
+
+def test_calculate_fuel_served_from_lookup_table(
+    table_path,
+    airplanes,
+    django_assert_num_queries,
+):
+    build_lookup_table()
+    ConfigurationManager().get_active_config()
+    url = f"/api/airplanes/{airplanes[1].pk}/calculate_fuel/"
+
+    # Only the request savepoint and its release
+    with django_assert_num_queries(2):
+        response = APIClient().post(url, {"passengers": 100}, format="json")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data == FuelCalculationService().calculate(
+        17,
+        100,
+        ConfigurationManager().get_active_config(),
+    )
+    assert not FuelCalculationRecord.objects.exists()
+    stats = FuelCalculationCache.stats()
+    assert stats["l1_misses"] == stats["l2_misses"] == 0
+
+
+@pytest.mark.parametrize(
+    ("airplane", "data", "expected_status"),
+    [
+        # Override that is not the active configuration
+        (1, {"passengers": 100, "config_override": {"log_base": "e"}}, 200),
+        # Calculation error
+        (0, {"passengers": 0}, 400),
+        # Over capacity
+        (1, {"passengers": 300}, 400),
+    ],
+)
+def test_calculate_fuel_falls_back_from_lookup_table(
+    table_path,
+    airplanes,
+    airplane,
+    data,
+    expected_status,
+):
+    build_lookup_table()
+    url = f"/api/airplanes/{airplanes[airplane].pk}/calculate_fuel/"
+
+    response = APIClient().post(url, data, format="json")
+
+    assert response.status_code == expected_status
+    assert FuelCalculationRecord.objects.exists() == (expected_status == HTTPStatus.OK)
+
+
+def test_calculate_fuel_unknown_airplane_with_lookup_table(table_path, airplanes):
+    build_lookup_table()
+
+    response = APIClient().post(
+        "/api/airplanes/999/calculate_fuel/",
+        {"passengers": 1},
+        format="json",
+    )
+
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_build_lookup_table_command(table_path, airplanes):
+    stdout = StringIO()
+
+    call_command("build_lookup_table", stdout=stdout)
+
+    assert "Wrote 282 rows" in stdout.getvalue()
+    assert table_path.exists()
+
+
+def test_build_lookup_table_command_if_stale(table_path, airplanes):
+    stdout = StringIO()
+
+    call_command("build_lookup_table", if_stale=True, stdout=stdout)
+    call_command("build_lookup_table", if_stale=True, stdout=stdout)
+    mark_lookup_table_stale()
+    call_command("build_lookup_table", if_stale=True, stdout=stdout)
+
+    assert stdout.getvalue().splitlines() == [
+        "Wrote 282 rows to " + str(table_path),
+        "Lookup table is up to date",
+        "Wrote 282 rows to " + str(table_path),
+    ]
+
+
+def test_build_lookup_table_command_every(table_path, airplanes, monkeypatch):
+    stdout = StringIO()
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 2:  # noqa: PLR2004
+            raise KeyboardInterrupt
+        mark_lookup_table_stale()
+
+    monkeypatch.setattr(build_lookup_table_command.time, "sleep", sleep)
+
+    with pytest.raises(KeyboardInterrupt):
+        call_command("build_lookup_table", if_stale=True, every=30, stdout=stdout)
+
+    assert sleeps == [30, 30]
+    assert stdout.getvalue().count("Wrote 282 rows") == 2  # noqa: PLR2004
@@ -0,0 +1,190 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator import record_writer
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.record_writer import BufferedRecordWriter
+from fuel_tracker.calculator.record_writer import RedisRecordWriter
+from fuel_tracker.calculator.record_writer import drain_record_writer
+from fuel_tracker.calculator.record_writer import get_record_writer
+
+pytestmark = pytest.mark.django_db
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(
+            value if isinstance(value, bytes) else value.encode() for value in values
+        )
+
+    def lrange(self, key, start, end):
+        return self.lists.get(key, [])[start : end + 1]
+
+    def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start:]
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = FakeRedis()
+    monkeypatch.setattr(RedisRecordWriter, "_redis", lambda self: redis)
+    return redis
+
+
+def make_record(airplane, passengers=10):
+    return FuelCalculationRecord(
+        airplane=airplane,
+        passengers=passengers,
+        fuel_capacity=200.0,
+        fuel_consumption_per_minute=1.0,
+        flight_duration=200.0,
+        time_unit="minute",
+        configuration_snapshot={"time_unit": "minute"},
+    )
+
+
+def test_buffered_writer_flushes_on_size(
+    airplane,
+    django_capture_on_commit_callbacks,
+):
+    writer = BufferedRecordWriter(flush_size=3, flush_interval=0)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        writer.write([make_record(airplane), make_record(airplane)])
+    assert not FuelCalculationRecord.objects.exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        writer.write([make_record(airplane)])
+    assert FuelCalculationRecord.objects.count() == 3  # noqa: PLR2004
+
+
+def test_buffered_writer_skips_rolled_back_records(airplane):
+    writer = BufferedRecordWriter(flush_size=1, flush_interval=0)
+
+    # on_commit callbacks are discarded when the test transaction rolls back
+    writer.write([make_record(airplane)])
+
+    assert writer.flush() == 0
+
+
+def test_calculate_fuel_buffered_mode(
+    settings,
+    airplane,
+    django_capture_on_commit_callbacks,
+):
+    settings.CALCULATOR_RECORD_WRITE_MODE = "buffered"
+    settings.CALCULATOR_RECORD_FLUSH_INTERVAL = 0
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = APIClient().post(
+            f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+            {"passengers": 50},
+        )
+
+    assert response.status_code == HTTPStatus.OK
+    assert not FuelCalculationRecord.objects.exists()
+    assert drain_record_writer() == 1
+    assert FuelCalculationRecord.objects.get().passengers == 50  # noqa: PLR2004
+
+
+def test_redis_writer_round_trip(
+    settings,
+    airplane,
+    fake_redis,
+    django_capture_on_commit_callbacks,
+):
+    settings.CALCULATOR_RECORD_WRITE_MODE = "redis"
+    settings.CALCULATOR_RECORD_FLUSH_SIZE = 2
+    writer = get_record_writer()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        writer.write([make_record(airplane, passengers) for passengers in range(5)])
+    assert len(fake_redis.lists[settings.CALCULATOR_RECORD_QUEUE_KEY]) == 5  # noqa: PLR2004
+
+    stdout = StringIO()
+    call_command("flush_calculation_records", stdout=stdout)
+
+    assert "Flushed 5 records" in stdout.getvalue()
+    assert fake_redis.lists[settings.CALCULATOR_RECORD_QUEUE_KEY] == []
+    assert sorted(
+        FuelCalculationRecord.objects.values_list("passengers", flat=True),
+    ) == list(range(5))
+
+
+def test_flush_command_requires_redis_mode():
+    with pytest.raises(CommandError):
+        call_command("flush_calculation_records")
+
+
+def test_unknown_write_mode(settings):
+    settings.CALCULATOR_RECORD_WRITE_MODE = "carrier-pigeon"
+    record_writer.reset_record_writer()
+
+    with pytest.raises(ImproperlyConfigured, match="carrier-pigeon"):
+        get_record_writer()
+
+
+def test_queued_records_keep_the_calculation_time(
+    settings,
+    airplane,
+    fake_redis,
+    django_capture_on_commit_callbacks,
+):
+    settings.CALCULATOR_RECORD_WRITE_MODE = "redis"
+    writer = get_record_writer()
+    record = make_record(airplane)
+    record.timestamp -= timedelta(minutes=5)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        writer.write([record])
+    writer.flush()
+
+    assert FuelCalculationRecord.objects.get().timestamp == record.timestamp
+
+
+@pytest.mark.django_db(transaction=True)
+def test_buffered_writer_dead_letters_failing_records(airplane):
+    writer = BufferedRecordWriter(flush_size=10, flush_interval=0)
+    deleted = Airplane.objects.create(airplane_id=2, max_passengers=100)
+    orphan = make_record(deleted)
+    deleted.delete()
+    writer._enqueue([make_record(airplane), orphan])  # noqa: SLF001
+
+    assert writer.flush() == 1
+    assert writer.flush() == 0
+
+    assert FuelCalculationRecord.objects.get().airplane == airplane
+    (payload,) = writer.dead_letters
+    assert json.loads(payload)["airplane_id"] == orphan.airplane_id
+
+
+@pytest.mark.django_db(transaction=True)
+def test_redis_writer_dead_letters_failing_records(settings, airplane, fake_redis):
+    settings.CALCULATOR_RECORD_WRITE_MODE = "redis"
+    writer = get_record_writer()
+    fake_redis.rpush(
+        writer.queue_key,
+        record_writer.serialize_record(make_record(airplane)),
+        record_writer.serialize_record(
+            make_record(Airplane(pk=airplane.pk + 1000)),
+        ),
+        "not json",
+    )
+
+    assert writer.flush() == 3  # noqa: PLR2004
+
+    assert fake_redis.lists[writer.queue_key] == []
+    assert FuelCalculationRecord.objects.count() == 1
+    assert len(fake_redis.lists[writer.dead_letter_key]) == 2  # noqa: PLR2004
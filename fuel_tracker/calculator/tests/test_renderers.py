@@ -0,0 +1,124 @@
+import datetime
+import decimal
+import uuid
+from http import HTTPStatus
+from io import BytesIO
+
+import msgpack
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.parsers import ORJSONParser
+from fuel_tracker.calculator.renderers import ORJSONRenderer
+from fuel_tracker.calculator.services import FuelCalculationService
+
+TIMESTAMP = datetime.datetime(2024, 5, 1, 12, 30, 1, 5, tzinfo=datetime.UTC)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        FuelCalculationService().calculate(
+            17,
+            50,
+            {
+                "fuel_capacity_multiplier": 200.0,
+                "log_base": "10",
+                "passenger_fuel_impact": 0.002,
+                "fuel_consumption_coefficient": 0.8,
+                "time_unit": "minute",
+            },
+        ),
+        {
+            "name": "Åir\u2028plane\u2029",
+            "timestamp": TIMESTAMP,
+            "date": datetime.date(2024, 5, 1),
+            "duration": datetime.timedelta(minutes=3),
+            "amount": decimal.Decimal("1.5"),
+            "id": uuid.UUID(int=1),
+            "items": (1, [2.5, None, True]),
+        },
+        # Rendered by JSONRenderer
+        {"big": 2**70, 1: "one"},
+        [],
+    ],
+)
+def test_orjson_renders_like_json(data):
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_orjson_indented():
+    data = {"a": [1, 2]}
+    media_type = "application/json; indent=4"
+
+    assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(
+        data,
+        media_type,
+    )
+
+
+@pytest.mark.parametrize(
+    ("body", "expected"),
+    [
+        (b'{"passengers": 5}', {"passengers": 5}),
+        (b"[1.5, null]", [1.5, None]),
+    ],
+)
+def test_orjson_parser(body, expected):
+    assert ORJSONParser().parse(BytesIO(body)) == expected
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"passengers": NaN}'])
+def test_orjson_parser_errors(body):
+    with pytest.raises(ParseError, match="JSON parse error"):
+        ORJSONParser().parse(BytesIO(body))
+
+
+def test_calculate_fuel_in_msgpack(airplane):
+    response = APIClient().post(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        msgpack.packb({"passengers": 50}),
+        content_type="application/msgpack",
+        HTTP_ACCEPT="application/msgpack",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/msgpack"
+    json_response = APIClient().post(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        {"passengers": 50},
+        format="json",
+    )
+    assert msgpack.unpackb(response.content) == json_response.json()
+
+
+def test_results_in_msgpack(airplane):
+    client = APIClient()
+    client.post(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        {"passengers": 50},
+        format="json",
+    )
+
+    response = client.get("/api/results/", HTTP_ACCEPT="application/msgpack")
+
+    assert msgpack.unpackb(response.content) == client.get("/api/results/").json()
+
+
+def test_json_by_default(airplane):
+    response = APIClient().get("/api/airplanes/", HTTP_ACCEPT="*/*")
+
+    assert response["Content-Type"] == "application/json"
+
+
+def test_invalid_msgpack(airplane):
+    response = APIClient().post(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        b"\xc1",
+        content_type="application/msgpack",
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert response.json()["detail"].startswith("MessagePack parse error")
@@ -0,0 +1,192 @@
+import csv
+import json
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.management.commands.benchmark_result_filters import (
+    SCRATCH_TABLE,
+)
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+
+pytestmark = pytest.mark.django_db
+
+RESULTS_URL = "/api/results/"
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def records():
+    airplanes = [
+        Airplane.objects.create(airplane_id=i, max_passengers=100) for i in range(1, 4)
+    ]
+    return FuelCalculationRecord.objects.bulk_create(
+        FuelCalculationRecord(
+            airplane=airplanes[i % len(airplanes)],
+            passengers=i,
+            fuel_capacity=200.0,
+            fuel_consumption_per_minute=1.0,
+            flight_duration=200.0,
+            time_unit="minute",
+            configuration_snapshot={"log_base": "10"},
+        )
+        for i in range(25)
+    )
+
+
+def test_list_results_is_cursor_paginated(api_client, records):
+    ids = []
+    url = f"{RESULTS_URL}?page_size=10"
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        ids += [result["id"] for result in response.data["results"]]
+        url = response.data["next"]
+
+    assert ids == [record.pk for record in records]
+
+
+def test_list_results_query_count_is_constant(
+    api_client,
+    records,
+    django_assert_num_queries,
+):
+    # Savepoint, page query with the airplane joined in and release
+    with django_assert_num_queries(3):
+        response = api_client.get(f"{RESULTS_URL}?page_size=25")
+
+    assert len(response.data["results"]) == len(records)
+    assert response.data["results"][0]["airplane"]["airplane_id"] == 1
+
+
+def test_list_results_with_fields(api_client, records, django_assert_num_queries):
+    with django_assert_num_queries(3) as context:
+        response = api_client.get(f"{RESULTS_URL}?fields=id,flight_duration")
+
+    assert response.status_code == HTTPStatus.OK
+    assert set(response.data["results"][0]) == {"id", "flight_duration"}
+    assert "configuration_snapshot" not in context.captured_queries[1]["sql"]
+
+
+def test_retrieve_result_with_fields(api_client, records):
+    response = api_client.get(
+        f"{RESULTS_URL}{records[0].pk}/?fields=id,configuration_snapshot",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data == {
+        "id": records[0].pk,
+        "configuration_snapshot": {"log_base": "10"},
+    }
+
+
+@pytest.fixture
+def filter_records(records):
+    airplane = records[0].airplane
+    FuelCalculationRecord.objects.filter(pk=records[0].pk).update(
+        timestamp=timezone.now() - timedelta(days=2),
+    )
+    return airplane
+
+
+@pytest.mark.parametrize(
+    ("params", "expected_count"),
+    [
+        ({"airplane": "{airplane}"}, 9),
+        ({"airplane_id": "1"}, 9),
+        ({"time_unit": "minute"}, 25),
+        ({"time_unit": "hour"}, 0),
+        ({"passengers_min": "10", "passengers_max": "14"}, 5),
+        ({"airplane": "{airplane}", "passengers_min": "10"}, 5),
+        ({"timestamp_after": "{yesterday}"}, 24),
+        ({"airplane": "{airplane}", "timestamp_before": "{yesterday}"}, 1),
+    ],
+)
+def test_list_results_filters(api_client, filter_records, params, expected_count):
+    yesterday = (timezone.now() - timedelta(days=1)).isoformat()
+    params = {
+        key: value.format(airplane=filter_records.pk, yesterday=yesterday)
+        for key, value in params.items()
+    }
+
+    response = api_client.get(RESULTS_URL, {**params, "page_size": 100})
+
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.data["results"]) == expected_count
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_result_filters_command(tmp_path):
+    output = tmp_path / "report.json"
+
+    call_command(
+        "benchmark_result_filters",
+        rows=300,
+        repeat=1,
+        i_know=True,
+        output=output,
+        stdout=StringIO(),
+    )
+
+    report = json.loads(output.read_text())
+    assert set(report["before"]) == set(report["after"])
+    # Measured against the foreign key index of the initial schema
+    assert "calc_bench_airplane_idx" in report["before"]["airplane_passengers"]["plan"]
+    assert "calc_bench" in report["after"]["airplane_last_hour"]["plan"]
+    assert SCRATCH_TABLE not in connection.introspection.table_names()
+    assert not Airplane.objects.exists()
+
+
+def test_benchmark_result_filters_requires_debug_or_flag(settings):
+    settings.DEBUG = False
+
+    with pytest.raises(CommandError, match="--i-know"):
+        call_command("benchmark_result_filters", rows=300, stdout=StringIO())
+
+    assert SCRATCH_TABLE not in connection.introspection.table_names()
+
+
+def test_export_results_csv(api_client, filter_records):
+    response = api_client.get(
+        f"{RESULTS_URL}export/",
+        {"airplane": filter_records.pk},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "text/csv"
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(content.splitlines()))
+    assert len(rows) == 9  # noqa: PLR2004
+    assert rows[1]["airplane_id"] == "1"
+    assert json.loads(rows[1]["configuration_snapshot"]) == {"log_base": "10"}
+
+
+def test_export_results_ndjson(api_client, records, settings):
+    settings.CALCULATOR_EXPORT_CHUNK_SIZE = 4
+
+    response = api_client.get(
+        f"{RESULTS_URL}export/",
+        {"export_format": "ndjson", "passengers_min": 20},
+    )
+
+    assert response.status_code == HTTPStatus.OK
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert [json.loads(line)["passengers"] for line in lines] == list(range(20, 25))
+
+
+def test_export_results_invalid_format(api_client):
+    response = api_client.get(f"{RESULTS_URL}export/", {"export_format": "xml"})
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,148 @@
+import itertools
+import math
+from typing import Any
+
+import numpy as np
+import pytest
+
+from fuel_tracker.calculator.services import FuelCalculationService
+
+DEFAULT_CONFIG = {
+    "fuel_capacity_multiplier": 200.0,
+    "log_base": "10",
+    "passenger_fuel_impact": 0.002,
+    "fuel_consumption_coefficient": 0.80,
+    "time_unit": "minute",
+}
+
+CONFIGS = [
+    {**DEFAULT_CONFIG, "log_base": log_base, "time_unit": time_unit}
+    for log_base, time_unit in itertools.product(
+        ["10", "e"],
+        ["minute", "hour", "day"],
+    )
+] + [
+    {**DEFAULT_CONFIG, "fuel_consumption_coefficient": -0.5},
+    {**DEFAULT_CONFIG, "passenger_fuel_impact": 0},
+    {**DEFAULT_CONFIG, "fuel_capacity_multiplier": 333.333},
+    {**DEFAULT_CONFIG, "fuel_capacity_multiplier": 300},
+]
+
+
+@pytest.fixture
+def service():
+    return FuelCalculationService()
+
+
+def calculate_or_error(service, airplane_id, passengers, config) -> Any:
+    try:
+        return service.calculate(airplane_id, passengers, config)
+    except ValueError as e:
+        return str(e)
+
+
+def assert_matches_scalar(service, airplane_ids, passengers, config):
+    arrays = service.calculate_many(airplane_ids, passengers, config)
+
+    for index, (airplane_id, count) in enumerate(
+        zip(airplane_ids, passengers, strict=True),
+    ):
+        expected = calculate_or_error(service, airplane_id, count, config)
+        if isinstance(expected, str):
+            assert arrays.errors[index] == expected
+            assert math.isnan(arrays.fuel_capacity[index])
+            assert math.isnan(arrays.flight_duration[index])
+            continue
+
+        assert index not in arrays.errors
+        assert arrays.fuel_capacity[index] == expected["fuel_capacity"]
+        assert (
+            arrays.fuel_consumption_per_minute[index]
+            == expected["fuel_consumption_per_minute"]
+        )
+        assert arrays.flight_duration[index] == expected["flight_duration"]
+        assert arrays.time_unit == expected["time_unit"]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_calculate_many_matches_calculate(service, config):
+    pairs = list(itertools.product(range(31), range(0, 501, 7)))
+    airplane_ids = [airplane_id for airplane_id, _ in pairs]
+    passengers = [count for _, count in pairs]
+
+    assert_matches_scalar(service, airplane_ids, passengers, config)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_calculate_many_matches_calculate_random_configs(service, seed):
+    rng = np.random.default_rng(seed)
+    config = {
+        "fuel_capacity_multiplier": float(rng.uniform(0.1, 1000)),
+        "log_base": str(rng.choice(["10", "e"])),
+        "passenger_fuel_impact": float(rng.uniform(-0.01, 0.05)),
+        "fuel_consumption_coefficient": float(rng.uniform(-2, 2)),
+        "time_unit": str(rng.choice(["minute", "hour", "day"])),
+    }
+    airplane_ids = rng.integers(0, 10_000, size=2_000, endpoint=True).tolist()
+    passengers = rng.integers(0, 1_000, size=2_000, endpoint=True).tolist()
+
+    assert_matches_scalar(service, airplane_ids, passengers, config)
+
+
+def test_calculate_many_reports_errors_by_index(service):
+    arrays = service.calculate_many([1, 2, 1, 0], [0, 0, 10, 5], DEFAULT_CONFIG)
+
+    assert arrays.errors == {
+        0: "Fuel consumption must be positive",
+        3: "math domain error",
+    }
+    assert not np.isnan(arrays.flight_duration[[1, 2]]).any()
+
+
+@pytest.mark.filterwarnings("error")
+def test_calculate_many_duration_overflow(service):
+    config = {
+        **DEFAULT_CONFIG,
+        "fuel_consumption_coefficient": 1e-310,
+        "passenger_fuel_impact": 0,
+    }
+
+    assert_matches_scalar(service, [3, 50], [0, 0], config)
+
+
+def test_calculate_many_empty_input(service):
+    arrays = service.calculate_many([], [], DEFAULT_CONFIG)
+
+    assert arrays.fuel_capacity.shape == (0,)
+    assert arrays.errors == {}
+
+
+def test_calculate_many_shape_mismatch(service):
+    with pytest.raises(ValueError, match="same shape"):
+        service.calculate_many([1, 2], [1], DEFAULT_CONFIG)
+
+
+@pytest.mark.parametrize("config", CONFIGS[:2])
+def test_calculate_many_where_numpy_log_differs(service, config):
+    airplane_ids = np.arange(1, 100_000)
+    differs = airplane_ids[
+        np.log(airplane_ids) != [math.log(i) for i in airplane_ids.tolist()]
+    ].tolist()
+
+    assert_matches_scalar(service, differs, [0] * len(differs), config)
+
+
+@pytest.mark.parametrize("ndigits", [2, 4])
+def test_round_matches_round(service, ndigits):
+    rng = np.random.default_rng(0)
+    values = np.concatenate(
+        [
+            (rng.integers(-(10**7), 10**7, 10_000) + 0.5) / 10**ndigits,
+            rng.uniform(-1e6, 1e6, 10_000),
+            [2.675, 1.00005, -0.001, 1e308, np.inf, 2.0**60],
+        ],
+    )
+
+    rounded = service._round(values, ndigits)  # noqa: SLF001
+
+    assert rounded.tolist() == [round(value, ndigits) for value in values.tolist()]
@@ -0,0 +1,158 @@
+import time
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator import warmup
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.services import FuelCalculationService
+from fuel_tracker.calculator.warmup import FREQUENT_CALCULATIONS_LOCK_CACHE_KEY
+from fuel_tracker.calculator.warmup import is_ready
+from fuel_tracker.calculator.warmup import warm_up
+from fuel_tracker.calculator.warmup import warm_up_worker
+
+pytestmark = pytest.mark.django_db
+
+
+def record(airplane, passengers, count):
+    config = ConfigurationManager().get_active_config()
+    result = FuelCalculationService().calculate(
+        airplane.airplane_id,
+        passengers,
+        config,
+    )
+    FuelCalculationRecord.objects.bulk_create(
+        FuelCalculationRecord(
+            airplane=airplane,
+            passengers=passengers,
+            fuel_capacity=result["fuel_capacity"],
+            fuel_consumption_per_minute=result["fuel_consumption_per_minute"],
+            flight_duration=result["flight_duration"],
+            time_unit=config["time_unit"],
+            configuration_snapshot=config,
+        )
+        for _ in range(count)
+    )
+
+
+def cached(airplane, passengers):
+    cache_manager = FuelCalculationCache()
+    return cache_manager.get(
+        cache_manager.generate_key(
+            airplane.airplane_id,
+            passengers,
+            ConfigurationManager().get_active_config(),
+        ),
+    )
+
+
+def test_warm_up_caches_most_frequent_calculations(airplane):
+    record(airplane, 100, 3)
+    record(airplane, 50, 2)
+    record(airplane, 10, 1)
+
+    report = warm_up(top=2)
+
+    assert (report.cached, report.computed) == (0, 2)
+    assert report.routes > 0
+    assert report.serializers > 0
+    assert cached(airplane, 100) == FuelCalculationService().calculate(
+        17,
+        100,
+        ConfigurationManager().get_active_config(),
+    )
+    assert cached(airplane, 50) is not None
+    assert cached(airplane, 10) is None
+    assert warm_up(top=2).cached == 2  # noqa: PLR2004
+
+
+def test_warm_up_ignores_old_records(airplane):
+    record(airplane, 100, 1)
+    FuelCalculationRecord.objects.update(
+        timestamp=timezone.now() - timedelta(days=2),
+    )
+
+    report = warm_up(window=timedelta(hours=24))
+
+    assert (report.cached, report.computed) == (0, 0)
+
+
+def test_frequent_calculations_mined_once(airplane):
+    record(airplane, 100, 1)
+    warm_up(top=10)
+
+    with CaptureQueriesContext(connection) as context:
+        warm_up(top=10)
+
+    assert not [
+        query
+        for query in context.captured_queries
+        if FuelCalculationRecord._meta.db_table in query["sql"]  # noqa: SLF001
+    ]
+
+
+def test_frequent_calculations_mined_by_a_single_worker(airplane):
+    record(airplane, 100, 1)
+    cache.add(FREQUENT_CALCULATIONS_LOCK_CACHE_KEY, True)  # noqa: FBT003
+
+    with CaptureQueriesContext(connection) as context:
+        report = warm_up(top=10)
+
+    assert (report.cached, report.computed) == (0, 0)
+    assert not [
+        query
+        for query in context.captured_queries
+        if FuelCalculationRecord._meta.db_table in query["sql"]  # noqa: SLF001
+    ]
+    assert is_ready()
+
+
+def test_readiness_after_warm_up():
+    client = APIClient()
+
+    assert client.get("/api/ready/").status_code == HTTPStatus.SERVICE_UNAVAILABLE
+    warm_up()
+    assert client.get("/api/ready/").status_code == HTTPStatus.OK
+
+
+def test_warmup_command(airplane):
+    record(airplane, 100, 1)
+    stdout = StringIO()
+
+    call_command("warmup", "--top", "10", stdout=stdout)
+
+    assert "0 results already cached, 1 calculated" in stdout.getvalue()
+
+
+def test_failed_worker_warm_up_is_retried(settings, monkeypatch):
+    settings.CALCULATOR_WARMUP_RETRY_SECONDS = 0.01
+    calls = []
+
+    def populate_cache(top, window, *, refresh):
+        calls.append(top)
+        if len(calls) == 1:
+            msg = "Redis is down"
+            raise ConnectionError(msg)
+        return 0, 0
+
+    monkeypatch.setattr(warmup, "_populate_cache", populate_cache)
+    monkeypatch.setattr(warmup.connections, "close_all", lambda: None)
+
+    warm_up_worker()
+
+    assert not is_ready()
+    deadline = time.monotonic() + 5
+    while not is_ready() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert is_ready()
+    assert len(calls) == 2  # noqa: PLR2004
@@ -1,21 +1,54 @@
+import csv
+import json
+from typing import Any
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.cache import patch_vary_headers
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
 from drf_spectacular.utils import OpenApiResponse
 from drf_spectacular.utils import extend_schema
 from drf_spectacular.utils import extend_schema_view
+from rest_framework import serializers
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.permissions import AllowAny
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 
+from fuel_tracker.calculator.airplane_cache import AirplaneCache
 from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.conditional import ConditionalGetMixin
 from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.filters import FuelCalculationRecordFilter
+from fuel_tracker.calculator.lookup_table import LookupTable
+from fuel_tracker.calculator.lookup_table import TableAirplane
+from fuel_tracker.calculator.lookup_table import get_lookup_table
 from fuel_tracker.calculator.models import Airplane
 from fuel_tracker.calculator.models import Configuration
 from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.pagination import FuelCalculationRecordCursorPagination
+from fuel_tracker.calculator.record_writer import get_record_writer
 from fuel_tracker.calculator.serializers import AirplaneSerializer
+from fuel_tracker.calculator.serializers import BatchResultSerializer
 from fuel_tracker.calculator.serializers import ConfigurationSerializer
+from fuel_tracker.calculator.serializers import FuelCalculationBatchItemSerializer
+from fuel_tracker.calculator.serializers import FuelCalculationBatchSerializer
 from fuel_tracker.calculator.serializers import FuelCalculationRecordModelSerializer
 from fuel_tracker.calculator.serializers import FuelCalculationSerializer
 from fuel_tracker.calculator.serializers import ResultSerializer
 from fuel_tracker.calculator.services import FuelCalculationService
+from fuel_tracker.calculator.warmup import is_ready
+from fuel_tracker.observability.metrics import CALCULATION_ERRORS
+from fuel_tracker.observability.metrics import LOOKUP_TABLE_HITS
+from fuel_tracker.observability.query_budget import QueryBudgetMixin
+from fuel_tracker.observability.timing import mark
+from fuel_tracker.observability.timing import phase
 
 
 @extend_schema_view(
@@ -41,28 +74,173 @@ from fuel_tracker.calculator.services import FuelCalculationService
         description="Returns a specific configuration by ID.",
     ),
 )
-class ConfigurationViewSet(viewsets.ModelViewSet):
+class ConfigurationViewSet(
+    QueryBudgetMixin,
+    ConditionalGetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Configuration.objects.all()
     http_method_names = ["get", "post", "head"]  # Disable PUT/PATCH/DELETE
     serializer_class = ConfigurationSerializer
+    conditional_tables = (Configuration,)
+    query_budgets = {"list": 1, "retrieve": 1, "create": 1}
 
     def get_queryset(self):
         return self.queryset.order_by("-created_at")[:1]  # pyright: ignore [reportOptionalMemberAccess]
 
 
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_COLUMNS = (
+    "id",
+    "airplane",
+    "airplane__airplane_id",
+    "timestamp",
+    "passengers",
+    "fuel_capacity",
+    "fuel_consumption_per_minute",
+    "flight_duration",
+    "time_unit",
+    "configuration_snapshot",
+)
+EXPORT_HEADER = [column.replace("airplane__", "") for column in EXPORT_COLUMNS]
+
+
+class _Echo:
+    # File-like object that hands each CSV line back to the caller
+    def write(self, value):
+        return value
+
+
+FIELDS_PARAMETER = OpenApiParameter(
+    name="fields",
+    description="Comma-separated list of fields to return, "
+    "e.g. `id,timestamp,flight_duration`. Omit `configuration_snapshot` "
+    "to avoid loading it.",
+    required=False,
+    type=str,
+)
+
+
 @extend_schema_view(
     list=extend_schema(
-        description=("Returns a list of all historical fuel calculation records."),
+        description="Returns historical fuel calculation records ordered by "
+        "timestamp, paginated with an opaque `cursor`. Records can be filtered "
+        "by airplane, timestamp range, time unit and passenger range.",
+        parameters=[FIELDS_PARAMETER],
     ),
     retrieve=extend_schema(
         description="Returns a specific fuel calculation record by ID, "
         "including the airplane details and configuration snapshot used.",
+        parameters=[FIELDS_PARAMETER],
     ),
 )
-class FuelCalculationRecordViewSet(viewsets.ModelViewSet):
-    queryset = FuelCalculationRecord.objects.all()
+class FuelCalculationRecordViewSet(QueryBudgetMixin, viewsets.ModelViewSet):
+    queryset = FuelCalculationRecord.objects.select_related("airplane")
     http_method_names = ["get"]
+    # The airplane filter loads the airplane. Exports query the records while
+    # streaming, after the response left the view.
+    query_budgets = {"list": 2, "retrieve": 1, "export": 1}
     serializer_class = FuelCalculationRecordModelSerializer
+    pagination_class = FuelCalculationRecordCursorPagination
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = FuelCalculationRecordFilter
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is not None:
+            if "airplane" not in fields:
+                queryset = queryset.select_related(None)
+            if "configuration_snapshot" not in fields:
+                queryset = queryset.defer("configuration_snapshot")
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        # JSON and MessagePack are served from the same URL
+        patch_vary_headers(response, ["Accept"])
+        fields = self.get_requested_fields()
+        if fields is not None and "airplane" not in fields:
+            # Records are never updated once calculated, unlike the nested
+            # airplane
+            patch_cache_control(
+                response,
+                max_age=settings.CALCULATOR_RECORD_MAX_AGE,
+                immutable=True,
+            )
+        return response
+
+    def get_requested_fields(self) -> set[str] | None:
+        fields = self.request.query_params.get("fields")
+        if not fields:
+            return None
+        return {field.strip() for field in fields.split(",")}
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="export_format",
+                description="Output format, `csv` (default) or `ndjson`.",
+                required=False,
+                type=str,
+                enum=list(EXPORT_CONTENT_TYPES),
+            ),
+        ],
+        responses={(200, "text/csv"): OpenApiTypes.STR},
+        description="""
+        Streams every fuel calculation record matching the list filters as
+        CSV or newline-delimited JSON, ordered by timestamp.
+
+        Rows are read from a server-side cursor and written one by one, so
+        memory use does not grow with the number of records.
+        """,
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def export(self, request):
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise serializers.ValidationError(
+                {"export_format": f'"{export_format}" is not a valid choice.'},
+            )
+
+        rows = (
+            self.filter_queryset(FuelCalculationRecord.objects.all())
+            .order_by("timestamp", "id")
+            .values_list(*EXPORT_COLUMNS)
+            .iterator(chunk_size=settings.CALCULATOR_EXPORT_CHUNK_SIZE)
+        )
+        stream = (
+            self._stream_csv(rows)
+            if export_format == "csv"
+            else self._stream_ndjson(rows)
+        )
+        response = StreamingHttpResponse(
+            stream,
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="fuel-calculations.{export_format}"'
+        )
+        return response
+
+    def _stream_csv(self, rows):
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_HEADER)
+        for row in rows:
+            *values, snapshot = row
+            yield writer.writerow([*values, json.dumps(snapshot)])
+
+    def _stream_ndjson(self, rows):
+        encoder = DjangoJSONEncoder()
+        for row in rows:
+            yield encoder.encode(dict(zip(EXPORT_HEADER, row, strict=True))) + "\n"
 
 
 @extend_schema_view(
@@ -84,15 +262,32 @@ class FuelCalculationRecordViewSet(viewsets.ModelViewSet):
     ),
     destroy=extend_schema(description="Removes an airplane from the system."),
 )
-class AirplaneViewSet(viewsets.ModelViewSet):
+class AirplaneViewSet(QueryBudgetMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Airplane.objects.all()
     serializer_class = AirplaneSerializer
+    conditional_tables = (Airplane,)
+    query_budgets = {
+        "list": 1,
+        "retrieve": 1,
+        # Unique airplane_id check and insert
+        "create": 2,
+        "update": 3,
+        "partial_update": 3,
+        # Airplane, its records and itself
+        "destroy": 3,
+        # Airplane, latest configuration and record insert
+        "calculate_fuel": 3,
+        # Airplanes, latest configuration and bulk insert
+        "calculate_fuel_batch": 3,
+    }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.calculation_service = FuelCalculationService()
         self.cache_manager = FuelCalculationCache()
         self.config_manager = ConfigurationManager()
+        self.airplane_cache = AirplaneCache()
+        self.record_writer = get_record_writer()
 
     @extend_schema(
         request=FuelCalculationSerializer,
@@ -125,7 +320,19 @@ class AirplaneViewSet(viewsets.ModelViewSet):
     )
     @action(detail=True, methods=["post"])
     def calculate_fuel(self, request, pk=None):
-        airplane = self.get_object()
+        with phase("airplane"):
+            table = get_lookup_table()
+            table_airplane = self._get_table_airplane(table, pk)
+            if table_airplane is not None:
+                # Known from the lookup table, no need to load it
+                airplane = Airplane(
+                    pk=int(pk),
+                    airplane_id=table_airplane.airplane_id,
+                    max_passengers=table_airplane.max_passengers,
+                )
+                self.check_object_permissions(request, airplane)
+            else:
+                airplane = self._get_airplane(pk)
         serializer = FuelCalculationSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -145,37 +352,273 @@ class AirplaneViewSet(viewsets.ModelViewSet):
             )
             self.config_manager.validate_config(config)
 
-            # Check cache
+            # Serve precomputed results under the active configuration
+            if (
+                table_airplane is not None
+                and config == table.config
+                and (
+                    result := table.get(
+                        table_airplane,
+                        serializer.validated_data["passengers"],
+                    )
+                )
+            ):
+                mark("cache", "table")
+                LOOKUP_TABLE_HITS.labels("calculate_fuel").inc()
+                return Response(result)
+
+            # Check cache, calculating and saving a record on a miss. Concurrent
+            # misses on the same key are calculated once.
             cache_key = self.cache_manager.generate_key(
                 airplane.airplane_id,
                 serializer.validated_data["passengers"],
                 config,
             )
-            if cached := self.cache_manager.get(cache_key):
-                return Response(cached)
+            result = self.cache_manager.get_or_compute(
+                cache_key,
+                lambda: self._calculate_and_record(
+                    airplane,
+                    serializer.validated_data["passengers"],
+                    config,
+                ),
+            )
+
+            return Response(result)
 
-            # Calculate
+        except ValueError as e:
+            CALCULATION_ERRORS.labels("calculate_fuel").inc()
+            return Response({"error": str(e)}, status=400)
+
+    def _get_table_airplane(
+        self,
+        table: LookupTable | None,
+        pk: str | None,
+    ) -> TableAirplane | None:
+        if table is None or pk is None or not pk.isdigit():
+            return None
+        return table.get_airplane(int(pk))
+
+    def _get_airplane(self, pk: str | int | None) -> Airplane:
+        cached = self.airplane_cache.get(int(pk)) if str(pk).isdigit() else None
+        if cached is None:
+            airplane = self.get_object()
+            self.airplane_cache.add(airplane)
+            return airplane
+        # Same checks as get_object() once the airplane is found
+        airplane = Airplane(
+            pk=int(pk),
+            airplane_id=cached.airplane_id,
+            max_passengers=cached.max_passengers,
+        )
+        self.check_object_permissions(self.request, airplane)
+        return airplane
+
+    def _calculate_and_record(
+        self,
+        airplane: Airplane,
+        passengers: int,
+        config: dict[str, Any],
+    ) -> dict[str, Any]:
+        with phase("calc"):
             result = self.calculation_service.calculate(
                 airplane.airplane_id,
-                serializer.validated_data["passengers"],
+                passengers,
                 config,
             )
+        with phase("record"):
+            self.record_writer.write(
+                [
+                    FuelCalculationRecord(
+                        airplane=airplane,
+                        passengers=passengers,
+                        fuel_capacity=result["fuel_capacity"],
+                        fuel_consumption_per_minute=result[
+                            "fuel_consumption_per_minute"
+                        ],
+                        flight_duration=result["flight_duration"],
+                        time_unit=config["time_unit"],
+                        configuration_snapshot=config,
+                    ),
+                ],
+            )
+        return result
+
+    @extend_schema(
+        request=FuelCalculationBatchSerializer,
+        responses={
+            200: OpenApiResponse(
+                response=BatchResultSerializer,
+                description="Per-item calculation results",
+            ),
+            400: OpenApiResponse(description="Bad request"),
+        },
+        methods=["POST"],
+        description="""
+        Calculates fuel metrics for many airplanes in a single request.
+
+        Each item holds an `airplane_id`, a `passengers` count and an
+        optional `config_override`. All airplanes are loaded with a single
+        query, the active configuration is resolved once and new
+        calculation records are written in bulk.
 
-            # Save record
-            FuelCalculationRecord.objects.create(
-                airplane=airplane,
-                passengers=serializer.validated_data["passengers"],
-                fuel_capacity=result["fuel_capacity"],
-                fuel_consumption_per_minute=result["fuel_consumption_per_minute"],
-                flight_duration=result["flight_duration"],
-                time_unit=config["time_unit"],
-                configuration_snapshot=config,
+        Results are returned in request order. Item errors (unknown
+        airplane, passenger count above capacity, invalid configuration)
+        are reported in the item's `error` or `errors` field and do not
+        fail the rest of the batch.
+
+        Returns HTTP 400 only if the batch itself is malformed or exceeds
+        the maximum number of items.
+        """,
+    )
+    @action(detail=False, methods=["post"])
+    def calculate_fuel_batch(self, request):
+        serializer = FuelCalculationBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results: list[dict[str, Any]] = []
+        valid_items = []
+        for index, data in enumerate(serializer.validated_data["items"]):
+            item = FuelCalculationBatchItemSerializer(data=data)
+            if not item.is_valid():
+                results.append({"index": index, "errors": item.errors})
+                continue
+            results.append(
+                {
+                    "index": index,
+                    "airplane_id": item.validated_data["airplane_id"],
+                    "passengers": item.validated_data["passengers"],
+                },
             )
+            valid_items.append((index, item.validated_data))
 
-            # Cache result
-            self.cache_manager.set(cache_key, result)
+        airplanes = Airplane.objects.in_bulk(
+            {data["airplane_id"] for _, data in valid_items},
+            field_name="airplane_id",
+        )
+        active_config = self.config_manager.get_active_config()
 
-            return Response(result)
+        # Resolve airplane, config and cache key of every valid item
+        pending = {}
+        for index, data in valid_items:
+            try:
+                pending[index] = self._prepare_batch_item(
+                    data,
+                    airplanes,
+                    active_config,
+                )
+            except ValueError as e:
+                CALCULATION_ERRORS.labels("calculate_fuel_batch").inc()
+                results[index]["error"] = str(e)
 
-        except ValueError as e:
-            return Response({"error": str(e)}, status=400)
+        # Check cache
+        cached = self.cache_manager.get_many(
+            [cache_key for _, _, _, cache_key in pending.values()],
+        )
+
+        # Calculate every distinct cache miss once
+        computed, errors, records = self._calculate_batch_misses(
+            [item for item in pending.values() if item[3] not in cached],
+        )
+        resolved = {**computed, **cached}
+        for index, (_, _, _, cache_key) in pending.items():
+            if cache_key in errors:
+                results[index]["error"] = errors[cache_key]
+            else:
+                results[index]["result"] = resolved[cache_key]
+
+        # Save records and cache results
+        self.record_writer.write(records)
+        self.cache_manager.set_many(computed)
+
+        return Response({"results": results})
+
+    def _prepare_batch_item(
+        self,
+        data: dict[str, Any],
+        airplanes: dict[int, Airplane],
+        active_config: dict[str, Any],
+    ) -> tuple[Airplane, int, dict[str, Any], str]:
+        airplane = airplanes.get(data["airplane_id"])
+        if airplane is None:
+            msg = "Airplane not found"
+            raise ValueError(msg)
+        if data["passengers"] > airplane.max_passengers:
+            msg = f"Exceeds max passengers ({airplane.max_passengers})"
+            raise ValueError(msg)
+
+        config = {**active_config, **data.get("config_override", {})}
+        self.config_manager.validate_config(config)
+
+        cache_key = self.cache_manager.generate_key(
+            airplane.airplane_id,
+            data["passengers"],
+            config,
+        )
+        return airplane, data["passengers"], config, cache_key
+
+    def _calculate_batch_misses(
+        self,
+        items: list[tuple[Airplane, int, dict[str, Any], str]],
+    ) -> tuple[
+        dict[str, dict[str, Any]],
+        dict[str, str],
+        list[FuelCalculationRecord],
+    ]:
+        computed: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        records = []
+        for airplane, passengers, config, cache_key in items:
+            if cache_key in computed or cache_key in errors:
+                continue
+            try:
+                result = self.calculation_service.calculate(
+                    airplane.airplane_id,
+                    passengers,
+                    config,
+                )
+            except ValueError as e:
+                CALCULATION_ERRORS.labels("calculate_fuel_batch").inc()
+                errors[cache_key] = str(e)
+                continue
+            computed[cache_key] = result
+            records.append(
+                FuelCalculationRecord(
+                    airplane=airplane,
+                    passengers=passengers,
+                    fuel_capacity=result["fuel_capacity"],
+                    fuel_consumption_per_minute=result["fuel_consumption_per_minute"],
+                    flight_duration=result["flight_duration"],
+                    time_unit=config["time_unit"],
+                    configuration_snapshot=config,
+                ),
+            )
+        return computed, errors, records
+
+
+class CacheStatsView(QueryBudgetMixin, APIView):
+    permission_classes = [IsAdminUser]
+    query_budgets = {"get": 0}
+
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT},
+        description="Returns hit and miss counters of this worker's "
+        "in-process (l1) and shared (l2) calculation result cache tiers.",
+    )
+    def get(self, request):
+        return Response(FuelCalculationCache.stats())
+
+
+class ReadinessView(QueryBudgetMixin, APIView):
+    # Probed by the load balancer, so no session or user lookup
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    query_budgets = {"get": 0}
+
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT, 503: OpenApiTypes.OBJECT},
+        description="Returns 200 once this worker has warmed up, 503 before.",
+    )
+    def get(self, request):
+        if not is_ready():
+            return Response({"status": "warming up"}, status=503)
+        return Response({"status": "ready"})
@@ -0,0 +1,227 @@
+import inspect
+import logging
+import threading
+import time
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count
+from django.urls import NoReverseMatch
+from django.urls import resolve
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer
+
+from fuel_tracker.calculator import serializers
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.lookup_table import get_lookup_table
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.services import FuelCalculationService
+
+logger = logging.getLogger(__name__)
+
+FREQUENT_CALCULATIONS_CACHE_KEY = "calculator:warmup:frequent:{}:{}"
+FREQUENT_CALCULATIONS_LOCK_CACHE_KEY = "calculator:warmup:frequent_lock"
+# Bounds how long a worker killed while mining the records blocks the others
+FREQUENT_CALCULATIONS_LOCK_TIMEOUT = 300
+
+_ready = threading.Event()
+
+
+class WarmupReport(NamedTuple):
+    routes: int
+    serializers: int
+    # Frequent calculations already cached and calculated during warm-up
+    cached: int
+    computed: int
+    seconds: float
+
+
+def warm_up(
+    top: int | None = None,
+    window: timedelta | None = None,
+    *,
+    refresh: bool = False,
+) -> WarmupReport:
+    """Pays the one-off costs of a fresh process before it serves requests.
+
+    Opens the database and cache connections, compiles the API routes,
+    builds the calculator serializers' fields and loads the `top` most
+    frequent calculations of the last `window` under the active
+    configuration into the result cache. Marks the process ready when done.
+
+    The list of frequent calculations is mined from the records once and
+    shared through the cache for CALCULATOR_WARMUP_LIST_TTL seconds, so
+    that recycled workers do not each aggregate the records table.
+    `refresh` mines it again.
+    """
+    start = time.perf_counter()
+    for connection in connections.all():
+        connection.ensure_connection()
+    cache.get("calculator:warmup")
+    get_lookup_table()
+
+    routes = _resolve_routes()
+    serializer_count = _build_serializers()
+    cached, computed = _populate_cache(
+        settings.CALCULATOR_WARMUP_TOP if top is None else top,
+        window or timedelta(hours=settings.CALCULATOR_WARMUP_WINDOW_HOURS),
+        refresh=refresh,
+    )
+
+    report = WarmupReport(
+        routes,
+        serializer_count,
+        cached,
+        computed,
+        time.perf_counter() - start,
+    )
+    logger.info("Warmed up: %s", report)
+    _ready.set()
+    return report
+
+
+def warm_up_worker() -> None:
+    """Warms up a gunicorn worker without ever failing its boot.
+
+    A worker that fails to boot stops the whole server, so a database or
+    cache outage while workers are recycled is logged instead, and warm-up
+    is retried in the background every CALCULATOR_WARMUP_RETRY_SECONDS.
+    The worker serves requests meanwhile, but /api/ready/ answers 503.
+    """
+    try:
+        warm_up()
+    except Exception:
+        logger.exception("Warm-up failed, retrying in the background")
+        threading.Thread(target=_retry_warm_up, name="warmup", daemon=True).start()
+
+
+def _retry_warm_up() -> None:
+    try:
+        while True:
+            time.sleep(settings.CALCULATOR_WARMUP_RETRY_SECONDS)
+            try:
+                warm_up()
+            except Exception:
+                logger.exception("Warm-up failed again")
+            else:
+                return
+    finally:
+        # Opened by this thread, which no request runs in
+        connections.close_all()
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def reset_warmup() -> None:
+    _ready.clear()
+
+
+def _resolve_routes() -> int:
+    from config.api_router import urlpatterns
+
+    resolved = 0
+    for pattern in urlpatterns:
+        if not pattern.name:
+            continue
+        # Compiles the pattern and the reverse lookup tables on the way
+        kwargs = dict.fromkeys(pattern.pattern.regex.groupindex, "1")
+        try:
+            resolve(reverse(f"calculator:{pattern.name}", kwargs=kwargs))
+        except NoReverseMatch:
+            continue
+        resolved += 1
+    return resolved
+
+
+def _build_serializers() -> int:
+    serializer_classes = [
+        value
+        for value in vars(serializers).values()
+        if inspect.isclass(value)
+        and issubclass(value, BaseSerializer)
+        and value.__module__ == serializers.__name__
+    ]
+    for serializer_class in serializer_classes:
+        # Fields are built on first access and copied for every instance
+        serializer_class().fields  # noqa: B018
+    return len(serializer_classes)
+
+
+def _populate_cache(
+    top: int,
+    window: timedelta,
+    *,
+    refresh: bool = False,
+) -> tuple[int, int]:
+    if top <= 0:
+        return 0, 0
+    pairs = _frequent_calculations(top, window, refresh=refresh)
+    if not pairs:
+        return 0, 0
+
+    config = ConfigurationManager().get_active_config()
+    cache_manager = FuelCalculationCache()
+    keys = [
+        cache_manager.generate_key(airplane_id, passengers, config)
+        for airplane_id, passengers in pairs
+    ]
+    # Also copies the entries another worker cached into this one's L1
+    cached = cache_manager.get_many(keys)
+    missing = [
+        (key, airplane_id, passengers)
+        for key, (airplane_id, passengers) in zip(keys, pairs, strict=True)
+        if key not in cached
+    ]
+
+    service = FuelCalculationService()
+    computed = {}
+    for key, airplane_id, passengers in missing:
+        try:
+            computed[key] = service.calculate(airplane_id, passengers, config)
+        except ValueError:
+            continue
+    cache_manager.set_many(computed)
+    return len(cached), len(computed)
+
+
+def _frequent_calculations(
+    top: int,
+    window: timedelta,
+    *,
+    refresh: bool,
+) -> list[tuple[int, int]]:
+    key = FREQUENT_CALCULATIONS_CACHE_KEY.format(top, int(window.total_seconds()))
+    if not refresh:
+        pairs = cache.get(key)
+        if pairs is not None:
+            return pairs
+    # A single process mines the records. The others skip this part of the
+    # warm-up rather than run the same aggregate, and find results it
+    # calculated in the shared cache.
+    if not cache.add(
+        FREQUENT_CALCULATIONS_LOCK_CACHE_KEY,
+        True,  # noqa: FBT003
+        timeout=FREQUENT_CALCULATIONS_LOCK_TIMEOUT,
+    ):
+        return []
+    try:
+        pairs = [
+            (airplane_id, passengers)
+            for airplane_id, passengers, _ in FuelCalculationRecord.objects.filter(
+                timestamp__gte=timezone.now() - window,
+            )
+            .values_list("airplane__airplane_id", "passengers")
+            .annotate(count=Count("id"))
+            .order_by("-count")[:top]
+        ]
+        cache.set(key, pairs, timeout=settings.CALCULATOR_WARMUP_LIST_TTL)
+    finally:
+        cache.delete(FREQUENT_CALCULATIONS_LOCK_CACHE_KEY)
+    return pairs
@@ -1,5 +1,13 @@
 import pytest
+from django.core.cache import cache
 
+from fuel_tracker.calculator.airplane_cache import AirplaneCache
+from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+from fuel_tracker.calculator.config_manager import ConfigurationManager
+from fuel_tracker.calculator.lookup_table import reset_lookup_table
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.record_writer import reset_record_writer
+from fuel_tracker.calculator.warmup import reset_warmup
 from fuel_tracker.users.models import User
 from fuel_tracker.users.tests.factories import UserFactory
 
@@ -9,6 +17,29 @@ def _media_storage(settings, tmpdir) -> None:
     settings.MEDIA_ROOT = tmpdir.strpath
 
 
+@pytest.fixture(autouse=True)
+def _calculator_process_caches():
+    # Database changes are rolled back between tests without sending
+    # signals, so process-local caches must be reset explicitly. The shared
+    # cache outlives the test database too.
+    cache.clear()
+    ConfigurationManager.invalidate_cache()
+    FuelCalculationCache.reset_local()
+    AirplaneCache.invalidate_cache()
+    yield
+    ConfigurationManager.invalidate_cache()
+    FuelCalculationCache.reset_local()
+    AirplaneCache.invalidate_cache()
+    reset_record_writer()
+    reset_lookup_table()
+    reset_warmup()
+
+
 @pytest.fixture
 def user(db) -> User:
     return UserFactory()
+
+
+@pytest.fixture
+def airplane(db) -> Airplane:
+    return Airplane.objects.create(airplane_id=17, max_passengers=100)
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class ObservabilityConfig(AppConfig):
+    name = "fuel_tracker.observability"
+
+    def ready(self):
+        from fuel_tracker.observability.slow_queries import install_slow_query_recorder
+        from fuel_tracker.observability.timing import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
+        connection_created.connect(install_slow_query_recorder)
@@ -0,0 +1,45 @@
+from collections import Counter
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from fuel_tracker.observability.profiling import profile_dir
+from fuel_tracker.observability.profiling import read_collapsed
+from fuel_tracker.observability.profiling import write_collapsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Merges the request profiles of each endpoint into one collapsed "
+        "stack file, e.g. for flamegraph.pl or speedscope."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--input",
+            type=Path,
+            help="Directory of the profiles. Defaults to OBSERVABILITY_PROFILE_DIR.",
+        )
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=Path("profiles"),
+            help="Directory of the merged profiles, one per endpoint.",
+        )
+
+    def handle(self, *args, **options):
+        merged: dict[str, Counter[str]] = {}
+        requests: Counter[str] = Counter()
+        for path in sorted((options["input"] or profile_dir()).glob("*.collapsed")):
+            # <view>.<pid>.<time>.collapsed
+            view = path.name.rsplit(".", 3)[0]
+            merged.setdefault(view, Counter()).update(read_collapsed(path.read_text()))
+            requests[view] += 1
+
+        options["output"].mkdir(parents=True, exist_ok=True)
+        for view, stacks in sorted(merged.items()):
+            path = options["output"] / f"{view}.collapsed"
+            path.write_text(write_collapsed(stacks))
+            self.stdout.write(
+                f"{path}: {requests[view]} requests, {stacks.total()} samples",
+            )
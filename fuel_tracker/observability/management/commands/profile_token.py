@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from fuel_tracker.observability.profiling import HEADER
+from fuel_tracker.observability.profiling import make_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Prints a header that makes the API profile the request carrying it, "
+        "valid for OBSERVABILITY_PROFILE_TOKEN_MAX_AGE seconds."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{HEADER}: {make_token()}")
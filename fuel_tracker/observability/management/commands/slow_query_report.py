@@ -0,0 +1,61 @@
+import json
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from fuel_tracker.observability.slow_queries import report
+
+# Start of the JSON logged for each slow query, after the log line's prefix
+MARKER = '{"fingerprint"'
+
+
+class Command(BaseCommand):
+    help = (
+        "Ranks the slow queries logged with OBSERVABILITY_SLOW_QUERY_LOG by "
+        "total time, grouped by fingerprint, with the views that ran them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "logs",
+            nargs="*",
+            type=Path,
+            help="Log files to read. Defaults to the standard input.",
+        )
+        parser.add_argument("--top", type=int, default=20)
+
+    def handle(self, *args, **options):
+        queries = []
+        for lines in self._read(options["logs"]):
+            for line in lines:
+                start = line.find(MARKER)
+                if start != -1:
+                    queries.append(json.loads(line[start:]))
+
+        rows = report(queries, options["top"])
+        self.stdout.write(
+            f"{len(queries)} slow queries, {len(rows)} fingerprints shown\n",
+        )
+        for rank, row in enumerate(rows, 1):
+            views = ", ".join(
+                f"{view} ({count})"
+                for view, count in sorted(
+                    row["views"].items(),
+                    key=lambda item: -item[1],
+                )
+            )
+            self.stdout.write(
+                f"{rank:>3}. {row['total_ms']:.1f}ms total, {row['count']} calls, "
+                f"{row['mean_ms']:.1f}ms mean, {row['max_ms']:.1f}ms max\n"
+                f"     views: {views}\n"
+                f"     {row['fingerprint']}\n",
+            )
+
+    def _read(self, paths):
+        if not paths:
+            yield sys.stdin
+            return
+        for path in paths:
+            with path.open() as lines:
+                yield lines
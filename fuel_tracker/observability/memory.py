@@ -0,0 +1,188 @@
+import logging
+import os
+import resource
+import signal
+import threading
+import tracemalloc
+from collections import Counter
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RECENT_REQUESTS = 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_FILTERS = (
+    tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__),
+    tracemalloc.Filter(inclusive=False, filename_pattern=__file__),
+)
+
+# tracemalloc is process-wide, so a single request is tracked at a time
+_tracking = threading.Lock()
+_lock = threading.Lock()
+_views: dict[str, "ViewAllocations"] = {}
+_recent: deque["RequestAllocations"] = deque(maxlen=RECENT_REQUESTS)
+# Growth of the RSS high-water mark by the view that was running
+_high_water_growth: Counter[str] = Counter()
+_high_water = 0
+_recycling = False
+# Whether tracing was started for the tracked request, rather than already on
+_started_tracing = False
+
+
+@dataclass
+class RequestAllocations:
+    view: str
+    # Most memory allocated at once while handling the request, and what
+    # was still allocated when it returned, including the response
+    peak_bytes: int
+    retained_bytes: int
+    # (file:line, bytes) of the allocations still alive, largest first
+    sites: list[tuple[str, int]]
+    timestamp: str
+
+
+@dataclass
+class ViewAllocations:
+    requests: int = 0
+    peak_bytes_max: int = 0
+    peak_bytes_total: int = 0
+    retained_bytes_total: int = 0
+    sites: Counter[str] = field(default_factory=Counter)
+
+    def summary(self, top: int) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "peak_bytes_max": self.peak_bytes_max,
+            "peak_bytes_mean": self.peak_bytes_total // self.requests,
+            "retained_bytes_mean": self.retained_bytes_total // self.requests,
+            "sites": self.sites.most_common(top),
+        }
+
+
+def rss() -> int | None:
+    """Resident memory of this process in bytes, on Linux."""
+    try:
+        with open("/proc/self/statm") as statm:  # noqa: PTH123
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+def rss_high_water() -> int:
+    # Kept by the kernel, in kilobytes on Linux, but updated lazily
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        rss() or 0,
+    )
+
+
+def start_tracking() -> bool:
+    """Starts tracing allocations, unless another request is traced.
+
+    Tracing is process-wide: allocations of requests that other threads of
+    a gthread worker handle meanwhile are attributed to this request too.
+    Attribution is only exact in sync workers.
+    """
+    global _started_tracing  # noqa: PLW0603
+    if not _tracking.acquire(blocking=False):
+        return False
+    # Traces of earlier requests are dropped
+    _started_tracing = not tracemalloc.is_tracing()
+    if _started_tracing:
+        tracemalloc.start()
+    else:
+        tracemalloc.clear_traces()
+        tracemalloc.reset_peak()
+    return True
+
+
+def finish_tracking(view: str) -> RequestAllocations:
+    try:
+        retained, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        if _started_tracing:
+            # Allocations of other requests are not slowed down
+            tracemalloc.stop()
+    finally:
+        _tracking.release()
+    top = settings.OBSERVABILITY_MEMORY_TOP_SITES
+    request = RequestAllocations(
+        view=view,
+        peak_bytes=peak,
+        retained_bytes=retained,
+        sites=[
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size)
+            for stat in snapshot.statistics("lineno")[:top]
+        ],
+        timestamp=timezone.now().isoformat(),
+    )
+    with _lock:
+        _recent.append(request)
+        allocations = _views.setdefault(view, ViewAllocations())
+        allocations.requests += 1
+        allocations.peak_bytes_max = max(allocations.peak_bytes_max, peak)
+        allocations.peak_bytes_total += peak
+        allocations.retained_bytes_total += retained
+        allocations.sites.update(dict(request.sites))
+    return request
+
+
+def check_rss(view: str) -> None:
+    """Attributes high-water mark growth, and recycles the worker if asked.
+
+    Past OBSERVABILITY_MEMORY_RSS_LIMIT_MB, the process sends itself
+    SIGTERM: gunicorn workers finish their requests, exit, and are replaced
+    by the master.
+    """
+    global _high_water, _recycling  # noqa: PLW0603
+    high_water = rss_high_water()
+    if high_water > _high_water:
+        with _lock:
+            if _high_water:
+                _high_water_growth[view] += high_water - _high_water
+            _high_water = high_water
+
+    limit = settings.OBSERVABILITY_MEMORY_RSS_LIMIT_MB * 1024 * 1024
+    if not limit or _recycling or (current := rss()) is None or current < limit:
+        return
+    _recycling = True
+    logger.warning(
+        "Worker %s uses %d MB of memory after %s, over the %d MB limit, recycling it",
+        os.getpid(),
+        current // (1024 * 1024),
+        view,
+        settings.OBSERVABILITY_MEMORY_RSS_LIMIT_MB,
+    )
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def stats() -> dict[str, Any]:
+    top = settings.OBSERVABILITY_MEMORY_TOP_SITES
+    with _lock:
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": rss(),
+            "rss_high_water_bytes": rss_high_water(),
+            "high_water_growth_by_view": dict(_high_water_growth.most_common()),
+            "views": {
+                view: allocations.summary(top)
+                for view, allocations in sorted(_views.items())
+            },
+            "recent": [vars(request) for request in reversed(_recent)],
+        }
+
+
+def reset_memory_stats() -> None:
+    global _high_water, _recycling  # noqa: PLW0603
+    with _lock:
+        _views.clear()
+        _recent.clear()
+        _high_water_growth.clear()
+        _high_water = 0
+        _recycling = False
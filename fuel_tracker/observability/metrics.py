@@ -0,0 +1,57 @@
+from prometheus_client import Counter
+from prometheus_client import Histogram
+
+# Every metric has labels: unlabelled metrics would create their files in
+# the gunicorn master when the application is preloaded.
+
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests by view, method and status code.",
+    ["view", "method", "status"],
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to respond, by view and method.",
+    ["view", "method"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries per request, by view.",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, float("inf")),
+)
+QUERY_BUDGET_EXCEEDED = Counter(
+    "http_request_query_budget_exceeded_total",
+    "Requests over their view's query budget or repeating a query, by view.",
+    ["view"],
+)
+CACHE_EVENTS = Counter(
+    "calculator_cache_events_total",
+    "Calculation result cache lookups by tier and outcome, and lock events.",
+    ["event"],
+)
+LOOKUP_TABLE_HITS = Counter(
+    "calculator_lookup_table_hits_total",
+    "Calculations served from the precomputed lookup table.",
+    ["view"],
+)
+CALCULATION_ERRORS = Counter(
+    "calculator_calculation_errors_total",
+    "Calculations rejected with an error, by view.",
+    ["view"],
+)
+RECORDS_WRITTEN = Counter(
+    "calculator_records_written_total",
+    "Calculation records inserted, by write mode.",
+    ["mode"],
+)
+RECORDS_DEAD_LETTERED = Counter(
+    "calculator_records_dead_lettered_total",
+    "Calculation records that could not be inserted, by write mode.",
+    ["mode"],
+)
+RECORD_INSERT_DURATION = Histogram(
+    "calculator_record_insert_seconds",
+    "Time to insert a batch of calculation records, by write mode.",
+    ["mode"],
+)
@@ -0,0 +1,281 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from fuel_tracker.observability import memory
+from fuel_tracker.observability import profiling
+from fuel_tracker.observability import query_budget
+from fuel_tracker.observability import timing
+from fuel_tracker.observability.metrics import REQUEST_DURATION
+from fuel_tracker.observability.metrics import REQUEST_QUERIES
+from fuel_tracker.observability.metrics import REQUESTS
+
+# X-Cache value by cache marker
+CACHE_STATUS = {"l1": "HIT", "l2": "HIT", "table": "HIT", "miss": "MISS"}
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header with the request's phases and queries.
+
+    Only `OBSERVABILITY_SERVER_TIMING_SAMPLE_RATE` of the requests are
+    timed. X-Cache is set on every response whose view used the result
+    cache.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        timings, token = timing.start(sampled=self._sample())
+        try:
+            response = self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self._add_headers(response, timings, start)
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        timings, token = timing.start(sampled=self._sample())
+        try:
+            response = await self.get_response(request)
+        finally:
+            timing.stop(token)
+        return self._add_headers(response, timings, start)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Attributes the request's slow queries
+        if (timings := timing.current()) is not None:
+            timings.view = timing.view_name(view_func, request.method)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns
+        timings = timing.current()
+        if timings is not None and timings.sampled:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda _: timings.add("render", time.perf_counter() - start),
+            )
+        return response
+
+    def _sample(self) -> bool:
+        rate = settings.OBSERVABILITY_SERVER_TIMING_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)  # noqa: S311
+
+    def _add_headers(self, response, timings, start):
+        if (cache_status := timings.markers.get("cache")) is not None:
+            response["X-Cache"] = CACHE_STATUS.get(cache_status, cache_status.upper())
+        if not timings.sampled:
+            return response
+
+        metrics = [f"total;dur={(time.perf_counter() - start) * 1000:.2f}"]
+        for name, duration in timings.phases.items():
+            metric = f"{name};dur={duration * 1000:.2f}"
+            if name in timings.markers:
+                metric += f';desc="{timings.markers[name]}"'
+            metrics.append(metric)
+        metrics.extend(
+            f'{name};desc="{value}"'
+            for name, value in timings.markers.items()
+            if name not in timings.phases
+        )
+        metrics.append(
+            f'db;dur={timings.db_time * 1000:.2f};desc="{timings.db_queries} queries"',
+        )
+        response["Server-Timing"] = ", ".join(metrics)
+        return response
+
+
+class MetricsMiddleware:
+    """Counts requests and observes their latency and queries by view.
+
+    Must follow ServerTimingMiddleware, which counts the queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    def _observe(self, request, response, duration):
+        view = _url_name(request)
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+        REQUEST_DURATION.labels(view, request.method).observe(duration)
+        if (timings := timing.current()) is not None:
+            REQUEST_QUERIES.labels(view).observe(timings.db_queries)
+
+
+class QueryBudgetMiddleware:
+    """Checks the queries of views that declare query budgets.
+
+    Must follow ServerTimingMiddleware, which records the queries.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self._check(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self._check(request)
+        return response
+
+    def _check(self, request):
+        match = request.resolver_match
+        timings = timing.current()
+        if match is None or timings is None:
+            return
+        budget = query_budget.get_budget(match.func, request.method)
+        if budget is not None:
+            query_budget.check(match.view_name, budget, timings.query_shapes)
+
+
+class MemoryMiddleware:
+    """Tracks the allocations of requests and the memory of the worker.
+
+    With OBSERVABILITY_MEMORY_TRACKING, traces the allocations of
+    OBSERVABILITY_MEMORY_SAMPLE_RATE of the requests with tracemalloc, one
+    at a time. With OBSERVABILITY_MEMORY_RSS_LIMIT_MB, recycles the worker
+    once over the limit. Unused otherwise. Only the memory of the worker is
+    checked for requests handled asynchronously.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not (
+            settings.OBSERVABILITY_MEMORY_TRACKING
+            or settings.OBSERVABILITY_MEMORY_RSS_LIMIT_MB
+        ):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        tracked = (
+            settings.OBSERVABILITY_MEMORY_TRACKING
+            and self._sample()
+            and memory.start_tracking()
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            if tracked:
+                memory.finish_tracking(_url_name(request))
+        memory.check_rss(_url_name(request))
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        memory.check_rss(_url_name(request))
+        return response
+
+    def _sample(self) -> bool:
+        rate = settings.OBSERVABILITY_MEMORY_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)  # noqa: S311
+
+
+class ProfilingMiddleware:
+    """Samples the stacks of some requests into collapsed stack files.
+
+    Profiles `OBSERVABILITY_PROFILE_SAMPLE_RATE` of the requests, and those
+    with a valid signed X-Profile header, whose response then names the
+    file. Last in MIDDLEWARE, so that only the view and the rendering are
+    profiled. Requests handled asynchronously are not profiled: their event
+    loop thread runs other requests too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.get_response(request)
+        requested = profiling.HEADER in request.headers and profiling.token_is_valid(
+            request.headers[profiling.HEADER],
+        )
+        sampler = (
+            profiling.try_start(root=self.__call__.__code__)
+            if requested or self._sample()
+            else None
+        )
+        if sampler is None:
+            response = self.get_response(request)
+            if requested:
+                # Another request of this worker is being profiled
+                response[profiling.HEADER] = "busy"
+            return response
+        try:
+            response = self.get_response(request)
+        finally:
+            match = request.resolver_match
+            path = profiling.finish(
+                sampler,
+                timing.view_name(match.func, request.method) if match else "unmatched",
+            )
+        if requested:
+            response[profiling.HEADER] = path.name if path else "not written"
+        return response
+
+    def _sample(self) -> bool:
+        rate = settings.OBSERVABILITY_PROFILE_SAMPLE_RATE
+        return rate >= 1 or (rate > 0 and random.random() < rate)  # noqa: S311
+
+
+def _url_name(request) -> str:
+    # Route names rather than paths, which would be unbounded
+    match = request.resolver_match
+    return match.view_name if match is not None else "unmatched"
@@ -0,0 +1,60 @@
+import fcntl
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+from prometheus_client.mmap_dict import MmapedDict
+from prometheus_client.mmap_dict import mmap_key
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Types whose values outlive the worker that wrote them. Live gauges are
+# deleted by prometheus_client.multiprocess.mark_process_dead().
+ARCHIVED_TYPES = ("counter", "histogram")
+
+
+@contextmanager
+def files_lock(*, exclusive: bool):
+    """Keeps scrapes from reading the files while they are archived."""
+    path = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"]) / "archive.lock"
+    with path.open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def archive_process(pid: int) -> None:
+    """Merges the counters and histograms of an exited worker into archives.
+
+    Every worker writes its own files, so recycled workers would otherwise
+    leave files behind that every scrape reads, without bound. The
+    directory holds one archive file per type instead.
+    """
+    directory = Path(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+    with files_lock(exclusive=True):
+        for kind in ARCHIVED_TYPES:
+            dead = directory / f"{kind}_{pid}.db"
+            if not dead.exists():
+                continue
+            archive = directory / f"{kind}_archive.db"
+            metrics = MultiProcessCollector.merge(
+                [str(path) for path in (archive, dead) if path.exists()],
+                accumulate=False,
+            )
+            # Not *.db, which scrapes would read
+            partial = directory / f"{kind}_archive.partial"
+            partial.unlink(missing_ok=True)
+            values = MmapedDict(str(partial))
+            try:
+                for metric in metrics:
+                    for sample in metric.samples:
+                        key = mmap_key(
+                            metric.name,
+                            sample.name,
+                            list(sample.labels),
+                            list(sample.labels.values()),
+                            metric.documentation,
+                        )
+                        values.write_value(key, sample.value, 0)
+            finally:
+                values.close()
+            partial.replace(archive)
+            dead.unlink()
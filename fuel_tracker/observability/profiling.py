@@ -0,0 +1,161 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import CodeType
+from types import FrameType
+
+from django.conf import settings
+from django.core import signing
+
+# Profiled requests carry a token signed with the secret key, so that only
+# whoever can run `manage.py profile_token` turns the profiler on.
+HEADER = "X-Profile"
+_SALT = "fuel_tracker.observability.profiling"
+# A runaway request stops being sampled after this many samples
+MAX_SAMPLES = 100_000
+_PATH_PREFIXES = sorted(
+    {str(Path(path).resolve()) for path in sys.path if path},
+    key=len,
+    reverse=True,
+)
+
+# A single request is profiled at a time per process, which bounds the
+# overhead whatever the load: one sampling thread at most.
+_active = threading.Lock()
+_labels: dict[CodeType, str] = {}
+
+
+def make_token() -> str:
+    return signing.TimestampSigner(salt=_SALT).sign("profile")
+
+
+def token_is_valid(token: str) -> bool:
+    try:
+        signing.TimestampSigner(salt=_SALT).unsign(
+            token,
+            max_age=settings.OBSERVABILITY_PROFILE_TOKEN_MAX_AGE,
+        )
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def profile_dir() -> Path:
+    return Path(
+        settings.OBSERVABILITY_PROFILE_DIR
+        or Path(tempfile.gettempdir()) / "fuel_tracker_profiles",
+    )
+
+
+class Sampler:
+    """Samples the stack of a thread from another thread.
+
+    Stacks are counted in the collapsed format of flamegraph.pl and
+    speedscope: frames from the root, separated by semicolons. Frames above
+    `root` are left out. The interval is at least the interpreter's switch
+    interval while the sampled thread holds the GIL.
+    """
+
+    def __init__(self, thread_id: int, interval: float, root: CodeType | None = None):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.root = root
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="profiler",
+            daemon=True,
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _run(self) -> None:
+        samples = 0
+        while not self._stop.wait(self.interval) and samples < MAX_SAMPLES:
+            frame = sys._current_frames().get(self.thread_id)  # noqa: SLF001
+            if frame is None:
+                return
+            self.stacks[self._collapse(frame)] += 1
+            samples += 1
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            if code is self.root:
+                break
+            labels.append(_labels.get(code) or _label(code))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+
+def _label(code: CodeType) -> str:
+    filename = code.co_filename
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix + os.sep):
+            filename = filename[len(prefix) + 1 :]
+            break
+    # Semicolons separate the frames of collapsed stacks
+    label = f"{code.co_qualname} ({filename}:{code.co_firstlineno})".replace(";", ":")
+    _labels[code] = label
+    return label
+
+
+def try_start(root: CodeType | None = None) -> Sampler | None:
+    """Starts sampling the current thread, unless another request is."""
+    if not _active.acquire(blocking=False):
+        return None
+    sampler = Sampler(
+        threading.get_ident(),
+        settings.OBSERVABILITY_PROFILE_INTERVAL_MS / 1000,
+        root,
+    )
+    sampler.start()
+    return sampler
+
+
+def finish(sampler: Sampler, view: str) -> Path | None:
+    """Stops sampling and writes the stacks, if any and the directory is not full."""
+    try:
+        stacks = sampler.stop()
+    finally:
+        _active.release()
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    if (
+        not stacks
+        or _count_files(directory) >= settings.OBSERVABILITY_PROFILE_MAX_FILES
+    ):
+        return None
+    path = directory / f"{view}.{os.getpid()}.{time.time_ns()}.collapsed"
+    path.write_text(write_collapsed(stacks))
+    return path
+
+
+def write_collapsed(stacks: Counter[str]) -> str:
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def read_collapsed(text: str) -> Counter[str]:
+    stacks: Counter[str] = Counter()
+    for line in text.splitlines():
+        stack, _, count = line.rpartition(" ")
+        if stack:
+            stacks[stack] += int(count)
+    return stacks
+
+
+def _count_files(directory: Path) -> int:
+    with os.scandir(directory) as entries:
+        return sum(1 for _ in entries)
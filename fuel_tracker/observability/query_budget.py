@@ -0,0 +1,112 @@
+import logging
+import random
+import re
+from collections import Counter
+from typing import Any
+
+from django.conf import settings
+
+from fuel_tracker.observability import timing
+from fuel_tracker.observability.metrics import QUERY_BUDGET_EXCEEDED
+
+logger = logging.getLogger(__name__)
+
+# Opened and released around every request by ATOMIC_REQUESTS, and around
+# nested atomic blocks, so they say nothing about the view.
+SAVEPOINT_PREFIXES = ("SAVEPOINT ", "RELEASE SAVEPOINT ", "ROLLBACK TO SAVEPOINT ")
+# `IN (%s, %s, %s)` and multi-row VALUES have the shape of a single parameter
+_PARAMETER_LISTS = re.compile(r"%s(?:, %s)+")
+_ROW_LISTS = re.compile(r"\(%s\)(?:, \(%s\))+")
+
+
+class QueryBudgetExceededError(Exception):
+    pass
+
+
+class QueryBudgetMixin:
+    """Declares the most queries each action of a DRF view may run.
+
+    `query_budgets` maps viewset actions, or lowercase HTTP methods on
+    plain API views, to a number of queries. Queries run while
+    authenticating and checking permissions are not counted, as they
+    depend on how the client signed in. Checked by QueryBudgetMiddleware.
+    """
+
+    query_budgets: dict[str, int] = {}
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)  # pyright: ignore [reportAttributeAccessIssue]
+        if (timings := timing.current()) is not None:
+            timings.query_shapes.clear()
+
+
+def query_budgets(**budgets: int):
+    """Declares the query budgets of a function view by HTTP method."""
+
+    def decorate(view):
+        view.query_budgets = budgets
+        return view
+
+    return decorate
+
+
+def get_budget(view_func, method: str) -> int | None:
+    # DRF's as_view() keeps the view class and a viewset's action by method
+    view = getattr(view_func, "cls", view_func)
+    budgets = getattr(view, "query_budgets", None)
+    if not budgets:
+        return None
+    actions = getattr(view_func, "actions", None)
+    key = actions.get(method.lower()) if actions else method.lower()
+    return budgets.get(key)
+
+
+def shape(sql: str) -> str:
+    return _ROW_LISTS.sub("(%s)", _PARAMETER_LISTS.sub("%s", sql))
+
+
+def check(view_name: str, budget: int, query_shapes: dict[str, int]) -> None:
+    """Reports a view that ran more than `budget` queries or repeated one.
+
+    A query shape, its SQL without parameters, run more than
+    OBSERVABILITY_QUERY_REPEAT_LIMIT times is reported as an N+1 even
+    within the budget.
+    """
+    shapes: Counter[str] = Counter()
+    for sql, count in query_shapes.items():
+        if not sql.startswith(SAVEPOINT_PREFIXES):
+            shapes[shape(sql)] += count
+    total = sum(shapes.values())
+    repeated = {
+        sql: count
+        for sql, count in shapes.items()
+        if count > settings.OBSERVABILITY_QUERY_REPEAT_LIMIT
+    }
+    if total <= budget and not repeated:
+        return
+
+    QUERY_BUDGET_EXCEEDED.labels(view_name).inc()
+    msg = _describe(view_name, budget, total, repeated or shapes)
+    if settings.DEBUG or settings.OBSERVABILITY_QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceededError(msg)
+    if _sample():
+        logger.warning(msg)
+
+
+def _describe(
+    view_name: str,
+    budget: int,
+    total: int,
+    shapes: dict[str, Any],
+) -> str:
+    lines = [f"{view_name} ran {total} queries, budget {budget}:"]
+    lines.extend(
+        f"  {count} x {sql}"
+        for sql, count in sorted(shapes.items(), key=lambda item: -item[1])
+    )
+    return "\n".join(lines)
+
+
+def _sample() -> bool:
+    rate = settings.OBSERVABILITY_QUERY_BUDGET_LOG_SAMPLE_RATE
+    return rate >= 1 or (rate > 0 and random.random() < rate)  # noqa: S311
@@ -0,0 +1,147 @@
+import json
+import logging
+import re
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import asdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+from fuel_tracker.observability import timing
+from fuel_tracker.observability.query_budget import shape
+
+logger = logging.getLogger(__name__)
+
+# Frames of the application, outside of this package, make the stack summary
+_APP_DIR = str(Path(__file__).resolve().parent.parent)
+_OWN_DIR = str(Path(__file__).resolve().parent)
+_STACK_FRAMES = 5
+# Named after the thread by Django
+_SAVEPOINTS = re.compile(r'"s\d+_x\d+"')
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_NUMBERS = re.compile(r"(?<![\w\".])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+_buffer: deque["SlowQuery"] | None = None
+_buffer_lock = threading.Lock()
+
+
+@dataclass
+class SlowQuery:
+    fingerprint: str
+    sql: str
+    duration_ms: float
+    # None when the database does not report it, as SQLite for SELECTs
+    rows: int | None
+    # e.g. AirplaneViewSet.calculate_fuel, None outside requests
+    view: str | None
+    stack: list[str]
+    timestamp: str
+
+
+def fingerprint(sql: str) -> str:
+    """The query with its literals and parameter lists replaced by %s."""
+    sql = _SAVEPOINTS.sub("%s", sql)
+    sql = _STRINGS.sub("%s", sql)
+    sql = _NUMBERS.sub("%s", sql)
+    return shape(_WHITESPACE.sub(" ", sql).strip())
+
+
+def recent() -> list[SlowQuery]:
+    """Slow queries recorded by this process, most recent first."""
+    return list(reversed(_get_buffer()))
+
+
+def reset_slow_queries() -> None:
+    global _buffer  # noqa: PLW0603
+    _buffer = None
+
+
+def install_slow_query_recorder(sender, connection, **kwargs) -> None:
+    # See timing.install_query_recorder
+    if _record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_slow_query)
+
+
+def _record_slow_query(execute, sql, params, many, context):
+    threshold = settings.OBSERVABILITY_SLOW_QUERY_THRESHOLD_MS
+    if threshold <= 0:
+        return execute(sql, params, many, context)
+    start_time = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        if duration_ms >= threshold:
+            _record(sql, duration_ms, context["cursor"])
+
+
+def _record(sql: str, duration_ms: float, cursor) -> None:
+    timings = timing.current()
+    rowcount = getattr(cursor, "rowcount", -1)
+    query = SlowQuery(
+        fingerprint=fingerprint(sql),
+        sql=sql,
+        duration_ms=round(duration_ms, 3),
+        rows=rowcount if rowcount >= 0 else None,
+        view=timings.view if timings is not None else None,
+        stack=_stack_summary(),
+        timestamp=timezone.now().isoformat(),
+    )
+    _get_buffer().append(query)
+    if settings.OBSERVABILITY_SLOW_QUERY_LOG:
+        # One JSON object per line, read by the slow_query_report command
+        logger.warning("%s", json.dumps(asdict(query)))
+
+
+def _stack_summary() -> list[str]:
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(_APP_DIR)
+        and not frame.filename.startswith(_OWN_DIR)
+    ]
+    return [
+        f"{Path(frame.filename).relative_to(_APP_DIR)}:{frame.lineno} in {frame.name}"
+        for frame in frames[-_STACK_FRAMES:]
+    ]
+
+
+def _get_buffer() -> deque[SlowQuery]:
+    global _buffer  # noqa: PLW0603
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = deque(maxlen=settings.OBSERVABILITY_SLOW_QUERY_BUFFER_SIZE)
+    return _buffer
+
+
+def report(queries: list[dict[str, Any]], top: int) -> list[dict[str, Any]]:
+    """Aggregates slow queries by fingerprint, by decreasing total time."""
+    groups: dict[str, dict[str, Any]] = {}
+    for query in queries:
+        group = groups.setdefault(
+            query["fingerprint"],
+            {
+                "fingerprint": query["fingerprint"],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "views": {},
+            },
+        )
+        group["count"] += 1
+        group["total_ms"] += query["duration_ms"]
+        group["max_ms"] = max(group["max_ms"], query["duration_ms"])
+        view = query["view"] or "-"
+        group["views"][view] = group["views"].get(view, 0) + 1
+    rows = sorted(groups.values(), key=lambda group: -group["total_ms"])[:top]
+    for group in rows:
+        group["mean_ms"] = group["total_ms"] / group["count"]
+    return rows
@@ -0,0 +1,110 @@
+import signal
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.observability import memory
+from fuel_tracker.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+RESULTS_VIEW = "calculator:fuelcalculationrecord-list"
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    memory.reset_memory_stats()
+    yield
+    memory.reset_memory_stats()
+
+
+@pytest.fixture
+def tracking(settings):
+    settings.OBSERVABILITY_MEMORY_TRACKING = True
+    settings.OBSERVABILITY_MEMORY_SAMPLE_RATE = 1
+
+
+@pytest.fixture
+def records():
+    airplane = Airplane.objects.create(airplane_id=1, max_passengers=100)
+    return FuelCalculationRecord.objects.bulk_create(
+        FuelCalculationRecord(
+            airplane=airplane,
+            passengers=i,
+            fuel_capacity=200.0,
+            fuel_consumption_per_minute=1.0,
+            flight_duration=200.0,
+            time_unit="minute",
+            configuration_snapshot={"log_base": "10"},
+        )
+        for i in range(100)
+    )
+
+
+@pytest.mark.usefixtures("tracking")
+def test_request_allocations(records):
+    APIClient().get("/api/results/")
+
+    stats = memory.stats()
+    (request,) = stats["recent"]
+    assert request["view"] == RESULTS_VIEW
+    assert request["peak_bytes"] >= request["retained_bytes"] > 0
+    assert len(request["sites"]) == 10  # noqa: PLR2004
+    assert all(size > 0 for _, size in request["sites"])
+    view = stats["views"][RESULTS_VIEW]
+    assert view["requests"] == 1
+    assert view["peak_bytes_max"] == request["peak_bytes"]
+
+
+@pytest.mark.usefixtures("tracking")
+def test_one_request_tracked_at_a_time(records):
+    with memory._tracking:  # noqa: SLF001
+        APIClient().get("/api/results/")
+
+    assert memory.stats()["recent"] == []
+
+
+def test_tracking_disabled(records):
+    APIClient().get("/api/results/")
+
+    assert memory.stats()["recent"] == []
+
+
+def test_high_water_growth_by_view(records, settings, monkeypatch):
+    settings.OBSERVABILITY_MEMORY_RSS_LIMIT_MB = 1_000_000
+    # Three requests, then stats()
+    high_water = iter([100, 100, 250, 250])
+    monkeypatch.setattr(memory, "rss_high_water", lambda: next(high_water))
+    client = APIClient()
+
+    client.get("/api/results/")
+    client.get("/api/airplanes/")
+    client.get("/api/results/")
+
+    assert memory.stats()["high_water_growth_by_view"] == {RESULTS_VIEW: 150}
+
+
+def test_recycles_worker_over_the_limit(records, settings, monkeypatch):
+    settings.OBSERVABILITY_MEMORY_RSS_LIMIT_MB = 1
+    signals = []
+    monkeypatch.setattr(memory.os, "kill", lambda pid, sig: signals.append(sig))
+    client = APIClient()
+
+    client.get("/api/results/")
+    client.get("/api/results/")
+
+    assert signals == [signal.SIGTERM]
+
+
+def test_memory_endpoint():
+    client = APIClient()
+    assert client.get("/api/memory/").status_code == HTTPStatus.FORBIDDEN
+
+    client.force_login(UserFactory(is_staff=True))
+    response = client.get("/api/memory/")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.data["rss_high_water_bytes"] >= response.data["rss_bytes"] > 0
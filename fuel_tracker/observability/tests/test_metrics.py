@@ -0,0 +1,182 @@
+from http import HTTPStatus
+
+import pytest
+from prometheus_client import REGISTRY
+from prometheus_client import Counter
+from prometheus_client import Histogram
+from prometheus_client import values
+from rest_framework.test import APIClient
+
+from fuel_tracker.observability.multiprocess import archive_process
+
+pytestmark = pytest.mark.django_db
+
+VIEW = "calculator:airplane-calculate-fuel"
+
+
+@pytest.fixture
+def url(airplane):
+    return f"/api/airplanes/{airplane.pk}/calculate_fuel/"
+
+
+def sample(name, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_calculate_fuel_metrics(url):
+    before = {
+        "requests": sample(
+            "http_requests_total",
+            view=VIEW,
+            method="POST",
+            status="200",
+        ),
+        "durations": sample(
+            "http_request_duration_seconds_count",
+            view=VIEW,
+            method="POST",
+        ),
+        "queries": sample("http_request_db_queries_sum", view=VIEW),
+        "misses": sample("calculator_cache_events_total", event="l2_misses"),
+        "hits": sample("calculator_cache_events_total", event="l1_hits"),
+        "records": sample("calculator_records_written_total", mode="sync"),
+        "inserts": sample("calculator_record_insert_seconds_count", mode="sync"),
+    }
+    client = APIClient()
+
+    client.post(url, {"passengers": 50}, format="json")
+    client.post(url, {"passengers": 50}, format="json")
+
+    assert sample(
+        "http_requests_total",
+        view=VIEW,
+        method="POST",
+        status="200",
+    ) == (before["requests"] + 2)
+    assert sample(
+        "http_request_duration_seconds_count",
+        view=VIEW,
+        method="POST",
+    ) == (before["durations"] + 2)
+    # Five queries for the miss (see test_timing), the hit only runs the
+    # savepoint of the request
+    assert sample("http_request_db_queries_sum", view=VIEW) == before["queries"] + 7
+    assert sample("calculator_cache_events_total", event="l2_misses") == (
+        before["misses"] + 1
+    )
+    assert sample("calculator_cache_events_total", event="l1_hits") == (
+        before["hits"] + 1
+    )
+    assert sample("calculator_records_written_total", mode="sync") == (
+        before["records"] + 1
+    )
+    assert sample("calculator_record_insert_seconds_count", mode="sync") == (
+        before["inserts"] + 1
+    )
+
+
+def test_calculation_error_metric(url):
+    before = sample("calculator_calculation_errors_total", view="calculate_fuel")
+
+    response = APIClient().post(
+        url,
+        {"passengers": 1, "config_override": {"passenger_fuel_impact": -1}},
+        format="json",
+    )
+
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    assert sample("calculator_calculation_errors_total", view="calculate_fuel") == (
+        before + 1
+    )
+
+
+def test_unmatched_requests_metric():
+    before = sample("http_requests_total", view="unmatched", method="GET", status="404")
+
+    APIClient().get("/nowhere/")
+
+    assert sample(
+        "http_requests_total",
+        view="unmatched",
+        method="GET",
+        status="404",
+    ) == (before + 1)
+
+
+def test_metrics_endpoint(url, settings):
+    APIClient().post(url, {"passengers": 50}, format="json")
+    settings.DEBUG = True
+
+    response = APIClient().get("/metrics")
+
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/plain")
+    body = response.content.decode()
+    assert (
+        f'http_request_duration_seconds_bucket{{le="0.005",method="POST",view="{VIEW}"}}'
+        in body
+    )
+    assert "calculator_cache_events_total" in body
+
+
+def test_metrics_endpoint_token(settings):
+    settings.OBSERVABILITY_METRICS_TOKEN = "secret"  # noqa: S105
+    client = APIClient()
+
+    assert client.get("/metrics").status_code == HTTPStatus.UNAUTHORIZED
+    response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize("debug", [False, True])
+def test_metrics_endpoint_without_token(settings, debug):
+    settings.OBSERVABILITY_METRICS_TOKEN = ""
+    settings.DEBUG = debug
+
+    response = APIClient().get("/metrics")
+
+    expected = HTTPStatus.OK if debug else HTTPStatus.NOT_FOUND
+    assert response.status_code == expected
+
+
+def test_metrics_endpoint_sums_processes(monkeypatch, tmp_path, settings):
+    settings.DEBUG = True
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    for pid in (101, 102):
+        monkeypatch.setattr(
+            values,
+            "ValueClass",
+            values.MultiProcessValue(lambda pid=pid: pid),
+        )
+        counter = Counter("worker_events", "Events.", ["kind"], registry=None)
+        counter.labels("a").inc(pid - 100)
+
+    response = APIClient().get("/metrics")
+
+    assert 'worker_events_total{kind="a"} 3.0' in response.content.decode()
+
+
+def test_exited_workers_are_archived(monkeypatch, tmp_path, settings):
+    settings.DEBUG = True
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    for pid in range(100, 150):
+        monkeypatch.setattr(
+            values,
+            "ValueClass",
+            values.MultiProcessValue(lambda pid=pid: pid),
+        )
+        counter = Counter("worker_events", "Events.", ["kind"], registry=None)
+        counter.labels("a").inc(2)
+        histogram = Histogram("worker_seconds", "Time.", ["kind"], registry=None)
+        histogram.labels("a").observe(0.3)
+        # Gunicorn's child_exit, once the worker is gone
+        archive_process(pid)
+
+        assert len(list(tmp_path.glob("*.db"))) <= 2  # noqa: PLR2004
+
+    body = APIClient().get("/metrics").content.decode()
+    assert 'worker_events_total{kind="a"} 100.0' in body
+    assert 'worker_seconds_count{kind="a"} 50.0' in body
+    assert 'worker_seconds_bucket{kind="a",le="0.5"} 50.0' in body
+    assert 'worker_seconds_bucket{kind="a",le="0.25"} 0.0' in body
+    assert 'worker_seconds_sum{kind="a"} 15.0' in body
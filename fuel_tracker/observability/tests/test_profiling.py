@@ -0,0 +1,132 @@
+import threading
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import path
+
+from fuel_tracker.observability import profiling
+from fuel_tracker.observability.profiling import Sampler
+from fuel_tracker.observability.profiling import make_token
+from fuel_tracker.observability.profiling import read_collapsed
+
+SPIN_SECONDS = 0.05
+
+
+def spin(request=None):
+    deadline = time.perf_counter() + SPIN_SECONDS
+    while time.perf_counter() < deadline:
+        pass
+    return HttpResponse("done")
+
+
+urlpatterns = [path("spin/", spin, name="spin")]
+
+pytestmark = [pytest.mark.django_db, pytest.mark.urls(__name__)]
+
+
+@pytest.fixture(autouse=True)
+def _profiles(settings, tmp_path):
+    settings.OBSERVABILITY_PROFILE_DIR = str(tmp_path / "profiles")
+    settings.OBSERVABILITY_PROFILE_INTERVAL_MS = 1
+
+
+def profiles():
+    return list(profiling.profile_dir().glob("*.collapsed"))
+
+
+def test_sampler():
+    sampler = Sampler(threading.get_ident(), 0.001)
+
+    sampler.start()
+    spin()
+    stacks = sampler.stop()
+
+    assert stacks.total() > 0
+    assert any(
+        stack.endswith(f"spin ({__name__.replace('.', '/')}.py:19)") for stack in stacks
+    )
+
+
+def test_profile_signed_request(settings):
+    response = Client().get("/spin/", HTTP_X_PROFILE=make_token())
+
+    (profile,) = profiles()
+    assert response[profiling.HEADER] == profile.name
+    assert profile.name.startswith(f"{__name__}.spin.")
+    stacks = read_collapsed(profile.read_text())
+    # Nothing above the middleware
+    assert all(
+        stack.startswith("convert_exception_to_response.<locals>.inner")
+        for stack in stacks
+    )
+    assert any(";spin (" in stack for stack in stacks)
+
+
+@pytest.mark.parametrize("token", ["", "forged", make_token() + "x"])
+def test_invalid_token(settings, token):
+    response = Client().get("/spin/", HTTP_X_PROFILE=token)
+
+    assert profiling.HEADER not in response
+    assert profiles() == []
+
+
+def test_sampled_requests(settings):
+    settings.OBSERVABILITY_PROFILE_SAMPLE_RATE = 1
+
+    response = Client().get("/spin/")
+
+    assert profiling.HEADER not in response
+    assert len(profiles()) == 1
+
+
+def test_one_profile_at_a_time(settings):
+    with profiling._active:  # noqa: SLF001
+        response = Client().get("/spin/", HTTP_X_PROFILE=make_token())
+
+    assert response[profiling.HEADER] == "busy"
+    assert profiles() == []
+
+
+def test_profile_directory_limit(settings):
+    settings.OBSERVABILITY_PROFILE_MAX_FILES = 1
+    client = Client()
+
+    client.get("/spin/", HTTP_X_PROFILE=make_token())
+    response = client.get("/spin/", HTTP_X_PROFILE=make_token())
+
+    assert response[profiling.HEADER] == "not written"
+    assert len(profiles()) == 1
+
+
+def test_merge_profiles(settings, tmp_path):
+    directory = profiling.profile_dir()
+    directory.mkdir(parents=True)
+    (directory / "AirplaneViewSet.calculate_fuel.1.10.collapsed").write_text(
+        "a;b 2\na;c 1\n",
+    )
+    (directory / "AirplaneViewSet.calculate_fuel.2.20.collapsed").write_text("a;b 3\n")
+    (directory / "FuelCalculationRecordViewSet.list.1.30.collapsed").write_text("d 1\n")
+    stdout = StringIO()
+
+    call_command("merge_profiles", output=tmp_path / "merged", stdout=stdout)
+
+    merged = tmp_path / "merged" / "AirplaneViewSet.calculate_fuel.collapsed"
+    assert merged.read_text() == "a;b 5\na;c 1\n"
+    assert f"{merged}: 2 requests, 6 samples" in stdout.getvalue()
+    assert (
+        tmp_path / "merged" / "FuelCalculationRecordViewSet.list.collapsed"
+    ).exists()
+
+
+def test_profile_token_command():
+    stdout = StringIO()
+
+    call_command("profile_token", stdout=stdout)
+
+    header, _, token = stdout.getvalue().strip().partition(": ")
+    assert header == profiling.HEADER
+    assert profiling.token_is_valid(token)
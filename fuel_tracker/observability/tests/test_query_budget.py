@@ -0,0 +1,207 @@
+import logging
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import include
+from django.urls import path
+from prometheus_client import REGISTRY
+from rest_framework import viewsets
+from rest_framework.routers import SimpleRouter
+from rest_framework.test import APIClient
+
+from config import api_router
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.calculator.models import FuelCalculationRecord
+from fuel_tracker.calculator.serializers import AirplaneSerializer
+from fuel_tracker.calculator.serializers import FuelCalculationRecordModelSerializer
+from fuel_tracker.observability.query_budget import QueryBudgetExceededError
+from fuel_tracker.observability.query_budget import QueryBudgetMixin
+from fuel_tracker.observability.query_budget import get_budget
+from fuel_tracker.observability.query_budget import shape
+from fuel_tracker.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class RecordViewSet(QueryBudgetMixin, viewsets.ReadOnlyModelViewSet):
+    # Without select_related("airplane"), one query per record
+    queryset = FuelCalculationRecord.objects.order_by("pk")
+    serializer_class = FuelCalculationRecordModelSerializer
+    query_budgets = {"list": 100, "retrieve": 0}
+
+
+class AirplaneViewSet(QueryBudgetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Airplane.objects.all()
+    serializer_class = AirplaneSerializer
+
+
+router = SimpleRouter()
+router.register("records", RecordViewSet)
+router.register("airplanes", AirplaneViewSet)
+urlpatterns = [
+    path("api/", include((router.urls, "test"))),
+    path("async/", include((api_router.async_urlpatterns, "async"))),
+]
+
+
+@pytest.fixture
+def records():
+    return FuelCalculationRecord.objects.bulk_create(
+        FuelCalculationRecord(
+            airplane=Airplane.objects.create(airplane_id=i, max_passengers=100),
+            passengers=i,
+            fuel_capacity=200.0,
+            fuel_consumption_per_minute=1.0,
+            flight_duration=200.0,
+            time_unit="minute",
+            configuration_snapshot={},
+        )
+        for i in range(1, 6)
+    )
+
+
+def exceeded(view: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "http_request_query_budget_exceeded_total",
+            {"view": view},
+        )
+        or 0.0
+    )
+
+
+@pytest.mark.urls(__name__)
+def test_repeated_query_raises(records):
+    with pytest.raises(QueryBudgetExceededError) as excinfo:
+        APIClient().get("/api/records/")
+
+    message = str(excinfo.value)
+    assert message.startswith("test:fuelcalculationrecord-list ran 6 queries")
+    assert '5 x SELECT "calculator_airplane"' in message
+
+
+@pytest.mark.urls(__name__)
+def test_over_budget_raises(records):
+    with pytest.raises(QueryBudgetExceededError, match="ran 2 queries, budget 0"):
+        APIClient().get(f"/api/records/{records[0].pk}/")
+
+
+@pytest.mark.urls(__name__)
+def test_over_budget_logs_when_not_raising(records, settings, caplog):
+    settings.OBSERVABILITY_QUERY_BUDGET_RAISE = False
+    settings.OBSERVABILITY_QUERY_BUDGET_LOG_SAMPLE_RATE = 1
+    before = exceeded("test:fuelcalculationrecord-list")
+
+    with caplog.at_level(logging.WARNING):
+        response = APIClient().get("/api/records/")
+
+    assert response.status_code == HTTPStatus.OK
+    assert "5 x SELECT" in caplog.text
+    assert exceeded("test:fuelcalculationrecord-list") == before + 1
+
+
+@pytest.mark.urls(__name__)
+def test_over_budget_log_is_sampled(records, settings, caplog):
+    settings.OBSERVABILITY_QUERY_BUDGET_RAISE = False
+    settings.OBSERVABILITY_QUERY_BUDGET_LOG_SAMPLE_RATE = 0
+
+    with caplog.at_level(logging.WARNING):
+        APIClient().get("/api/records/")
+
+    assert not caplog.records
+
+
+@pytest.mark.urls(__name__)
+def test_views_without_budgets_are_not_checked(records):
+    response = APIClient().get(f"/api/airplanes/{records[0].airplane_id}/")
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_authentication_queries_are_not_counted():
+    client = APIClient()
+    client.force_login(UserFactory(is_staff=True))
+
+    # Session and user, then no query within the budget of 0
+    response = client.get("/api/cache-stats/")
+
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.urls(__name__)
+def test_async_view_budget(records):
+    cache.clear()
+
+    response = async_to_sync(AsyncClient().post)(
+        f"/async/airplanes/{records[0].airplane_id}/calculate_fuel/",
+        {"passengers": 50},
+        content_type="application/json",
+    )
+
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_shape():
+    assert shape('SELECT 1 WHERE "id" IN (%s, %s, %s)') == (
+        'SELECT 1 WHERE "id" IN (%s)'
+    )
+    assert shape("INSERT INTO t VALUES (%s, %s), (%s, %s)") == (
+        "INSERT INTO t VALUES (%s)"
+    )
+
+
+def _endpoints():
+    for pattern in api_router.urlpatterns:
+        view = pattern.callback
+        # Routes map every method of an action, even disabled ones
+        methods = getattr(view, "actions", None) or [
+            method for method in view.cls.http_method_names if hasattr(view.cls, method)
+        ]
+        for method in methods:
+            if method in view.cls.http_method_names and method not in {
+                "head",
+                "options",
+            }:
+                yield pattern.name, view, method
+    for pattern in api_router.async_urlpatterns:
+        yield pattern.name, pattern.callback, "post"
+
+
+@pytest.mark.parametrize(
+    ("view", "method"),
+    [
+        pytest.param(view, method, id=f"{name}-{method}")
+        for name, view, method in _endpoints()
+    ],
+)
+def test_every_calculator_endpoint_has_a_budget(view, method):
+    assert get_budget(view, method) is not None
+
+
+def test_crud_within_budgets(records):
+    client = APIClient()
+    client.force_login(UserFactory())
+    url = f"/api/airplanes/{records[0].airplane_id}/"
+
+    responses = [
+        client.get("/api/airplanes/"),
+        client.post("/api/airplanes/", {"airplane_id": 99, "max_passengers": 10}),
+        client.put(url, {"airplane_id": 1, "max_passengers": 20}),
+        client.patch(url, {"max_passengers": 30}),
+        client.delete(url),
+        client.get("/api/configurations/"),
+        client.post("/api/configurations/", {"log_base": "e"}),
+    ]
+
+    assert [response.status_code for response in responses] == [
+        HTTPStatus.OK,
+        HTTPStatus.CREATED,
+        HTTPStatus.OK,
+        HTTPStatus.OK,
+        HTTPStatus.NO_CONTENT,
+        HTTPStatus.OK,
+        HTTPStatus.CREATED,
+    ]
@@ -0,0 +1,127 @@
+import json
+import logging
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.models import Airplane
+from fuel_tracker.observability import slow_queries
+from fuel_tracker.observability.slow_queries import fingerprint
+from fuel_tracker.observability.slow_queries import recent
+from fuel_tracker.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _reset(settings):
+    # Every query is slow
+    settings.OBSERVABILITY_SLOW_QUERY_THRESHOLD_MS = 1e-9
+    slow_queries.reset_slow_queries()
+    yield
+    slow_queries.reset_slow_queries()
+
+
+@pytest.fixture
+def url(airplane):
+    slow_queries.reset_slow_queries()
+    return f"/api/airplanes/{airplane.pk}/calculate_fuel/"
+
+
+def test_fingerprint():
+    assert fingerprint(
+        "SELECT \"t1\".\"id\" FROM t1 WHERE name = 'it''s'\n  AND id IN (1, 2, 3) "
+        "AND x > -1.5 LIMIT 21",
+    ) == ('SELECT "t1"."id" FROM t1 WHERE name = %s AND id IN (%s) AND x > %s LIMIT %s')
+
+
+def test_fingerprint_savepoint():
+    assert fingerprint('RELEASE SAVEPOINT "s1398043_x12"') == "RELEASE SAVEPOINT %s"
+
+
+def test_slow_queries_are_attributed_to_views(url):
+    APIClient().post(url, {"passengers": 50}, format="json")
+
+    queries = recent()
+    insert = next(query for query in queries if query.sql.startswith("INSERT"))
+    assert insert.view == "AirplaneViewSet.calculate_fuel"
+    assert insert.fingerprint.startswith(
+        'INSERT INTO "calculator_fuelcalculationrecord"',
+    )
+    assert any("calculator/views.py" in frame for frame in insert.stack)
+    assert not any("observability" in frame for frame in insert.stack)
+    assert queries[0].timestamp >= queries[-1].timestamp
+
+
+def test_slow_queries_outside_requests():
+    Airplane.objects.create(airplane_id=1, max_passengers=100)
+
+    Airplane.objects.update(name="Renamed")
+
+    query = recent()[0]
+    assert query.view is None
+    assert query.rows == 1
+
+
+def test_slow_queries_disabled(url, settings):
+    settings.OBSERVABILITY_SLOW_QUERY_THRESHOLD_MS = 0
+
+    APIClient().post(url, {"passengers": 50}, format="json")
+
+    assert recent() == []
+
+
+def test_slow_queries_buffer_is_bounded(settings):
+    settings.OBSERVABILITY_SLOW_QUERY_BUFFER_SIZE = 2
+
+    for _ in range(5):
+        Airplane.objects.count()
+
+    assert len(recent()) == 2  # noqa: PLR2004
+
+
+def test_slow_queries_endpoint(url):
+    client = APIClient()
+    assert client.get("/api/slow-queries/").status_code == HTTPStatus.FORBIDDEN
+
+    client.force_login(UserFactory(is_staff=True))
+    client.post(url, {"passengers": 50}, format="json")
+    response = client.get("/api/slow-queries/")
+
+    assert response.status_code == HTTPStatus.OK
+    assert {"fingerprint", "sql", "duration_ms", "rows", "view", "stack"} <= set(
+        response.data[0],
+    )
+
+
+def test_slow_query_report(url, settings, caplog, tmp_path):
+    settings.OBSERVABILITY_SLOW_QUERY_LOG = True
+    client = APIClient()
+    with caplog.at_level(logging.WARNING, logger="fuel_tracker.observability"):
+        client.post(url, {"passengers": 50}, format="json")
+        client.post(url, {"passengers": 60}, format="json")
+    log = tmp_path / "django.log"
+    log.write_text(
+        "".join(
+            f"WARNING slow_queries 1 2 {record.message}\n" for record in caplog.records
+        )
+        + "INFO unrelated line\n",
+    )
+    logged = [json.loads(record.message) for record in caplog.records]
+    stdout = StringIO()
+
+    call_command("slow_query_report", log, top=1, stdout=stdout)
+
+    output = stdout.getvalue()
+    assert output.startswith(f"{len(logged)} slow queries, 1 fingerprints shown")
+    assert "AirplaneViewSet.calculate_fuel (2)" in output
+    slowest = max(
+        {query["fingerprint"] for query in logged},
+        key=lambda shape: sum(
+            query["duration_ms"] for query in logged if query["fingerprint"] == shape
+        ),
+    )
+    assert slowest in output
@@ -0,0 +1,105 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from fuel_tracker.calculator.lookup_table import build_lookup_table
+from fuel_tracker.observability import timing
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def url(airplane):
+    return f"/api/airplanes/{airplane.pk}/calculate_fuel/"
+
+
+def server_timing(response) -> dict[str, str]:
+    metrics = {}
+    for metric in response["Server-Timing"].split(", "):
+        name, _, params = metric.partition(";")
+        metrics[name] = params
+    return metrics
+
+
+def test_calculate_fuel_server_timing(url):
+    client = APIClient()
+
+    miss = client.post(url, {"passengers": 50}, format="json")
+    hit = client.post(url, {"passengers": 50}, format="json")
+
+    metrics = server_timing(miss)
+    assert {"total", "airplane", "config", "calc", "record", "render", "db"} <= set(
+        metrics,
+    )
+    assert metrics["cache"].endswith('desc="miss"')
+    assert metrics["db"].startswith("dur=")
+    assert "queries" in metrics["db"]
+    assert miss["X-Cache"] == "MISS"
+
+    metrics = server_timing(hit)
+    assert metrics["cache"] == 'desc="l1"'
+    assert "calc" not in metrics
+    assert hit["X-Cache"] == "HIT"
+
+
+def test_server_timing_counts_queries(url):
+    response = APIClient().post(url, {"passengers": 50}, format="json")
+
+    # Savepoint, airplane, configuration, record insert and release
+    assert server_timing(response)["db"].endswith('desc="5 queries"')
+
+
+def test_server_timing_lookup_table(url, settings, tmp_path):
+    settings.CALCULATOR_LOOKUP_TABLE_PATH = str(tmp_path / "results.table")
+    build_lookup_table()
+
+    response = APIClient().post(url, {"passengers": 50}, format="json")
+
+    assert server_timing(response)["cache"] == 'desc="table"'
+    assert response["X-Cache"] == "HIT"
+
+
+def test_server_timing_not_sampled(url, settings):
+    settings.OBSERVABILITY_SERVER_TIMING_SAMPLE_RATE = 0
+
+    response = APIClient().post(url, {"passengers": 50}, format="json")
+
+    assert "Server-Timing" not in response
+    assert response["X-Cache"] == "MISS"
+
+
+def test_server_timing_without_cache(url):
+    response = APIClient().get("/api/airplanes/")
+
+    assert "total" in server_timing(response)
+    assert "X-Cache" not in response
+
+
+def test_server_timing_async_view(airplane, settings):
+    settings.ROOT_URLCONF = "fuel_tracker.calculator.tests.test_async_views"
+
+    response = async_to_sync(AsyncClient().post)(
+        f"/api/airplanes/{airplane.pk}/calculate_fuel/",
+        {"passengers": 50},
+        content_type="application/json",
+    )
+
+    metrics = server_timing(response)
+    assert {"airplane", "config", "calc", "record"} <= set(metrics)
+    assert response["X-Cache"] == "MISS"
+
+
+def test_hooks_outside_requests():
+    with timing.phase("calc"):
+        timing.mark("cache", "miss")
+
+    assert timing.current() is None
+
+
+def test_query_recorder_installed_once():
+    connection.ensure_connection()
+    timing.install_query_recorder(sender=None, connection=connection)
+
+    assert connection.execute_wrappers.count(timing._record_query) == 1  # noqa: SLF001
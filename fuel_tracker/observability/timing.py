@@ -0,0 +1,119 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Any
+
+# Timings of the request being handled. Unset outside requests, where the
+# hooks below do nothing.
+_current: ContextVar["RequestTimings | None"] = ContextVar(
+    "request_timings",
+    default=None,
+)
+_NOT_TIMED = nullcontext()
+
+
+class RequestTimings:
+    """Per-phase durations and markers collected while handling a request.
+
+    Markers, such as the cache outcome, and database queries, counted by
+    SQL text for query budgets, are always recorded. Phase durations are
+    only measured when the request is `sampled`.
+    """
+
+    __slots__ = (
+        "db_queries",
+        "db_time",
+        "markers",
+        "phases",
+        "query_shapes",
+        "sampled",
+        "view",
+    )
+
+    def __init__(self, *, sampled: bool):
+        self.sampled = sampled
+        self.phases: dict[str, float] = {}
+        self.markers: dict[str, str] = {}
+        self.db_queries = 0
+        self.db_time = 0.0
+        self.query_shapes: dict[str, int] = {}
+        self.view: str | None = None
+
+    def add(self, name: str, duration: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + duration
+
+
+class _Phase:
+    __slots__ = ("name", "start", "timings")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.start)
+
+
+def start(*, sampled: bool) -> tuple[RequestTimings, Any]:
+    timings = RequestTimings(sampled=sampled)
+    return timings, _current.set(timings)
+
+
+def stop(token: Any) -> None:
+    _current.reset(token)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
+
+
+def view_name(view_func, method: str) -> str:
+    """Class and action of a DRF view, e.g. AirplaneViewSet.calculate_fuel.
+
+    Function views are named by their module and function.
+    """
+    view = getattr(view_func, "cls", None)
+    if view is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    actions = getattr(view_func, "actions", None)
+    action = actions.get(method.lower()) if actions else method.lower()
+    return f"{view.__name__}.{action}"
+
+
+def phase(name: str):
+    """Context manager adding its duration to the request's `name` phase.
+
+    Time spent in the same phase several times is summed; phases may nest.
+    """
+    timings = _current.get()
+    if timings is None or not timings.sampled:
+        return _NOT_TIMED
+    return _Phase(timings, name)
+
+
+def mark(name: str, value: str) -> None:
+    if (timings := _current.get()) is not None:
+        timings.markers[name] = value
+
+
+def install_query_recorder(sender, connection, **kwargs) -> None:
+    # Connected to connection_created, which is sent again on reconnection.
+    # First, as execute_wrapper() blocks pop the last wrapper on exit.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _record_query)
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start_time = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_queries += 1
+        timings.query_shapes[sql] = timings.query_shapes.get(sql, 0) + 1
+        timings.db_time += time.perf_counter() - start_time
@@ -0,0 +1,73 @@
+import os
+from dataclasses import asdict
+
+from django.conf import settings
+from django.http import Http404
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from prometheus_client import CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY
+from prometheus_client import CollectorRegistry
+from prometheus_client import generate_latest
+from prometheus_client import multiprocess
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from fuel_tracker.observability import memory
+from fuel_tracker.observability import slow_queries
+from fuel_tracker.observability.multiprocess import files_lock
+from fuel_tracker.observability.query_budget import QueryBudgetMixin
+
+
+def metrics(request):
+    """Prometheus metrics of every worker of this server."""
+    token = settings.OBSERVABILITY_METRICS_TOKEN
+    if not token and not settings.DEBUG:
+        # Not left open by a missing setting
+        raise Http404
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""),
+        f"Bearer {token}",
+    ):
+        return HttpResponse(status=401)
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        # Summed from the files written by each worker, see gunicorn.conf.py
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        with files_lock(exclusive=False):
+            output = generate_latest(registry)
+    else:
+        output = generate_latest(REGISTRY)
+    return HttpResponse(output, content_type=CONTENT_TYPE_LATEST)
+
+
+class SlowQueriesView(QueryBudgetMixin, APIView):
+    permission_classes = [IsAdminUser]
+    query_budgets = {"get": 0}
+
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT},
+        description="Returns the most recent queries of this worker slower "
+        "than OBSERVABILITY_SLOW_QUERY_THRESHOLD_MS, newest first, with the "
+        "view that ran them.",
+    )
+    def get(self, request):
+        return Response([asdict(query) for query in slow_queries.recent()])
+
+
+class MemoryStatsView(QueryBudgetMixin, APIView):
+    permission_classes = [IsAdminUser]
+    query_budgets = {"get": 0}
+
+    @extend_schema(
+        responses={200: OpenApiTypes.OBJECT},
+        description="Returns this worker's resident memory and its high-water "
+        "mark, with the views that raised it, and the allocations of the "
+        "requests traced with OBSERVABILITY_MEMORY_TRACKING, by view.",
+    )
+    def get(self, request):
+        return Response(memory.stats())
@@ -0,0 +1,160 @@
+"""
+Gunicorn configuration, read from the environment.
+
+    gunicorn --config gunicorn.conf.py
+
+GUNICORN_WORKER_CLASS picks the worker model:
+
+- ``sync`` (default): one request per process, ``2 * CPUs + 1`` workers.
+- ``gthread``: ``CPUs + 1`` processes of GUNICORN_THREADS threads each.
+- ``uvicorn``: ASGI (config.asgi) with one event loop per CPU. Combine with
+  CALCULATOR_ASYNC_VIEWS=True to serve calculate_fuel natively async.
+
+WEB_CONCURRENCY overrides the number of workers. See
+docs/performance-tuning.md for measurements of each model.
+"""
+
+import gc
+import os
+import tempfile
+from pathlib import Path
+
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "uvicorn": "uvicorn_worker.UvicornWorker",
+}
+
+
+def _env(name, default):
+    return os.environ.get(name) or default
+
+
+def _cpu_count():
+    # Container CPU quota, falling back to the CPUs this process may run on
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+cpus = _cpu_count()
+worker_model = _env("GUNICORN_WORKER_CLASS", "sync")
+if worker_model not in WORKER_CLASSES:
+    msg = f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}"
+    raise ValueError(msg)
+
+wsgi_app = (
+    "config.asgi:application"
+    if worker_model == "uvicorn"
+    else "config.wsgi:application"
+)
+worker_class = WORKER_CLASSES[worker_model]
+workers = int(
+    _env(
+        "WEB_CONCURRENCY",
+        {"sync": 2 * cpus + 1, "gthread": cpus + 1, "uvicorn": cpus}[worker_model],
+    ),
+)
+threads = int(_env("GUNICORN_THREADS", 4)) if worker_model == "gthread" else 1
+
+bind = _env("GUNICORN_BIND", "0.0.0.0:5000")
+# Behind Traefik, which keeps connections to the workers open
+keepalive = int(_env("GUNICORN_KEEPALIVE", 5))
+timeout = int(_env("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(_env("GUNICORN_GRACEFUL_TIMEOUT", 30))
+
+# Recycle workers to bound slow memory growth, spread so they do not all
+# restart at once.
+max_requests = int(_env("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(_env("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+# Import Django once in the master and share its memory with the workers
+preload_app = _env("GUNICORN_PRELOAD", "true").lower() in {"1", "true", "yes", "on"}
+if preload_app:
+    # Collection would write to, and so copy, the pages shared with the
+    # workers. Disabled while the application loads, see pre_fork.
+    gc.disable()
+# Heartbeat files on tmpfs, a disk-backed /tmp can stall workers
+worker_tmp_dir = "/dev/shm" if Path("/dev/shm").is_dir() else None  # noqa: S108
+
+# Every worker writes its Prometheus metrics to files in this directory,
+# which /metrics sums. Set before the application, and prometheus_client,
+# is imported.
+metrics_dir = Path(
+    os.environ.setdefault(
+        "PROMETHEUS_MULTIPROC_DIR",
+        str(Path(worker_tmp_dir or tempfile.gettempdir()) / "fuel_tracker_metrics"),
+    ),
+)
+metrics_dir.mkdir(parents=True, exist_ok=True)
+
+
+def on_starting(server):
+    # Left by a previous server, whose counters would be summed with ours
+    for path in metrics_dir.glob("*.db"):
+        path.unlink()
+
+
+def pre_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    # Closed in the master: closing them in a worker would end the session
+    # the other processes share.
+    from django.db import connections
+
+    connections.close_all()
+    # Objects allocated so far are never collected, in the workers or the
+    # master, so their pages stay shared. Collection is enabled again for
+    # everything allocated later, the workers inherit it.
+    gc.freeze()
+    gc.enable()
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    # Drop Redis connections inherited from the master without closing the
+    # sockets, the pools reconnect on first use.
+    from django.conf import settings
+    from django.core.cache import caches
+    from django_redis.cache import RedisCache
+
+    from fuel_tracker.calculator.cache_manager import FuelCalculationCache
+
+    for alias in settings.CACHES:
+        if isinstance(cache := caches[alias], RedisCache):
+            cache.client.get_client().connection_pool.reset()
+    FuelCalculationCache.reset_local()
+
+
+def post_worker_init(worker):
+    # Before the worker accepts connections, so it only takes requests once
+    # warm. gthread workers open their database connections again in each
+    # thread. Gunicorn stops the server when this hook raises, so a failure
+    # is logged and warm-up retried in the background.
+    from fuel_tracker.calculator.warmup import warm_up_worker
+
+    warm_up_worker()
+
+
+def child_exit(server, worker):
+    # Drops the live gauges of the worker and merges its counters and
+    # histograms into the archives, so recycled workers leave no files.
+    from prometheus_client import multiprocess
+
+    from fuel_tracker.observability.multiprocess import archive_process
+
+    multiprocess.mark_process_dead(worker.pid)
+    archive_process(worker.pid)
+
+
+def worker_exit(server, worker):
+    from fuel_tracker.calculator.record_writer import drain_record_writer
+
+    drain_record_writer()